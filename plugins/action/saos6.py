@@ -20,9 +20,15 @@ from __future__ import absolute_import, division, print_function
 
 __metaclass__ = type
 
+import json
+import os
+import subprocess
 import sys
 import copy
 
+from ansible.errors import AnsibleConnectionFailure
+from ansible.module_utils._text import to_text
+from ansible.module_utils.connection import write_to_stream
 from ansible_collections.ansible.netcommon.plugins.action.network import (
     ActionModule as ActionNetworkModule,
 )
@@ -36,13 +42,90 @@ from ansible.utils.display import Display
 
 display = Display()
 
+# plugin loaders whose search paths are handed to ansible-connection
+PLUGIN_PATH_LOADERS = (
+    "become",
+    "cliconf",
+    "connection",
+    "httpapi",
+    "netconf",
+    "terminal",
+)
+
+
+def connection_stub():
+    """Return the command line starting the ansible-connection process"""
+    try:
+        from ansible.cli import scripts
+        from ansible.executor.task_executor import CLI_STUB_NAME
+
+        path = os.path.join(os.path.dirname(scripts.__file__), CLI_STUB_NAME)
+    except ImportError:
+        path = os.path.join(os.path.dirname(sys.argv[0]), "ansible-connection")
+    return [sys.executable, path]
+
+
+def start_pool_session(play_context, options, task_uuid, member):
+    """Start the persistent connection of a session pool member and return
+    its socket path
+
+    ansible-connection derives the socket path from the host, port, user,
+    connection and playbook pid, so each member passes the playbook pid
+    suffixed with its number to get a connection, and SSH session, of its
+    own.  Like the main connection, members are reused by later tasks and
+    exit when idle for persistent_connect_timeout seconds.
+    """
+    from ansible.plugins import loader
+
+    env = os.environ.copy()
+    for name in PLUGIN_PATH_LOADERS:
+        plugin_loader = getattr(loader, "%s_loader" % name)
+        env["ANSIBLE_%s_PLUGINS" % name.upper()] = plugin_loader.print_paths()
+    try:
+        from ansible.utils.collection_loader import AnsibleCollectionConfig
+
+        env["ANSIBLE_COLLECTIONS_PATH"] = os.pathsep.join(
+            AnsibleCollectionConfig.collection_paths
+        )
+    except ImportError:
+        pass
+
+    command = connection_stub()
+    if display.verbosity:
+        command.append("-%s" % ("v" * display.verbosity))
+    command.extend(["%s-%s" % (os.getppid(), member), to_text(task_uuid)])
+    process = subprocess.Popen(
+        command,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        env=env,
+    )
+    write_to_stream(process.stdin, options)
+    write_to_stream(process.stdin, play_context.serialize())
+    stdout, stderr = process.communicate()
+
+    try:
+        result = json.loads(
+            to_text(stdout if process.returncode == 0 else stderr)
+        )
+    except ValueError:
+        result = {"error": to_text(stderr)}
+    for level, message in result.get("messages", []):
+        display.vvvv(
+            "session %s: %s" % (member, message), play_context.remote_addr
+        )
+    if "error" in result:
+        raise AnsibleConnectionFailure(result["error"])
+    return result["socket_path"]
+
 
 class ActionModule(ActionNetworkModule):
     def run(self, tmp=None, task_vars=None):
         del tmp  # tmp no longer has any effect
 
         module_name = self._task.action.split(".")[-1]
-        self._config_module = True if module_name == "saos_config" else False
+        self._config_module = True if module_name == "saos6_config" else False
         persistent_connection = self._play_context.connection.split(".")[-1]
         warnings = []
 
@@ -120,6 +203,60 @@ class ActionModule(ActionNetworkModule):
                 % self._play_context.connection,
             }
 
+        cache = self._task.args.get("cache")
+        if (
+            module_name == "saos6_facts"
+            and isinstance(cache, dict)
+            and not cache.get("host")
+        ):
+            cache["host"] = task_vars.get("inventory_hostname")
+
+        spool = self._task.args.get("spool")
+        if (
+            module_name in ("saos6_command", "saos6_facts")
+            and isinstance(spool, dict)
+            and not spool.get("prefix")
+        ):
+            spool["prefix"] = task_vars.get("inventory_hostname")
+
+        if module_name == "saos6_config" and self._task.args.get("backup"):
+            backup_options = dict(self._task.args.get("backup_options") or {})
+            if not backup_options.get("dir_path"):
+                backup_options["dir_path"] = os.path.join(
+                    self._get_working_path(), "backup"
+                )
+            if not backup_options.get("host"):
+                backup_options["host"] = task_vars.get("inventory_hostname")
+            self._task.args["backup_options"] = backup_options
+
+        session_pool = self._task.args.get("session_pool")
+        if (
+            module_name == "saos6_facts"
+            and isinstance(session_pool, dict)
+            and int(session_pool.get("size") or 1) > 1
+        ):
+            if persistent_connection != "network_cli":
+                return {
+                    "failed": True,
+                    "msg": "session_pool is only supported with the network_cli connection",
+                }
+            options = dict(self._connection.get_options())
+            # a config change only flushes the response cache of the
+            # connection it was made on, so the members keep none
+            options["response_cache"] = False
+            try:
+                session_pool["sockets"] = [
+                    start_pool_session(
+                        self._play_context, options, self._task._uuid, member
+                    )
+                    for member in range(1, int(session_pool["size"]))
+                ]
+            except AnsibleConnectionFailure as exc:
+                return {
+                    "failed": True,
+                    "msg": "unable to open pool session: %s" % to_text(exc),
+                }
+
         result = super(ActionModule, self).run(task_vars=task_vars)
         if warnings:
             if "warnings" in result:
@@ -127,3 +264,7 @@ class ActionModule(ActionNetworkModule):
             else:
                 result["warnings"] = warnings
         return result
+
+    def _handle_backup_option(self, result, task_vars, backup_options):
+        # saos6_config writes its backups to the store itself
+        pass
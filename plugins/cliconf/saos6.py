@@ -26,32 +26,238 @@ short_description: Use saos6 cliconf to run command on Ciena saos6 platform
 description:
   - This saos6 plugin provides low level abstraction apis for
     sending and receiving CLI commands from Ciena saos6 network devices.
+options:
+  device_info_cache:
+    type: boolean
+    default: false
+    description:
+    - Keep the device information (version and model) collected when a connection
+      is opened in a cache on the controller, so later connections to the same
+      device skip C(software show) and C(chassis show capabilities).
+    env:
+    - name: ANSIBLE_SAOS6_DEVICE_INFO_CACHE
+    vars:
+    - name: ansible_saos6_device_info_cache
+  device_info_cache_path:
+    type: path
+    default: ~/.ansible/cache/saos6
+    description:
+    - Directory on the controller holding the device information cache.
+    env:
+    - name: ANSIBLE_SAOS6_DEVICE_INFO_CACHE_PATH
+    vars:
+    - name: ansible_saos6_device_info_cache_path
+  device_info_cache_ttl:
+    type: int
+    default: 86400
+    description:
+    - Number of seconds cached device information is used as is. Older entries are
+      revalidated by comparing the running package reported by C(software show)
+      and only collected again if it changed.
+    env:
+    - name: ANSIBLE_SAOS6_DEVICE_INFO_CACHE_TTL
+    vars:
+    - name: ansible_saos6_device_info_cache_ttl
+  device_info_refresh:
+    type: boolean
+    default: false
+    description:
+    - Ignore any cached device information and collect it again.
+    env:
+    - name: ANSIBLE_SAOS6_DEVICE_INFO_REFRESH
+    vars:
+    - name: ansible_saos6_device_info_refresh
+  pipelining:
+    type: boolean
+    default: false
+    description:
+    - Send consecutive show commands of a run_commands request back to back
+      without waiting for the prompt after each one, and split the output on the
+      CLI prompts. Commands answering a prompt, and commands other than show
+      commands, are still sent one at a time.
+    env:
+    - name: ANSIBLE_SAOS6_PIPELINING
+    vars:
+    - name: ansible_saos6_pipelining
+  pipeline_depth:
+    type: int
+    default: 20
+    description:
+    - Maximum number of commands sent back to back when I(pipelining) is enabled.
+    env:
+    - name: ANSIBLE_SAOS6_PIPELINE_DEPTH
+    vars:
+    - name: ansible_saos6_pipeline_depth
+  response_cache:
+    type: boolean
+    default: false
+    description:
+    - Keep the responses of the show commands matching I(response_cache_commands)
+      in the persistent connection, and answer the same command run again within
+      I(response_cache_ttl) seconds from there, whatever the task running it. The
+      cache is flushed by any command other than a show command and by
+      configuration changes.  The extra sessions of a I(session_pool) never
+      cache responses, as they do not see the changes made on the others.
+    env:
+    - name: ANSIBLE_SAOS6_RESPONSE_CACHE
+    vars:
+    - name: ansible_saos6_response_cache
+  response_cache_ttl:
+    type: int
+    default: 30
+    description:
+    - Number of seconds a cached response is used.
+    env:
+    - name: ANSIBLE_SAOS6_RESPONSE_CACHE_TTL
+    vars:
+    - name: ansible_saos6_response_cache_ttl
+  response_cache_commands:
+    type: list
+    elements: str
+    default:
+    - software show
+    - chassis show *
+    - port show status
+    - port show port *
+    - lldp show neighbors
+    description:
+    - The show commands whose responses are cached, as shell style patterns.
+    env:
+    - name: ANSIBLE_SAOS6_RESPONSE_CACHE_COMMANDS
+    vars:
+    - name: ansible_saos6_response_cache_commands
 """
 
+import fnmatch
 import re
 import json
+import socket
+import time
 
 from itertools import chain
 
 from ansible.errors import AnsibleConnectionFailure
 from ansible.module_utils.common._collections_compat import Mapping
-from ansible.module_utils._text import to_text
+from ansible.module_utils._text import to_bytes, to_text
+from ansible.module_utils.six import string_types
 from ansible_collections.ansible.netcommon.plugins.module_utils.network.common.utils import (
     to_list,
 )
 from ansible.plugins.cliconf import CliconfBase
+from ansible_collections.ciena.saos6.plugins.module_utils.network.saos6.utils.cache import (
+    FileCache,
+    is_fresh,
+)
+from ansible_collections.ciena.saos6.plugins.module_utils.network.saos6.utils.spool import (
+    should_spool,
+    spool_options,
+    spool_text,
+)
+from ansible_collections.ciena.saos6.plugins.module_utils.network.saos6.utils.utils import (
+    is_show_command,
+)
+
+OPTION_DEFAULTS = {
+    "device_info_cache": False,
+    "device_info_cache_path": "~/.ansible/cache/saos6",
+    "device_info_cache_ttl": 86400,
+    "device_info_refresh": False,
+    "pipelining": False,
+    "pipeline_depth": 20,
+    "response_cache": False,
+    "response_cache_ttl": 30,
+    "response_cache_commands": [
+        "software show",
+        "chassis show *",
+        "port show status",
+        "port show port *",
+        "lldp show neighbors",
+    ],
+}
+
+# what may follow the prompt of the last pipelined command
+_END_OF_OUTPUT_RE = re.compile(br"\s*\Z")
 
 
 class Cliconf(CliconfBase):
+    def __init__(self, *args, **kwargs):
+        super(Cliconf, self).__init__(*args, **kwargs)
+        self._device_info = {}
+        self._command_timings = []
+        self._responses = {}
+        self._response_cache_stats = {"hits": 0, "misses": 0, "flushes": 0}
+
+    def _get_option(self, option):
+        try:
+            value = self.get_option(option)
+        except KeyError:
+            value = None
+        return OPTION_DEFAULTS[option] if value is None else value
+
+    def _device_key(self):
+        play_context = self._connection._play_context
+        return "%s@%s:%s" % (
+            play_context.remote_user,
+            play_context.remote_addr,
+            play_context.port or 22,
+        )
+
     def get_device_info(self):
-        device_info = {}
-        device_info["network_os"] = "ciena.saos6.saos6"
+        if not self._device_info:
+            if self._get_option("device_info_cache"):
+                self._device_info = self._get_cached_device_info()
+            else:
+                self._device_info = self._collect_device_info()
+        return self._device_info
+
+    def _get_cached_device_info(self):
+        cache = FileCache(
+            self._get_option("device_info_cache_path"), "device_info"
+        )
+        key = self._device_key()
+        entry = None
+        if not self._get_option("device_info_refresh"):
+            entry = cache.get(key)
+
+        version = None
+        if entry:
+            device_info = entry["device_info"]
+            ttl = int(self._get_option("device_info_cache_ttl"))
+            if is_fresh(entry["timestamp"], ttl):
+                return device_info
+            version = self._get_running_package()
+            if version == device_info.get("network_os_version"):
+                self._store_device_info(cache, key, device_info)
+                return device_info
+
+        device_info = self._collect_device_info(version)
+        self._store_device_info(cache, key, device_info)
+        return device_info
+
+    def _store_device_info(self, cache, key, device_info):
+        try:
+            cache.set(
+                key, {"timestamp": time.time(), "device_info": device_info}
+            )
+        except (IOError, OSError) as exc:
+            self._connection.queue_message(
+                "warning", "unable to write device info cache: %s" % exc
+            )
+
+    def _get_running_package(self):
         reply = self.get("software show")
         data = to_text(reply, errors="surrogate_or_strict").strip()
 
         match = re.search(r"Running Package +\: (\S+)", data)
         if match:
-            device_info["network_os_version"] = match.group(1).strip(",")
+            return match.group(1).strip(",")
+
+    def _collect_device_info(self, version=None):
+        device_info = {}
+        device_info["network_os"] = "ciena.saos6.saos6"
+        version = version or self._get_running_package()
+        if version:
+            device_info["network_os_version"] = version
 
         reply = self.get("chassis show capabilities")
         data = to_text(reply, errors="surrogate_or_strict").strip()
@@ -62,17 +268,79 @@ class Cliconf(CliconfBase):
 
         return device_info
 
+    def send_command(self, command=None, **kwargs):
+        if command is not None and not is_show_command(to_text(command)):
+            self.flush_response_cache()
+        return super(Cliconf, self).send_command(command=command, **kwargs)
+
+    def _is_cacheable(self, cmd):
+        if not self._get_option("response_cache"):
+            return False
+        if not self._is_plain_command(cmd):
+            return False
+        command = " ".join(to_text(cmd["command"]).split())
+        return is_show_command(command) and any(
+            fnmatch.fnmatchcase(command, pattern)
+            for pattern in self._get_option("response_cache_commands")
+        )
+
+    def _cached_response(self, command):
+        entry = self._responses.get(" ".join(to_text(command).split()))
+        ttl = int(self._get_option("response_cache_ttl"))
+        if entry is not None and is_fresh(entry[0], ttl):
+            self._response_cache_stats["hits"] += 1
+            return entry[1]
+        self._response_cache_stats["misses"] += 1
+        return None
+
+    def _cache_response(self, command, out):
+        if isinstance(out, string_types) and not self._find_error(out):
+            self._responses[" ".join(to_text(command).split())] = (
+                time.time(),
+                out,
+            )
+
+    def flush_response_cache(self):
+        """Forget every cached show command response"""
+        if self._responses:
+            self._response_cache_stats["flushes"] += 1
+            self._responses = {}
+
+    def get_response_cache_stats(self):
+        """Return the hits, misses, flushes, size and hit rate of the show
+        command response cache since the connection was opened
+        """
+        stats = dict(self._response_cache_stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["size"] = len(self._responses)
+        stats["hit_rate"] = (
+            round(stats["hits"] / float(lookups), 4) if lookups else 0.0
+        )
+        return stats
+
     def get_config(self, source="running", format="text", flags=None):
         cmd = "conf sh brief"
         out = self.send_command(cmd)
         return out
 
-    def edit_config(self, command):
-        for cmd in chain(to_list(command)):
-            self.send_command(cmd)
+    def edit_config(
+        self, candidate=None, commit=True, replace=None, comment=None
+    ):
+        # SAOS 6 applies each command as it is entered, there is no
+        # candidate config to commit
+        self.flush_response_cache()
+        requests = []
+        responses = []
+        for cmd in chain(to_list(candidate)):
+            if not isinstance(cmd, Mapping):
+                cmd = {"command": cmd}
+            responses.append(self.send_command(**cmd))
+            requests.append(cmd["command"])
+        return {"request": requests, "response": responses}
 
     def get_capabilities(self):
         result = super(Cliconf, self).get_capabilities()
+        result["response_cache"] = bool(self._get_option("response_cache"))
         return json.dumps(result)
 
     def get(
@@ -101,11 +369,49 @@ class Cliconf(CliconfBase):
             check_all=check_all,
         )
 
-    def run_commands(self, commands=None, check_rc=True):
+    def run_commands(
+        self,
+        commands=None,
+        check_rc=True,
+        profile=False,
+        spool=None,
+        cache=True,
+    ):
+        """Run commands and return their responses
+
+        With profile the wall time and size of every response are recorded
+        for pop_command_timings.  With spool, a dict of spool options, every
+        response of at least threshold characters is written to compressed
+        files on the controller once it is read in full, and replaced by the
+        record of those files, except the responses of the commands at the
+        exclude indexes.  When the response cache is enabled, cacheable
+        commands are answered from it unless cache is False, and their fresh
+        responses stored in it either way.
+        """
         if commands is None:
             raise ValueError("'commands' value is required")
 
+        pipelining = self._get_option("pipelining")
+        depth = max(int(self._get_option("pipeline_depth")), 1)
+        spool_opts = spool_options(spool)
+        exclude = frozenset((spool or {}).get("exclude") or [])
+
         responses = list()
+        batch = list()
+        cacheable = set()
+
+        def collect(sent, outputs):
+            for command, out in zip(sent, outputs):
+                if command in cacheable:
+                    self._cache_response(command, out)
+                if (
+                    isinstance(out, string_types)
+                    and len(responses) not in exclude
+                    and should_spool(out, spool_opts)
+                ):
+                    out = spool_text(out, spool_opts, command)
+                responses.append(out)
+
         for cmd in to_list(commands):
             if not isinstance(cmd, Mapping):
                 cmd = {"command": cmd}
@@ -117,13 +423,246 @@ class Cliconf(CliconfBase):
                     % output
                 )
 
+            if self._is_cacheable(cmd):
+                out = self._cached_response(cmd["command"]) if cache else None
+                if out is not None:
+                    if batch:
+                        collect(
+                            batch, self._run_batch(batch, check_rc, profile)
+                        )
+                        batch = list()
+                    if profile:
+                        now = time.time()
+                        self._record_timing(cmd["command"], now, now, out)
+                    collect([None], [out])
+                    continue
+                cacheable.add(cmd["command"])
+
+            if pipelining and self._is_plain_command(cmd):
+                if is_show_command(cmd["command"]):
+                    batch.append(cmd["command"])
+                    if len(batch) >= depth:
+                        collect(
+                            batch, self._run_batch(batch, check_rc, profile)
+                        )
+                        batch = list()
+                    continue
+            if batch:
+                collect(batch, self._run_batch(batch, check_rc, profile))
+                batch = list()
+
+            start = time.time()
             try:
                 out = self.send_command(**cmd)
             except AnsibleConnectionFailure as e:
                 if check_rc:
                     raise
                 out = getattr(e, "err", e)
+            if profile:
+                self._record_timing(cmd["command"], start, time.time(), out)
 
-            responses.append(out)
+            collect([cmd["command"]], [out])
+
+        if batch:
+            collect(batch, self._run_batch(batch, check_rc, profile))
+        return responses
+
+    @staticmethod
+    def _is_plain_command(cmd):
+        """Return True if cmd only needs sending, without prompt handling or
+        other send_command options, and so can be pipelined
+        """
+        return (
+            not cmd.get("prompt")
+            and not cmd.get("answer")
+            and cmd.get("newline", True)
+            and not cmd.get("sendonly")
+            and not cmd.get("check_all")
+        )
+
+    def pop_command_timings(self):
+        """Return and forget the timings recorded by run_commands with
+        profile, as dicts of command, elapsed seconds and response bytes
+        """
+        timings, self._command_timings = self._command_timings, []
+        return timings
 
+    def _record_timing(self, command, start, end, out):
+        self._command_timings.append(
+            {
+                "command": to_text(command),
+                "elapsed": end - start,
+                "bytes": len(to_bytes(out, errors="surrogate_then_replace")),
+            }
+        )
+
+    def _run_batch(self, commands, check_rc, profile=False):
+        start = time.time()
+        if len(commands) == 1:
+            try:
+                out = self.send_command(command=commands[0])
+            except AnsibleConnectionFailure as e:
+                if check_rc:
+                    raise
+                out = getattr(e, "err", e)
+            if profile:
+                self._record_timing(commands[0], start, time.time(), out)
+            return [out]
+
+        completed = list()
+        responses = list()
+        for command, out, end in zip(
+            commands, self._send_pipelined(commands, completed), completed
+        ):
+            out = to_text(out, errors="surrogate_then_replace")
+            if profile:
+                # responses arrive in order, each one after the previous one
+                self._record_timing(command, start, end, out)
+                start = end
+            if check_rc and self._find_error(out):
+                raise AnsibleConnectionFailure(
+                    "%s: %s" % (command, out.strip())
+                )
+            responses.append(out)
         return responses
+
+    def _send_pipelined(self, commands, completed=None):
+        """Send commands back to back and split the output received on the
+        CLI prompts, returning one response per command
+
+        The time each response was complete is appended to completed.
+        """
+        connection = self._connection
+        # the shell is only opened by the first command, and closed on a
+        # command timeout; open it as the ensure_connect of send_command does
+        if not connection.connected:
+            connection._connect()
+        if hasattr(connection, "update_cli_prompt_context"):
+            connection.update_cli_prompt_context()
+        shell = connection._ssh_shell
+        prompt_res = self._pipeline_prompt_res()
+        timeout = connection.get_option("persistent_command_timeout")
+        bulk = hasattr(shell, "read_bulk_response")
+
+        shell.sendall(b"".join(b"%s\r" % to_bytes(cmd) for cmd in commands))
+
+        buf = bytearray()
+        start = scan = 0
+        raw = list()
+        awaited = "output"
+        deadline = time.time() + timeout
+        while len(raw) < len(commands):
+            closed = (
+                "connection closed while waiting for the output of: %s"
+                % commands[len(raw)]
+            )
+            try:
+                data = shell.read_bulk_response() if bulk else shell.recv(4096)
+            except socket.timeout:
+                data = None
+            except (IOError, OSError):
+                # libssh raises when the channel is closed
+                raise AnsibleConnectionFailure(closed)
+            if data:
+                buf.extend(connection._strip(data))
+            elif data is not None and not bulk:
+                # paramiko returns nothing once the channel is closed, libssh
+                # when nothing was received yet
+                raise AnsibleConnectionFailure(closed)
+            elif time.time() > deadline or data is None:
+                # a response ending at a prompt still needs the echo of the
+                # next command to tell it from output looking like a prompt
+                idx = len(raw) + (awaited == "echo")
+                raise AnsibleConnectionFailure(
+                    "timeout value %s seconds reached while waiting for the "
+                    "%s of: %s" % (timeout, awaited, commands[idx])
+                )
+
+            awaited = "output"
+            while len(raw) < len(commands):
+                following = len(raw) + 1
+                match = self._match_pipelined_prompt(
+                    prompt_res, buf, scan, commands[following:]
+                )
+                if match is None:
+                    # only rescan the tail the previous pass could not match
+                    scan = max(scan, start, len(buf) - 256)
+                    break
+                if match is False:
+                    # a prompt waiting for the rest of the next echo
+                    awaited = "echo"
+                    break
+                end = match.start()
+                raw.append(bytes(buf[start:end]))
+                if completed is not None:
+                    completed.append(time.time())
+                start = scan = match.end()
+                deadline = time.time() + timeout
+
+        return [
+            self._sanitize_pipelined(cmd, out)
+            for cmd, out in zip(commands, raw)
+        ]
+
+    def _match_pipelined_prompt(self, prompt_res, buf, pos, pending):
+        """Return the first prompt in buf from pos ending the response of a
+        command, False when a prompt may end it once more output is read,
+        and None when there is none
+
+        A prompt ends a response when it is followed by the echo of the
+        next pending command or, after the last command, by the end of buf;
+        output lines that merely look like a prompt are skipped.
+        """
+        echo = to_bytes(pending[0]) if pending else b""
+        while True:
+            matches = [regex.search(buf, pos) for regex in prompt_res]
+            matches = [match for match in matches if match]
+            if not matches:
+                return None
+            match = min(matches, key=lambda m: m.start())
+            end = match.end()
+            limit = end + len(echo)
+            if not pending:
+                if _END_OF_OUTPUT_RE.match(buf, end):
+                    return match
+            elif buf.startswith(echo, end):
+                return match
+            elif echo.startswith(bytes(buf[end:limit])):
+                # buf ends before the whole echo was read
+                return False
+            pos = max(end, match.start() + 1)
+
+    def _terminal_re(self, option):
+        """Return the terminal_stdout_re or terminal_stderr_re regexes of
+        the connection, those set in its options before the terminal ones
+        """
+        connection = self._connection
+        if hasattr(connection, "_get_terminal_std_re"):
+            return connection._get_terminal_std_re(option)
+        return getattr(connection._terminal, option)
+
+    def _pipeline_prompt_res(self):
+        # the prompt of one command is followed on the same line by the echo
+        # of the next one, so the patterns are anchored to the line start
+        # instead of the end of the buffer
+        regexes = list()
+        for regex in self._terminal_re("terminal_stdout_re"):
+            for pattern in getattr(regex, "patterns", [regex.pattern]):
+                if pattern.endswith(b"$"):
+                    pattern = pattern[:-1]
+                regexes.append(
+                    re.compile(b"^(?:%s)" % pattern, regex.flags | re.M)
+                )
+        return regexes
+
+    def _sanitize_pipelined(self, command, response):
+        lines = response.splitlines()
+        if lines and lines[0].strip() == to_bytes(command).strip():
+            lines = lines[1:]
+        return b"\n".join(line.rstrip(b"\r") for line in lines).strip()
+
+    def _find_error(self, response):
+        for regex in self._terminal_re("terminal_stderr_re"):
+            if regex.search(to_bytes(response)):
+                return True
+        return False
@@ -0,0 +1,48 @@
+#
+# -*- coding: utf-8 -*-
+# Copyright 2020 Ciena Corp
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+"""
+Filters expanding the column oriented facts of saos6_facts
+"""
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from ansible.errors import AnsibleFilterError
+from ansible.module_utils.six import string_types
+from ansible_collections.ciena.saos6.plugins.module_utils.network.saos6.utils.columnar import (
+    from_columnar,
+    is_columnar,
+)
+
+
+def expand_rows(table, columns=None):
+    """Return the rows of a facts_format=columnar table, such as
+    ansible_net_interfaces, as a list of dicts
+
+    A list of rows is returned unchanged, so the filter works with both
+    facts formats.  columns, a name or a list of names, limits the keys of
+    the rows returned.
+    """
+    if isinstance(columns, string_types):
+        columns = [columns]
+    if is_columnar(table):
+        return from_columnar(table, columns)
+    if not isinstance(table, list):
+        raise AnsibleFilterError(
+            "expand_rows expects a columnar table or a list of rows, got %s"
+            % type(table).__name__
+        )
+    if columns is None:
+        return table
+    return [
+        dict((key, value) for key, value in row.items() if key in columns)
+        for row in table
+    ]
+
+
+class FilterModule(object):
+    def filters(self):
+        return {"expand_rows": expand_rows}
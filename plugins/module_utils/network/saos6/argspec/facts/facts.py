@@ -8,6 +8,10 @@ from __future__ import absolute_import, division, print_function
 
 __metaclass__ = type
 
+from ansible_collections.ciena.saos6.plugins.module_utils.network.saos6.utils.spool import (
+    spool_spec,
+)
+
 
 class FactsArgs(object):  # pylint: disable=R0903
     """ The arg spec for the saos6 facts module
@@ -19,4 +23,35 @@ class FactsArgs(object):  # pylint: disable=R0903
     argument_spec = {
         "gather_subset": dict(default=["!config"], type="list"),
         "gather_network_resources": dict(type="list"),
+        "cache": dict(
+            type="dict",
+            options=dict(
+                path=dict(type="path", default="~/.ansible/cache/saos6"),
+                host=dict(type="str"),
+                ttl=dict(type="int", default=600),
+                subset_ttl=dict(type="dict"),
+                incremental=dict(type="bool", default=False),
+            ),
+        ),
+        "previous_interfaces": dict(type="raw"),
+        "session_pool": dict(
+            type="dict",
+            options=dict(
+                size=dict(type="int", default=1), sockets=dict(type="list")
+            ),
+        ),
+        "profile": dict(type="bool", default=False),
+        "facts_format": dict(default="rows", choices=["rows", "columnar"]),
+        "spool": dict(type="dict", options=spool_spec),
+        "parsers": dict(
+            type="dict",
+            options=dict(
+                interfaces=dict(
+                    default="native", choices=["native", "textfsm"]
+                ),
+                neighbors=dict(
+                    default="native", choices=["native", "textfsm"]
+                ),
+            ),
+        ),
     }
@@ -10,43 +10,335 @@ from __future__ import absolute_import, division, print_function
 
 __metaclass__ = type
 
-from ansible_collections.ansible.netcommon.plugins.module_utils.network.common.facts.facts import (
-    FactsBase,
+import importlib
+import time
+
+from ansible.module_utils._text import to_text
+from ansible.module_utils.six import string_types
+from ansible_collections.ciena.saos6.plugins.module_utils.network.saos6.saos6 import (
+    get_profile,
+    get_session_pool,
+    profile_scope,
+)
+from ansible_collections.ciena.saos6.plugins.module_utils.network.saos6.utils.cache import (
+    FileCache,
+    is_fresh,
+)
+from ansible_collections.ciena.saos6.plugins.module_utils.network.saos6.utils.config import (
+    parse_config,
 )
-from ansible_collections.ciena.saos6.plugins.module_utils.network.saos6.facts.legacy.base import (
-    Default,
-    Neighbors,
-    Interfaces,
-    Config,
+from ansible_collections.ciena.saos6.plugins.module_utils.network.saos6.utils.utils import (
+    get_textfsm_cache_stats,
 )
 
+if False:  # pragma: no cover
+    # never run; the module payload only takes the module_utils named by an
+    # import statement, so the subsets imported by load_subset are named here
+    from ansible_collections.ciena.saos6.plugins.module_utils.network.saos6.facts.legacy import (  # noqa: F401
+        base,
+    )
+    from ansible_collections.ciena.saos6.plugins.module_utils.network.saos6.facts.ports import (  # noqa: F401
+        ports,
+    )
+    from ansible_collections.ciena.saos6.plugins.module_utils.network.saos6.facts.virtual_switches import (  # noqa: F401
+        virtual_switches,
+    )
+    from ansible_collections.ciena.saos6.plugins.module_utils.network.saos6.facts.vlans import (  # noqa: F401
+        vlans,
+    )
 
+_FACTS_PACKAGE = (
+    "ansible_collections.ciena.saos6.plugins.module_utils.network.saos6.facts"
+)
+
+# subsets map to the module and class gathering them, which is only imported
+# when the subset is gathered
 FACT_LEGACY_SUBSETS = dict(
-    default=Default, neighbors=Neighbors, config=Config, interfaces=Interfaces
+    default="legacy.base:Default",
+    neighbors="legacy.base:Neighbors",
+    config="legacy.base:Config",
+    config_parsed="legacy.base:ConfigParsed",
+    interfaces="legacy.base:Interfaces",
+    interfaces_summary="legacy.base:InterfacesSummary",
+)
+
+# network resources, all read from the one parsed running config
+FACT_RESOURCE_SUBSETS = dict(
+    ports="ports.ports:PortsFacts",
+    virtual_switches="virtual_switches.virtual_switches:Virtual_switchesFacts",
+    vlans="vlans.vlans:VlansFacts",
 )
 
+# subsets only gathered when named explicitly or with "all"
+OPT_IN_LEGACY_SUBSETS = frozenset(["config_parsed", "interfaces_summary"])
+
+
+def load_subset(path):
+    """Import the module of a subset and return the class gathering it"""
+    module_name, class_name = path.split(":")
+    module = importlib.import_module("%s.%s" % (_FACTS_PACKAGE, module_name))
+    return getattr(module, class_name)
 
-class Facts(FactsBase):
+
+class Facts(object):
     """ The fact class for saos 6
     """
 
     VALID_LEGACY_GATHER_SUBSETS = frozenset(FACT_LEGACY_SUBSETS.keys())
+    VALID_RESOURCE_SUBSETS = frozenset(FACT_RESOURCE_SUBSETS.keys())
 
     def __init__(self, module):
-        super(Facts, self).__init__(module)
+        self._module = module
+        self._warnings = []
+        self._gather_subset = module.params.get("gather_subset") or ["!config"]
+        self._gather_network_resources = module.params.get(
+            "gather_network_resources"
+        ) or ["!all"]
+        self._cache_options = module.params.get("cache")
+        self._subset_times = {}
+
+        self.ansible_facts = {
+            "ansible_network_resources": {},
+            "ansible_net_gather_network_resources": [],
+            "ansible_net_gather_subset": [],
+        }
 
     def get_facts(
         self, legacy_facts_type=None, resource_facts_type=None, data=None
     ):
         """ Collect the facts for saos 6
         :param legacy_facts_type: List of legacy facts types
+        :param resource_facts_type: List of resource fact types
         :param data: previously collected conf
         :rtype: dict
         :return: the facts gathered
         """
 
+        if not legacy_facts_type:
+            legacy_facts_type = list(self._gather_subset)
+            if "all" not in legacy_facts_type:
+                legacy_facts_type.extend(
+                    "!%s" % subset
+                    for subset in sorted(OPT_IN_LEGACY_SUBSETS)
+                    if subset not in legacy_facts_type
+                )
+
+        if self.VALID_RESOURCE_SUBSETS:
+            # every resource reads the same tree, so given conf is parsed
+            # once here and the device config once by get_parsed_config
+            if isinstance(data, string_types):
+                data = parse_config(data)
+            self.get_network_resources_facts(
+                FACT_RESOURCE_SUBSETS, resource_facts_type, data
+            )
+
         if self.VALID_LEGACY_GATHER_SUBSETS:
             self.get_network_legacy_facts(
                 FACT_LEGACY_SUBSETS, legacy_facts_type
             )
         return self.ansible_facts, self._warnings
+
+    def gen_runable(self, subsets, valid_subsets, resource_facts=False):
+        """ Return the set of subsets to gather, from the given gather_subset
+        style list of names, "all", "min" and their "!" negations
+        """
+        runable_subsets = set()
+        exclude_subsets = set()
+        minimal_gather_subset = set()
+        if not resource_facts:
+            minimal_gather_subset = frozenset(["default"])
+
+        for subset in subsets:
+            if subset == "all":
+                runable_subsets.update(valid_subsets)
+                continue
+            if subset == "min" and minimal_gather_subset:
+                runable_subsets.update(minimal_gather_subset)
+                continue
+            exclude = subset.startswith("!")
+            if exclude:
+                subset = subset[1:]
+                if subset == "min":
+                    exclude_subsets.update(minimal_gather_subset)
+                    continue
+                if subset == "all":
+                    exclude_subsets.update(
+                        valid_subsets - minimal_gather_subset
+                    )
+                    continue
+
+            if subset not in valid_subsets:
+                self._module.fail_json(
+                    msg="Subset must be one of [%s], got %s"
+                    % (", ".join(sorted(valid_subsets)), subset)
+                )
+
+            if exclude:
+                exclude_subsets.add(subset)
+            else:
+                runable_subsets.add(subset)
+
+        if not runable_subsets:
+            runable_subsets.update(valid_subsets)
+        runable_subsets.difference_update(exclude_subsets)
+        return runable_subsets
+
+    def get_network_resources_facts(
+        self, fact_resource_obj_map, resource_facts_type=None, data=None
+    ):
+        """ Collect the network resource facts
+
+        The resources read the device through get_parsed_config, so they are
+        not given a connection.
+        """
+        runable_subsets = self.gen_runable(
+            resource_facts_type or self._gather_network_resources,
+            frozenset(fact_resource_obj_map.keys()),
+            resource_facts=True,
+        )
+        if not runable_subsets:
+            return
+        self.ansible_facts["ansible_net_gather_network_resources"] = list(
+            runable_subsets
+        )
+        for key in runable_subsets:
+            inst = load_subset(fact_resource_obj_map[key])(self._module)
+            try:
+                inst.populate_facts(None, self.ansible_facts, data)
+            except Exception as exc:
+                self._module.fail_json(msg=to_text(exc))
+
+    def get_network_legacy_facts(
+        self, fact_legacy_obj_map, legacy_facts_type=None
+    ):
+        """ Collect the legacy facts, serving unexpired subsets from the
+        controller side facts cache when it is enabled and spreading the
+        subsets over the session pool when one was started
+        """
+        runable_subsets = self.gen_runable(
+            legacy_facts_type or self._gather_subset,
+            frozenset(fact_legacy_obj_map.keys()),
+        )
+        runable_subsets.add("default")
+        self.ansible_facts["ansible_net_gather_subset"] = list(runable_subsets)
+
+        # the default subset is always run first, it identifies the device
+        default = self.populate_subset(
+            fact_legacy_obj_map, self._module, "default"
+        )
+        facts = dict(default.facts)
+        self._warnings.extend(default.warnings)
+
+        subsets = sorted(runable_subsets - set(["default"]))
+        if not self._cache_options:
+            for inst in self.populate_subsets(fact_legacy_obj_map, subsets):
+                facts.update(inst.facts)
+                self._warnings.extend(inst.warnings)
+            self.set_legacy_facts(facts)
+            return
+
+        cache = FileCache(self._cache_options["path"], "facts")
+        host = self._cache_options.get("host") or self._module._socket_path
+        device = {
+            "serialnum": default.facts.get("serialnum"),
+            "version": default.facts.get("version"),
+        }
+        facts_format = self._module.params.get("facts_format") or "rows"
+        entry = cache.get(host) or {}
+        if (
+            entry.get("device") != device
+            or entry.get("facts_format", "rows") != facts_format
+        ):
+            entry = {
+                "device": device,
+                "facts_format": facts_format,
+                "subsets": {},
+            }
+
+        ttls = self._cache_options.get("subset_ttl") or {}
+        cached_subsets = []
+        stale_subsets = []
+        previous = {}
+        for key in subsets:
+            cached = entry["subsets"].get(key)
+            ttl = int(ttls.get(key, self._cache_options["ttl"]))
+            if cached and is_fresh(cached["timestamp"], ttl):
+                cached_subsets.append(key)
+                continue
+            stale_subsets.append(key)
+            if cached and self._cache_options.get("incremental"):
+                previous[key] = cached["facts"]
+
+        instances = self.populate_subsets(
+            fact_legacy_obj_map, stale_subsets, previous
+        )
+        for key, inst in zip(stale_subsets, instances):
+            self._warnings.extend(inst.warnings)
+            entry["subsets"][key] = {
+                "timestamp": time.time(),
+                "facts": inst.facts,
+            }
+        for key in subsets:
+            facts.update(entry["subsets"][key]["facts"])
+
+        if stale_subsets:
+            try:
+                cache.set(host, entry)
+            except (IOError, OSError) as exc:
+                self._warnings.append(
+                    "unable to write facts cache for %s: %s" % (host, exc)
+                )
+
+        facts["cached_subsets"] = cached_subsets
+        self.set_legacy_facts(facts)
+
+    def populate_subsets(self, fact_legacy_obj_map, subsets, previous=None):
+        """Populate the given subsets and return their instances in the same
+        order, concurrently over the session pool when there is one
+
+        previous maps subsets to the facts of an earlier run they can be
+        refreshed from instead of collected in full.
+        """
+        previous = previous or {}
+
+        def populate(module, key):
+            return self.populate_subset(
+                fact_legacy_obj_map, module, key, previous.get(key)
+            )
+
+        pool = get_session_pool(self._module)
+        if pool is None:
+            return [populate(self._module, key) for key in subsets]
+        return pool.map(populate, subsets)
+
+    def populate_subset(self, fact_legacy_obj_map, module, key, previous=None):
+        start = time.time()
+        inst = load_subset(fact_legacy_obj_map[key])(module)
+        if previous is not None and inst.previous is None:
+            inst.previous = previous
+        with profile_scope(key):
+            inst.populate()
+        self._subset_times[key] = round(time.time() - start, 4)
+        return inst
+
+    def get_profile(self):
+        """Return the command timings of the run with per subset totals and
+        the counters of the TextFSM template cache, or None when profiling is
+        not enabled
+        """
+        profile = get_profile(self._module)
+        if profile is None:
+            return None
+        subsets = profile.pop("scopes", {})
+        for key, wall_time in self._subset_times.items():
+            subset = subsets.setdefault(
+                key, {"commands": 0, "elapsed": 0.0, "bytes": 0}
+            )
+            subset["wall_time"] = wall_time
+        profile["subsets"] = subsets
+        profile["textfsm_cache"] = get_textfsm_cache_stats()
+        return profile
+
+    def set_legacy_facts(self, facts):
+        for key, value in facts.items():
+            self.ansible_facts["ansible_net_%s" % key] = value
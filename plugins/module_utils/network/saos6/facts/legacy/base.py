@@ -17,21 +17,47 @@ import re
 from ansible_collections.ciena.saos6.plugins.module_utils.network.saos6.saos6 import (
     run_commands,
     get_capabilities,
+    get_config,
+    get_parsed_config,
+    get_session_pool,
 )
 from ansible_collections.ciena.saos6.plugins.module_utils.network.saos6.utils.utils import (
     parse_cli_textfsm,
 )
+from ansible_collections.ciena.saos6.plugins.module_utils.network.saos6.utils.columnar import (
+    from_columnar,
+    to_columnar,
+)
+from ansible_collections.ciena.saos6.plugins.module_utils.network.saos6.utils.spool import (
+    should_spool,
+    spool_options,
+    spool_text,
+)
+from ansible_collections.ciena.saos6.plugins.module_utils.network.saos6.utils.parsers import (
+    parse_lldp_neighbors,
+    parse_port_detail,
+    parse_port_status,
+)
 
 
 class FactsBase(object):
 
     COMMANDS = frozenset()
 
+    # gather_subset name, used to look up the parser engine for the subset
+    SUBSET = None
+    TEMPLATE = None
+
     def __init__(self, module):
         self.module = module
         self.facts = dict()
         self.warnings = list()
         self.responses = None
+        parsers = module.params.get("parsers") or {}
+        self.parser = parsers.get(self.SUBSET) or "native"
+        # facts of an earlier run of the subset, to refresh incrementally
+        self.previous = None
+        self.columnar = module.params.get("facts_format") == "columnar"
 
     def populate(self):
         self.responses = run_commands(
@@ -41,6 +67,24 @@ class FactsBase(object):
     def run(self, cmd):
         return run_commands(self.module, commands=cmd, check_rc=False)
 
+    def set_table(self, key, rows):
+        """Set a fact holding a list of rows, column oriented when the
+        columnar facts_format is selected
+        """
+        self.facts[key] = to_columnar(rows) if self.columnar else rows
+
+    def parse(self, data, native_parser):
+        """Parse command output with the engine selected for this subset
+
+        The native parsers return the same fields as TEMPLATE, which is only
+        used when the textfsm engine is selected.
+        """
+        if self.parser == "textfsm":
+            return parse_cli_textfsm(
+                data, self.TEMPLATE, template_id=self.__class__.__name__
+            )
+        return native_parser(data)
+
 
 class Default(FactsBase):
 
@@ -81,19 +125,34 @@ class Config(FactsBase):
     COMMANDS = ["conf show brief"]
 
     def populate(self):
-        super(Config, self).populate()
-        self.facts["config"] = self.responses[0]
+        # read through get_config so config and config_parsed share one read
+        config = get_config(self.module)
+        spool = spool_options(self.module.params.get("spool"))
+        if should_spool(config, spool):
+            self.facts["config_spooled"] = spool_text(config, spool, "config")
+        else:
+            self.facts["config"] = config
+
+
+class ConfigParsed(FactsBase):
+
+    COMMANDS = ["conf show brief"]
+
+    def populate(self):
+        # parsed once and shared with the network resource facts
+        config = get_parsed_config(self.module)
+        self.facts["config_parsed"] = config.to_dict()
 
 
 class Interfaces(FactsBase):
 
     COMMANDS = ["port show status"]
+    SUBSET = "interfaces"
 
-    def populate(self):
-        super(Interfaces, self).populate()
-        ports = re.findall(r"^\|([0-9.i]+) *\|", self.responses[0], re.M)
+    # Number of "port show port" commands sent per run_commands request
+    BATCH_SIZE = 64
 
-        fsm = r"""#
+    TEMPLATE = r"""#
 Value port (\S+)
 Value macAddress (\S+)
 Value LinkStateAdmin (\S+)
@@ -142,25 +201,120 @@ Start
 
 EOF
 """
+
+    def __init__(self, module):
+        super(Interfaces, self).__init__(module)
+        previous = module.params.get("previous_interfaces")
+        if previous is not None:
+            self.previous = {"interfaces": previous}
+
+    def populate(self):
+        super(Interfaces, self).populate()
+        ports = re.findall(r"^\|([0-9.i]+) *\|", self.responses[0], re.M)
+        if self.previous is not None:
+            self.populate_changed(ports)
+            return
+
         interfaces = []
-        for port in ports:
-            command = "port show port %s" % port
-            port_response = self.run([command])
-            interface = parse_cli_textfsm(
-                port_response[0], fsm.encode("utf-8")
+        for port_response in self.run_batched(
+            ["port show port %s" % port for port in ports]
+        ):
+            interface = self.parse(port_response, parse_port_detail)
+            if interface:
+                interfaces.append(interface[0])
+        self.set_table("interfaces", interfaces)
+
+    def populate_changed(self, ports):
+        """Refresh the previous interfaces, reading the details of the new
+        ports and of the ports whose admin or oper link state changed only
+        """
+        known = dict(
+            (interface["port"], interface)
+            for interface in from_columnar(
+                self.previous.get("interfaces") or []
             )
-            interfaces.append(interface[0])
-        self.facts["interfaces"] = interfaces
+        )
+        status = dict(
+            (row["port"], row) for row in parse_port_status(self.responses[0])
+        )
+        changed = [
+            port
+            for port in ports
+            if not self.same_link_state(known.get(port), status.get(port))
+        ]
+        for port_response in self.run_batched(
+            ["port show port %s" % port for port in changed]
+        ):
+            interface = self.parse(port_response, parse_port_detail)
+            if interface:
+                known[interface[0]["port"]] = interface[0]
+        self.set_table(
+            "interfaces", [known[port] for port in ports if port in known]
+        )
+        self.facts["interfaces_refreshed"] = changed
+
+    @staticmethod
+    def same_link_state(interface, status):
+        """Compare the link state of a "port show port" record with a
+        "port show status" row, which abbreviates the admin state
+        """
+        if not interface or not status:
+            return False
+        admin = interface["LinkStateAdmin"].lower()
+        oper = interface["LinkStateOper"].lower()
+        return (
+            bool(status["LinkStateAdmin"])
+            and admin.startswith(status["LinkStateAdmin"].lower())
+            and oper == status["LinkStateOper"].lower()
+        )
 
+    def run_batched(self, commands):
+        """Send the per-port detail commands in as few requests as possible,
+        yielding the responses in command order
+
+        With a session pool the commands are split in one batch per session
+        at most, and the batches are run concurrently.
+        """
+        pool = get_session_pool(self.module)
+        size = self.BATCH_SIZE
+        if pool is not None:
+            size = max(1, min(size, -(-len(commands) // pool.size)))
+        batches = []
+        for start in range(0, len(commands), size):
+            end = start + size
+            batches.append(commands[start:end])
+        if pool is None:
+            responses = (self.run(batch) for batch in batches)
+        else:
+            responses = pool.map(
+                lambda session, batch: run_commands(
+                    session, commands=batch, check_rc=False
+                ),
+                batches,
+                session=self.module,
+            )
+        for batch_responses in responses:
+            for response in batch_responses:
+                yield response
 
-class Neighbors(FactsBase):
 
-    COMMANDS = ["lldp show configuration", "lldp show neighbors"]
+class InterfacesSummary(FactsBase):
+
+    COMMANDS = ["port show status"]
 
     def populate(self):
-        super(Neighbors, self).populate()
+        super(InterfacesSummary, self).populate()
+        self.set_table(
+            "interfaces_summary", parse_port_status(self.responses[0])
+        )
+
+
+class Neighbors(FactsBase):
+
+    COMMANDS = ["lldp show configuration", "lldp show neighbors"]
+    SUBSET = "neighbors"
 
-        fsm = r"""#
+    TEMPLATE = r"""#
 Value localPort (\S+)
 Value remotePort (\S+)
 Value chassisId (\S+)
@@ -182,9 +336,10 @@ Entrypoint
   ^\+[-]+ -> Record
 """
 
+    def populate(self):
+        super(Neighbors, self).populate()
+
         lldp_config = self.responses[0]
         if "Enable" in lldp_config:
-            neighbors = parse_cli_textfsm(
-                self.responses[1], fsm.encode("utf-8")
-            )
-            self.facts["neighbors"] = neighbors
+            neighbors = self.parse(self.responses[1], parse_lldp_neighbors)
+            self.set_table("neighbors", neighbors)
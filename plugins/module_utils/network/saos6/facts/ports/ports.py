@@ -0,0 +1,68 @@
+#
+# -*- coding: utf-8 -*-
+# Copyright 2020 Ciena Corp
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+"""
+The saos6 ports fact class
+It is in this file the configuration is collected from the device
+for a given resource, parsed, and the facts tree is populated
+based on the configuration.
+"""
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from ansible_collections.ciena.saos6.plugins.module_utils.network.saos6.saos6 import (
+    get_parsed_config,
+)
+from ansible_collections.ciena.saos6.plugins.module_utils.network.saos6.utils.config import (
+    command_options,
+    expand_id_list,
+    id_sort_key,
+    split_command,
+)
+
+
+class PortsFacts(object):
+    """ The saos6 ports fact class
+    """
+
+    def __init__(self, module):
+        self._module = module
+
+    def populate_facts(self, connection, ansible_facts, data=None):
+        """ Populate the facts for ports
+        :param connection: the device connection
+        :param ansible_facts: Facts dictionary
+        :param data: previously collected conf, as a SaosConfig
+        :rtype: dictionary
+        :returns: facts
+        """
+        config = data if data is not None else get_parsed_config(self._module)
+        ports = []
+        for name in sorted(config.ids("port"), key=id_sort_key):
+            port = {"name": name}
+            vlans = []
+            for line in config.lines_for("port", name):
+                tokens = split_command(line)
+                options = command_options(tokens)
+                if tokens[:2] == ["port", "set"]:
+                    for key, value in options.items():
+                        if key != "port":
+                            port[key.replace("-", "_")] = value
+                elif tokens[:2] in (["port", "disable"], ["port", "enable"]):
+                    port["enabled"] = tokens[1] == "enable"
+                elif tokens[:2] == ["vlan", "add"] and options.get("vlan"):
+                    vlans.extend(expand_id_list(options["vlan"]))
+            if vlans:
+                port["vlans"] = [
+                    int(vid) if vid.isdigit() else vid
+                    for vid in sorted(set(vlans), key=id_sort_key)
+                ]
+            switches = config.vs_attachments(name)
+            if switches:
+                port["virtual_switches"] = switches
+            ports.append(port)
+        ansible_facts["ansible_network_resources"]["ports"] = ports
+        return ansible_facts
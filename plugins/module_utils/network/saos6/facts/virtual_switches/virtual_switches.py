@@ -0,0 +1,74 @@
+#
+# -*- coding: utf-8 -*-
+# Copyright 2020 Ciena Corp
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+"""
+The saos6 virtual_switches fact class
+It is in this file the configuration is collected from the device
+for a given resource, parsed, and the facts tree is populated
+based on the configuration.
+"""
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from ansible_collections.ciena.saos6.plugins.module_utils.network.saos6.saos6 import (
+    get_parsed_config,
+)
+from ansible_collections.ciena.saos6.plugins.module_utils.network.saos6.utils.config import (
+    command_options,
+    id_sort_key,
+    split_command,
+)
+
+# keywords of a virtual switch member, as found in "add" commands
+MEMBER_KEYWORDS = ("port", "sub-port", "vlan")
+
+
+class Virtual_switchesFacts(object):
+    """ The saos6 virtual_switches fact class
+    """
+
+    def __init__(self, module):
+        self._module = module
+
+    def populate_facts(self, connection, ansible_facts, data=None):
+        """ Populate the facts for virtual_switches
+        :param connection: the device connection
+        :param ansible_facts: Facts dictionary
+        :param data: previously collected conf, as a SaosConfig
+        :rtype: dictionary
+        :returns: facts
+        """
+        config = data if data is not None else get_parsed_config(self._module)
+        switches = []
+        for name in sorted(config.ids("virtual-switch"), key=id_sort_key):
+            switch = {"name": name}
+            members = []
+            for line in config.lines_for("virtual-switch", name):
+                tokens = split_command(line)
+                options = command_options(tokens)
+                if tokens[0] == "virtual-switch" and len(tokens) > 2:
+                    switch.setdefault("type", tokens[1])
+                    if tokens[2] == "create":
+                        for key, value in options.items():
+                            if key != "vs":
+                                switch[key.replace("-", "_")] = value
+                        continue
+                member = dict(
+                    (key.replace("-", "_"), options[key])
+                    for key in MEMBER_KEYWORDS
+                    if options.get(key)
+                )
+                if member.get("vlan", "").isdigit():
+                    member["vlan"] = int(member["vlan"])
+                if member:
+                    members.append(member)
+            if members:
+                switch["members"] = members
+            switches.append(switch)
+        ansible_facts["ansible_network_resources"][
+            "virtual_switches"
+        ] = switches
+        return ansible_facts
@@ -0,0 +1,59 @@
+#
+# -*- coding: utf-8 -*-
+# Copyright 2020 Ciena Corp
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+"""
+The saos6 vlans fact class
+It is in this file the configuration is collected from the device
+for a given resource, parsed, and the facts tree is populated
+based on the configuration.
+"""
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from ansible_collections.ciena.saos6.plugins.module_utils.network.saos6.saos6 import (
+    get_parsed_config,
+)
+from ansible_collections.ciena.saos6.plugins.module_utils.network.saos6.utils.config import (
+    command_options,
+    expand_id_list,
+    id_sort_key,
+    split_command,
+)
+
+
+class VlansFacts(object):
+    """ The saos6 vlans fact class
+    """
+
+    def __init__(self, module):
+        self._module = module
+
+    def populate_facts(self, connection, ansible_facts, data=None):
+        """ Populate the facts for vlans
+        :param connection: the device connection
+        :param ansible_facts: Facts dictionary
+        :param data: previously collected conf, as a SaosConfig
+        :rtype: dictionary
+        :returns: facts
+        """
+        config = data if data is not None else get_parsed_config(self._module)
+        vlans = []
+        for vid in sorted(config.ids("vlan"), key=id_sort_key):
+            vlan = {"vlan_id": int(vid) if vid.isdigit() else vid}
+            ports = []
+            for line in config.lines_for("vlan", vid):
+                tokens = split_command(line)
+                options = command_options(tokens)
+                if tokens[:2] in (["vlan", "create"], ["vlan", "rename"]):
+                    if options.get("name") and options["vlan"] == vid:
+                        vlan["name"] = options["name"]
+                elif tokens[:2] == ["vlan", "add"] and options.get("port"):
+                    ports.extend(expand_id_list(options["port"]))
+            if ports:
+                vlan["ports"] = sorted(set(ports), key=id_sort_key)
+            vlans.append(vlan)
+        ansible_facts["ansible_network_resources"]["vlans"] = vlans
+        return ansible_facts
@@ -29,12 +29,37 @@ from __future__ import absolute_import, division, print_function
 
 __metaclass__ = type
 import json
+import sys
+import threading
+import time
+from contextlib import contextmanager
 
-from ansible.module_utils._text import to_text
+from ansible.module_utils._text import to_bytes, to_text
 from ansible.module_utils.basic import env_fallback
 from ansible.module_utils.connection import Connection, ConnectionError
+from ansible.module_utils.six import reraise
+from ansible.module_utils.six.moves import queue
+from ansible_collections.ciena.saos6.plugins.module_utils.network.saos6.utils.config import (
+    parse_config,
+)
+from ansible_collections.ciena.saos6.plugins.module_utils.network.saos6.utils.utils import (
+    is_show_command,
+    to_list,
+)
 
+# name of the facts subset the current thread collects, see profile_scope
+_PROFILE_SCOPE = threading.local()
+
+# running configs keyed by (socket path, flags, format), and the parsed
+# trees of the text ones keyed the same way
 _DEVICE_CONFIGS = {}
+_PARSED_CONFIGS = {}
+_CONFIG_CACHE_STATS = {"hits": 0, "misses": 0, "parses": 0, "invalidations": 0}
+# _CONFIG_LOCK guards the dicts above; a caller missing a key holds the lock
+# of the key in _CONFIG_KEY_LOCKS while it reads or parses the config, so
+# the sessions of a pool asking for the same config wait for one read
+_CONFIG_LOCK = threading.Lock()
+_CONFIG_KEY_LOCKS = {}
 
 saos6_provider_spec = {
     "host": dict(),
@@ -86,36 +111,338 @@ def get_capabilities(module):
     return module._saos6_capabilities
 
 
+class SessionModule(object):
+    """ Stands in for a module on one member session of a SessionPool
+
+    Commands run over the session's own connection; params, capabilities,
+    the socket path keying the config cache and everything else are the
+    module's.
+    """
+
+    def __init__(self, module, socket_path):
+        self._module = module
+        self._session_socket_path = socket_path
+        self._saos6_connection = Connection(socket_path)
+
+    def __getattr__(self, name):
+        return getattr(self._module, name)
+
+
+class SessionPool(object):
+    """ A bounded set of CLI sessions to the same device
+
+    The first session is the module's own connection, the others are the
+    persistent connections started by the action plugin for session_pool.
+    """
+
+    # seconds a helper thread waits for a session before checking whether
+    # work is left
+    POLL_INTERVAL = 0.05
+
+    def __init__(self, module, socket_paths):
+        self.sessions = [module]
+        self.sessions.extend(
+            SessionModule(module, path) for path in socket_paths
+        )
+        self.size = len(self.sessions)
+        self._idle = queue.Queue()
+        for session in self.sessions:
+            self._idle.put(session)
+
+    def map(self, func, items, session=None):
+        """Return [func(session, item) for item in items], spreading the
+        calls over the idle sessions of the pool
+
+        Results are in the order of items whatever order the calls finish
+        in.  session is the session held by the caller when map is called
+        from within a call made by map; it works through items alongside
+        the sessions that become idle, so nested calls cannot deadlock.
+        """
+        items = list(items)
+        results = [None] * len(items)
+        errors = []
+        lock = threading.Lock()
+        state = {"next": 0}
+
+        def claim():
+            with lock:
+                if errors or state["next"] >= len(items):
+                    return None
+                state["next"] += 1
+                return state["next"] - 1
+
+        def work(member):
+            idx = claim()
+            while idx is not None:
+                try:
+                    results[idx] = func(member, items[idx])
+                except BaseException:
+                    errors.append(sys.exc_info())
+                    return
+                idx = claim()
+
+        scope = getattr(_PROFILE_SCOPE, "name", None)
+
+        def helper():
+            _PROFILE_SCOPE.name = scope
+            while state["next"] < len(items) and not errors:
+                try:
+                    member = self._idle.get(timeout=self.POLL_INTERVAL)
+                except queue.Empty:
+                    continue
+                try:
+                    work(member)
+                finally:
+                    self._idle.put(member)
+
+        owned = session is None
+        if owned:
+            session = self._idle.get()
+        threads = [
+            threading.Thread(target=helper)
+            for _ in range(min(self.size, len(items)) - 1)
+        ]
+        try:
+            for thread in threads:
+                thread.daemon = True
+                thread.start()
+            work(session)
+            for thread in threads:
+                thread.join()
+        finally:
+            if owned:
+                self._idle.put(session)
+        if errors:
+            reraise(*errors[0])
+        return results
+
+
+def get_session_pool(module):
+    """Return the SessionPool of the module, or None when session_pool did
+    not start any extra sessions
+    """
+    if hasattr(module, "_saos6_session_pool"):
+        return module._saos6_session_pool
+
+    options = module.params.get("session_pool") or {}
+    sockets = options.get("sockets") or []
+    pool = SessionPool(module, sockets) if sockets else None
+    module._saos6_session_pool = pool
+    return pool
+
+
+def enable_profile(module):
+    """Start recording the timing of every command the module runs"""
+    module._saos6_profile = []
+
+
+@contextmanager
+def profile_scope(name):
+    """Attribute the commands run by the current thread, and by the session
+    pool threads it starts, to name
+    """
+    previous = getattr(_PROFILE_SCOPE, "name", None)
+    _PROFILE_SCOPE.name = name
+    try:
+        yield
+    finally:
+        _PROFILE_SCOPE.name = previous
+
+
+def _record_timings(module, timings):
+    profile = getattr(module, "_saos6_profile", None)
+    if profile is None:
+        return
+    scope = getattr(_PROFILE_SCOPE, "name", None)
+    for timing in timings:
+        timing["scope"] = scope
+        profile.append(timing)
+
+
+def get_profile(module):
+    """Return the timings recorded since enable_profile, summed per command
+    and per scope, with the counters of the running config cache
+
+    A command run more than once, such as a command polled by wait_for,
+    counts its extra runs as retries.
+    """
+    profile = getattr(module, "_saos6_profile", None)
+    if profile is None:
+        return None
+    commands = []
+    by_command = {}
+    scopes = {}
+    total = {"commands": 0, "elapsed": 0.0, "bytes": 0}
+    for timing in profile:
+        entry = by_command.get(timing["command"])
+        if entry is None:
+            entry = {
+                "command": timing["command"],
+                "runs": 0,
+                "elapsed": 0.0,
+                "bytes": 0,
+            }
+            by_command[timing["command"]] = entry
+            commands.append(entry)
+        scope = None
+        if timing["scope"] is not None:
+            scope = scopes.setdefault(
+                timing["scope"], {"commands": 0, "elapsed": 0.0, "bytes": 0}
+            )
+        entry["runs"] += 1
+        for item in (total, scope):
+            if item is not None:
+                item["commands"] += 1
+        for item in (entry, total, scope):
+            if item is not None:
+                item["elapsed"] += timing["elapsed"]
+                item["bytes"] += timing["bytes"]
+    for entry in commands:
+        entry["retries"] = entry["runs"] - 1
+    for item in commands + list(scopes.values()) + [total]:
+        item["elapsed"] = round(item["elapsed"], 4)
+    result = {
+        "commands": commands,
+        "total": total,
+        "config_cache": get_config_cache_stats(),
+    }
+    if scopes:
+        result["scopes"] = scopes
+    return result
+
+
+def _config_cache_key(module, flags, format):
+    return (getattr(module, "_socket_path", None), tuple(flags), format)
+
+
+def _config_key_lock(key):
+    with _CONFIG_LOCK:
+        return _CONFIG_KEY_LOCKS.setdefault(key, threading.Lock())
+
+
 def get_config(module, flags=None, format=None):
+    """Return the running config, reading it from the device only once per
+    connection, flags and format until the config is changed
+    """
     flags = [] if flags is None else flags
-    global _DEVICE_CONFIGS
+    key = _config_cache_key(module, flags, format)
+
+    with _config_key_lock(key):
+        with _CONFIG_LOCK:
+            cfg = _DEVICE_CONFIGS.get(key)
+            _CONFIG_CACHE_STATS["misses" if cfg is None else "hits"] += 1
+        if cfg is not None:
+            return cfg
 
-    if _DEVICE_CONFIGS != {}:
-        return _DEVICE_CONFIGS
-    else:
         connection = get_connection(module)
+        start = time.time()
         try:
             out = connection.get_config(flags=flags, format=format)
         except ConnectionError as exc:
             module.fail_json(msg=to_text(exc, errors="surrogate_then_replace"))
         cfg = to_text(out, errors="surrogate_then_replace").strip()
-        _DEVICE_CONFIGS = cfg
-        return cfg
+        _record_timings(
+            module,
+            [
+                {
+                    "command": "get_config",
+                    "elapsed": time.time() - start,
+                    "bytes": len(
+                        to_bytes(out, errors="surrogate_then_replace")
+                    ),
+                }
+            ],
+        )
+        with _CONFIG_LOCK:
+            _DEVICE_CONFIGS[key] = cfg
+    return cfg
+
 
+def invalidate_config_cache(module=None):
+    """Drop the cached configs of the module's connection, or of every
+    connection when module is None
+    """
+    socket_path = getattr(module, "_socket_path", None)
+    with _CONFIG_LOCK:
+        _CONFIG_CACHE_STATS["invalidations"] += 1
+        for configs in (_DEVICE_CONFIGS, _PARSED_CONFIGS):
+            if module is None:
+                configs.clear()
+                continue
+            for key in list(configs):
+                if key[0] == socket_path:
+                    del configs[key]
 
-def run_commands(module, commands, check_rc=True):
+
+def get_config_cache_stats():
+    """Return the hit, miss, parse and invalidation counters of the running
+    config cache and the number of configs it holds
+    """
+    with _CONFIG_LOCK:
+        stats = dict(_CONFIG_CACHE_STATS)
+        stats["size"] = len(_DEVICE_CONFIGS)
+    return stats
+
+
+def get_parsed_config(module, flags=None):
+    """Return the running config as a SaosConfig tree, parsing it only once
+    for every caller until the config is changed
+    """
+    flags = [] if flags is None else flags
+    cfg = get_config(module, flags=flags)
+    key = _config_cache_key(module, flags, None)
+    with _config_key_lock(("parsed",) + key):
+        parsed = _PARSED_CONFIGS.get(key)
+        if parsed is None or parsed[0] is not cfg:
+            parsed = (cfg, parse_config(cfg))
+            with _CONFIG_LOCK:
+                _CONFIG_CACHE_STATS["parses"] += 1
+                _PARSED_CONFIGS[key] = parsed
+    return parsed[1]
+
+
+def run_commands(module, commands, check_rc=True, spool=None, cache=True):
+    """Run commands on the device and return their responses
+
+    spool is a dict of spool options, see utils.spool; responses it spools
+    are returned as the records of their files.  With cache False, the
+    commands are sent even when the connection has their responses cached.
+    """
     connection = get_connection(module)
+    if not all(is_show_command(cmd) for cmd in to_list(commands)):
+        invalidate_config_cache(module)
+    profile = getattr(module, "_saos6_profile", None) is not None
+    kwargs = {"commands": commands, "check_rc": check_rc}
+    if profile:
+        kwargs["profile"] = True
+    if spool:
+        kwargs["spool"] = spool
+    if not cache:
+        kwargs["cache"] = False
     try:
-        response = connection.run_commands(
-            commands=commands, check_rc=check_rc
-        )
+        response = connection.run_commands(**kwargs)
+        if profile:
+            _record_timings(module, connection.pop_command_timings())
     except ConnectionError as exc:
         module.fail_json(msg=to_text(exc, errors="surrogate_then_replace"))
     return response
 
 
+def get_response_cache_stats(module):
+    """Return the statistics of the response cache of the connection, or
+    None when it is not enabled
+    """
+    if not get_capabilities(module).get("response_cache"):
+        return None
+    try:
+        return get_connection(module).get_response_cache_stats()
+    except ConnectionError as exc:
+        module.fail_json(msg=to_text(exc, errors="surrogate_then_replace"))
+
+
 def load_config(module, commands, commit=False, comment=None):
     connection = get_connection(module)
+    invalidate_config_cache(module)
 
     try:
         response = connection.edit_config(
@@ -0,0 +1,192 @@
+#
+# -*- coding: utf-8 -*-
+# Copyright 2020 Ciena Corp
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+Content addressed store of running config backups
+
+Configs are normalized, hashed with sha256 and stored once per distinct
+content as objects/<sha256[:2]>/<sha256>.gz, whatever the number of hosts or
+backups sharing it.  A backup whose content matches the last version of its
+host writes nothing.  A new version is stored as the gzip compressed list of
+line changes against the previous version of its host, <sha256>.delta.gz,
+or as the full gzip compressed text every MAX_DELTA_CHAIN versions and when
+the changes are not much smaller than the config.  The versions of a host
+are listed in hosts/<host>.json.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import difflib
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+from ansible.module_utils._text import to_bytes, to_text
+from ansible_collections.ciena.saos6.plugins.module_utils.network.saos6.utils.cache import (
+    FileCache,
+)
+from ansible_collections.ciena.saos6.plugins.module_utils.network.saos6.utils.config import (
+    normalize_config,
+)
+
+# number of deltas read at most to rebuild a version
+MAX_DELTA_CHAIN = 16
+
+# a delta is only stored when it is smaller than this part of the full text
+MAX_DELTA_RATIO = 0.5
+
+
+def config_digest(lines):
+    return hashlib.sha256(to_bytes("\n".join(lines) + "\n")).hexdigest()
+
+
+def line_delta(old, new):
+    """Return the changes turning the lines old into the lines new
+
+    Each change is [start, end, lines]: old[start:end] is replaced by lines.
+    The common head and tail are skipped before the lines are compared, so
+    the cost of nearly identical configs stays close to linear.
+    """
+    head = 0
+    limit = min(len(old), len(new))
+    while head < limit and old[head] == new[head]:
+        head += 1
+    tail = 0
+    while tail < limit - head and old[-1 - tail] == new[-1 - tail]:
+        tail += 1
+    old_end = len(old) - tail
+    new_end = len(new) - tail
+    new_middle = new[head:new_end]
+    matcher = difflib.SequenceMatcher(None, old[head:old_end], new_middle)
+    return [
+        [head + i1, head + i2, new_middle[j1:j2]]
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes()
+        if tag != "equal"
+    ]
+
+
+def apply_delta(old, delta):
+    new = []
+    position = 0
+    for start, end, lines in delta:
+        new.extend(old[position:start])
+        new.extend(lines)
+        position = end
+    new.extend(old[position:])
+    return new
+
+
+class BackupStore(object):
+    """ A directory of deduplicated, compressed running config versions
+    """
+
+    def __init__(self, path):
+        self.path = os.path.expanduser(path)
+        self.hosts = FileCache(self.path, namespace="hosts")
+
+    def _object(self, digest, delta=False):
+        return os.path.join(
+            self.path,
+            "objects",
+            digest[:2],
+            "%s%s.gz" % (digest, ".delta" if delta else ""),
+        )
+
+    def _write(self, path, data):
+        directory = os.path.dirname(path)
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as raw:
+                with gzip.GzipFile(fileobj=raw, mode="wb") as fh:
+                    fh.write(data)
+            os.rename(tmp, path)
+        except Exception:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+
+    def _read_delta(self, digest):
+        with gzip.open(self._object(digest, delta=True), "rb") as fh:
+            return json.loads(to_text(fh.read()))
+
+    def _depth(self, digest):
+        """Return the number of deltas read to rebuild a stored version"""
+        if os.path.exists(self._object(digest)):
+            return 0
+        return self._read_delta(digest)["depth"]
+
+    def exists(self, digest):
+        return os.path.exists(self._object(digest)) or os.path.exists(
+            self._object(digest, delta=True)
+        )
+
+    def path_of(self, digest):
+        path = self._object(digest)
+        return path if os.path.exists(path) else self._object(digest, True)
+
+    def versions(self, host):
+        """Return the versions stored for host, oldest first"""
+        return (self.hosts.get(host) or {}).get("versions", [])
+
+    def read_lines(self, digest):
+        """Return the normalized lines of a stored version"""
+        deltas = []
+        while not os.path.exists(self._object(digest)):
+            data = self._read_delta(digest)
+            deltas.append(data["delta"])
+            digest = data["base"]
+        with gzip.open(self._object(digest), "rb") as fh:
+            lines = to_text(fh.read()).splitlines()
+        for delta in reversed(deltas):
+            lines = apply_delta(lines, delta)
+        return lines
+
+    def read(self, digest):
+        return "\n".join(self.read_lines(digest)) + "\n"
+
+    def save(self, host, data):
+        """Store the running config data as the latest version of host
+
+        :rtype: dict
+        :return: the version, with 'stored' False when its content matched
+            the last version of host and nothing was written
+        """
+        lines = normalize_config(data)
+        digest = config_digest(lines)
+        versions = self.versions(host)
+        if versions and versions[-1]["sha256"] == digest:
+            return dict(versions[-1], stored=False)
+
+        if not self.exists(digest):
+            self._write_version(
+                digest, lines, versions[-1]["sha256"] if versions else None
+            )
+        version = {"sha256": digest, "time": time.time(), "lines": len(lines)}
+        self.hosts.set(host, {"versions": versions + [version]})
+        return dict(version, stored=True)
+
+    def _write_version(self, digest, lines, base):
+        text = to_bytes("\n".join(lines) + "\n")
+        if base is not None and self.exists(base):
+            depth = self._depth(base)
+            if depth < MAX_DELTA_CHAIN:
+                delta = line_delta(self.read_lines(base), lines)
+                data = to_bytes(
+                    json.dumps(
+                        {"base": base, "depth": depth + 1, "delta": delta}
+                    )
+                )
+                if len(data) < len(text) * MAX_DELTA_RATIO:
+                    self._write(self._object(digest, delta=True), data)
+                    return
+        self._write(self._object(digest), text)
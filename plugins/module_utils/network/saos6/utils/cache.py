@@ -0,0 +1,79 @@
+#
+# -*- coding: utf-8 -*-
+# Copyright 2020 Ciena Corp
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+Controller side cache of JSON documents
+
+Modules using a network_cli connection run on the controller, so they can
+keep data between runs in a local directory.  Each key is stored in its own
+file and replaced atomically, so concurrent forks working on different hosts
+never see partial writes.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import json
+import os
+import re
+import tempfile
+import time
+
+DEFAULT_CACHE_PATH = "~/.ansible/cache/saos6"
+
+_UNSAFE_KEY_RE = re.compile(r"[^\w.-]")
+
+
+class FileCache(object):
+    """ A directory of JSON documents, one file per key
+    """
+
+    def __init__(self, path=None, namespace=None):
+        path = os.path.expanduser(path or DEFAULT_CACHE_PATH)
+        if namespace:
+            path = os.path.join(path, namespace)
+        self.path = path
+
+    def _file(self, key):
+        return os.path.join(
+            self.path, "%s.json" % _UNSAFE_KEY_RE.sub("_", key)
+        )
+
+    def get(self, key):
+        """Return the document stored under key, or None"""
+        try:
+            with open(self._file(key)) as fh:
+                return json.load(fh)
+        except (IOError, OSError, ValueError):
+            return None
+
+    def set(self, key, value):
+        """Store value under key, replacing any previous document"""
+        if not os.path.isdir(self.path):
+            os.makedirs(self.path)
+        fd, tmp = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as fh:
+                json.dump(value, fh)
+            os.rename(tmp, self._file(key))
+        except Exception:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+
+    def delete(self, key):
+        try:
+            os.unlink(self._file(key))
+        except OSError:
+            pass
+
+
+def is_fresh(timestamp, ttl, now=None):
+    """Return True if an entry written at timestamp is younger than ttl"""
+    if timestamp is None or ttl is None or ttl <= 0:
+        return False
+    return (now or time.time()) - timestamp < ttl
@@ -0,0 +1,98 @@
+#
+# -*- coding: utf-8 -*-
+# Copyright 2020 Ciena Corp
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+Column oriented tables of facts
+
+A list of rows, such as the interfaces facts, repeats every key in every
+row.  to_columnar() stores the keys once, in columns, and the values as one
+list per column in data.  A column holding few distinct values, such as a
+link state or a speed, is stored as {"values": [...], "codes": [...]}: the
+distinct values once and the index of its value for every row.
+from_columnar() returns the rows back, with None for the keys a row did not
+have.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+# a column is dictionary encoded when it has at most one distinct value for
+# this many rows
+DICTIONARY_RATIO = 2
+
+
+def _encode_column(values):
+    distinct = []
+    codes = []
+    index = {}
+    try:
+        for value in values:
+            code = index.get(value)
+            if code is None:
+                code = index[value] = len(distinct)
+                distinct.append(value)
+            codes.append(code)
+    except TypeError:
+        # unhashable values, such as lists, are kept as they are
+        return values
+    if len(distinct) * DICTIONARY_RATIO > len(values):
+        return values
+    return {"values": distinct, "codes": codes}
+
+
+def to_columnar(rows):
+    """Return a list of dicts as a column oriented table
+
+    :rtype: dict
+    :return: the column names, the number of rows and the column values
+    """
+    columns = []
+    seen = set()
+    for row in rows:
+        for key in row:
+            if key not in seen:
+                seen.add(key)
+                columns.append(key)
+    return {
+        "columns": columns,
+        "length": len(rows),
+        "data": [
+            _encode_column([row.get(key) for row in rows]) for key in columns
+        ],
+    }
+
+
+def is_columnar(value):
+    return (
+        isinstance(value, dict)
+        and "columns" in value
+        and "data" in value
+        and "length" in value
+    )
+
+
+def from_columnar(table, columns=None):
+    """Return the rows of a column oriented table, or table itself when it
+    already is a list of rows
+
+    :param columns: the columns to return, all of them by default
+    :rtype: list
+    """
+    if not is_columnar(table):
+        return table
+    names = table["columns"]
+    if columns is not None:
+        names = [name for name in names if name in columns]
+    values = []
+    for name in names:
+        data = table["data"][table["columns"].index(name)]
+        if isinstance(data, dict):
+            data = [data["values"][code] for code in data["codes"]]
+        values.append(data)
+    if not values:
+        return [{} for _ in range(table["length"])]
+    return [dict(zip(names, row)) for row in zip(*values)]
@@ -0,0 +1,433 @@
+#
+# -*- coding: utf-8 -*-
+# Copyright 2020 Ciena Corp
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+Structured view of the SAOS 6 running config
+
+SAOS 6 "conf show brief" output is a flat list of CLI commands grouped under
+"! SECTION:" comment headers.  parse_config() reads it line by line and builds
+an index from every object a command references (vlan, port, virtual switch,
+sub-port) to the commands that reference it, so lookups such as "all commands
+touching port 7" or "the virtual switches port 7 is attached to" do not have
+to rescan the config text.  Each command line is stored once; sections and
+indexes hold line numbers.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import re
+
+from ansible_collections.ciena.saos6.plugins.module_utils.network.saos6.utils.parsers import (
+    iter_lines,
+)
+
+_SECTION_RE = re.compile(r"^!\s*([A-Za-z0-9][\w /-]*?)\s*:\s*$")
+_TOKEN_RE = re.compile(r'"[^"]*"|\S+')
+
+# command keyword -> kind of object named by the following token
+REFERENCE_KEYWORDS = {
+    "vlan": "vlan",
+    "port": "port",
+    "parent-port": "port",
+    "vs": "virtual-switch",
+    "sub-port": "sub-port",
+}
+
+# upper bound on the number of ids a single range such as 1-4094 expands to
+MAX_RANGE_EXPANSION = 4096
+
+# commands accepting id lists, by their first two tokens, and the keywords
+# whose value may be a list
+COLLAPSIBLE_COMMANDS = {
+    ("vlan", "create"): ("vlan",),
+    ("vlan", "delete"): ("vlan",),
+    ("vlan", "add"): ("vlan", "port"),
+    ("vlan", "remove"): ("vlan", "port"),
+    ("port", "set"): ("port",),
+    ("port", "enable"): ("port",),
+    ("port", "disable"): ("port",),
+}
+
+# longest id list collapse_commands() builds, kept well under the CLI limits;
+# longer lists are split over several commands
+MAX_ID_LIST_LENGTH = 128
+
+
+def iter_config_lines(data):
+    """Yield the stripped, non empty lines of data without splitting the
+    whole text into a list first
+
+    :param data: the config text, the record of a spooled config, or an
+        iterable of lines
+    """
+    for line in iter_lines(data):
+        line = line.strip()
+        if line:
+            yield line
+
+
+def expand_id_list(value):
+    """Expand a SAOS id list such as 1-4,7 into its members
+
+    Values that are not numeric lists, or that would expand to more than
+    MAX_RANGE_EXPANSION ids, are returned unchanged as a single id.
+    """
+    ids = []
+    for item in value.split(","):
+        first, sep, last = item.partition("-")
+        if not first.isdigit() or (sep and not last.isdigit()):
+            return [value]
+        if not sep:
+            ids.append(item)
+            continue
+        first, last = int(first), int(last)
+        if last < first or len(ids) + last - first >= MAX_RANGE_EXPANSION:
+            return [value]
+        ids.extend(str(num) for num in range(first, last + 1))
+    return ids
+
+
+def split_command(line):
+    """Split a command into its tokens, keeping quoted strings whole"""
+    return _TOKEN_RE.findall(line)
+
+
+def command_options(tokens):
+    """Return the keyword -> value pairs of a tokenized command, from its
+    first object reference on
+
+    "port set port 7 description "uplink"" gives {"port": "7",
+    "description": "uplink"}.  A trailing keyword maps to None.
+    """
+    idx = 1
+    while idx < len(tokens) and tokens[idx] not in REFERENCE_KEYWORDS:
+        idx += 1
+    options = {}
+    for idx in range(idx, len(tokens), 2):
+        value = tokens[idx + 1] if idx + 1 < len(tokens) else None
+        options[tokens[idx]] = value if value is None else value.strip('"')
+    return options
+
+
+def id_sort_key(ident):
+    """Sort key ordering numeric ids by value, before the other ids"""
+    if ident.isdigit():
+        return (0, int(ident), ident)
+    return (1, 0, ident)
+
+
+def command_references(tokens):
+    """Return the (kind, id) pairs of the objects a tokenized command names
+
+    The first token is the command family ("port set ...") and never a
+    reference keyword.
+    """
+    refs = []
+    for idx in range(1, len(tokens) - 1):
+        kind = REFERENCE_KEYWORDS.get(tokens[idx])
+        if kind:
+            for ident in expand_id_list(tokens[idx + 1].strip('"')):
+                refs.append((kind, ident))
+    return refs
+
+
+class SaosConfig(object):
+    """ A parsed SAOS 6 running config
+    """
+
+    def __init__(self):
+        self.lines = []
+        self.sections = {}
+        self.index = {}
+        self.attachments = {}
+        self._parents = {}
+
+    def add_line(self, line, section=None):
+        lineno = len(self.lines)
+        self.lines.append(line)
+        if section is not None:
+            self.sections.setdefault(section, []).append(lineno)
+
+        refs = command_references(_TOKEN_RE.findall(line))
+        for kind, ident in refs:
+            linenos = self.index.setdefault(kind, {}).setdefault(ident, [])
+            if not linenos or linenos[-1] != lineno:
+                linenos.append(lineno)
+
+        if line.startswith("sub-port create"):
+            parents = [i for k, i in refs if k == "port"]
+            for ident in [i for k, i in refs if k == "sub-port"]:
+                self._parents[ident] = parents[0] if parents else None
+
+        switches = [i for k, i in refs if k == "virtual-switch"]
+        if not switches:
+            return
+        for kind, ident in refs:
+            if kind == "sub-port":
+                ident = self._parents.get(ident)
+            elif kind != "port":
+                continue
+            if ident is None:
+                continue
+            attached = self.attachments.setdefault(ident, [])
+            for switch in switches:
+                if switch not in attached:
+                    attached.append(switch)
+
+    def section(self, name):
+        """Return the commands under the "! NAME:" header"""
+        return [self.lines[i] for i in self.sections.get(name.lower(), [])]
+
+    def lines_for(self, kind, ident):
+        """Return every command that references the given object"""
+        linenos = self.index.get(kind, {}).get(str(ident), [])
+        return [self.lines[i] for i in linenos]
+
+    def ids(self, kind):
+        """Return the ids of every object of the given kind"""
+        return list(self.index.get(kind, {}))
+
+    def vs_attachments(self, port):
+        """Return the virtual switches a port is attached to, directly or
+        through its sub-ports
+        """
+        return list(self.attachments.get(str(port), []))
+
+    def to_dict(self):
+        return {
+            "lines": self.lines,
+            "sections": self.sections,
+            "index": self.index,
+            "attachments": self.attachments,
+        }
+
+
+def parse_config(data):
+    """Parse "conf show brief" output
+
+    :param data: the config text, the record of a spooled config, or an
+        iterable of lines
+    :rtype: SaosConfig
+    """
+    config = SaosConfig()
+    section = None
+    for line in iter_config_lines(data):
+        if line.startswith("!"):
+            match = _SECTION_RE.match(line)
+            if match:
+                section = match.group(1).lower()
+            continue
+        config.add_line(line, section)
+    return config
+
+
+def normalize_command(line):
+    """Collapse the whitespace between the tokens of a command"""
+    return " ".join(_TOKEN_RE.findall(line))
+
+
+def normalize_config(data):
+    """Return the lines of a running config that identify its content
+
+    Blank lines, surrounding whitespace and the comments other than section
+    headers, such as the creation time at the top, are dropped.
+    """
+    return [
+        line
+        for line in iter_config_lines(data)
+        if not line.startswith("!") or _SECTION_RE.match(line)
+    ]
+
+
+def expand_command(line):
+    """Return the single object forms of a command using id lists
+
+    "vlan create vlan 100-102" expands to one command per vlan, so that it
+    matches the running config however the ids were grouped there.  Commands
+    whose expansion would exceed MAX_RANGE_EXPANSION commands are returned
+    unexpanded.
+    """
+    tokens = _TOKEN_RE.findall(line)
+    if not any(
+        tokens[idx - 1] in REFERENCE_KEYWORDS
+        and ("," in tokens[idx] or "-" in tokens[idx])
+        for idx in range(2, len(tokens))
+    ):
+        return [" ".join(tokens)]
+
+    variants = [[]]
+    for idx, token in enumerate(tokens):
+        ids = [token]
+        if idx > 1 and tokens[idx - 1] in REFERENCE_KEYWORDS:
+            ids = expand_id_list(token)
+        if len(variants) * len(ids) > MAX_RANGE_EXPANSION:
+            return [" ".join(tokens)]
+        variants = [variant + [ident] for variant in variants for ident in ids]
+    return [" ".join(variant) for variant in variants]
+
+
+def diff_config(candidate, running):
+    """Return the candidate commands missing from the running config
+
+    The comparison is a set lookup per command, so its cost is linear in the
+    size of both configs.  Comments and duplicate candidate lines are dropped
+    and the candidate order is kept.
+
+    :param candidate: the desired commands, as text or an iterable of lines
+    :param running: the running config, as text, an iterable of lines or a
+        SaosConfig
+    :rtype: list
+    """
+    if isinstance(running, SaosConfig):
+        running = running.lines
+    present = set()
+    for line in iter_config_lines(running):
+        if not line.startswith("!"):
+            present.update(expand_command(line))
+
+    updates = []
+    for line in iter_config_lines(candidate):
+        if line.startswith("!"):
+            continue
+        line = normalize_command(line)
+        if line in present:
+            continue
+        variants = expand_command(line)
+        if not all(variant in present for variant in variants):
+            updates.append(line)
+        present.add(line)
+        present.update(variants)
+    return updates
+
+
+def format_id_lists(ids, limit=MAX_ID_LIST_LENGTH):
+    """Format numeric ids as SAOS id lists, 1,3,5-7 for 1,3,5,6,7, split into
+    as many lists of at most limit characters as needed
+    """
+    nums = sorted(set(int(ident) for ident in ids))
+    lists = [[]]
+    length = -1
+    first = last = nums[0]
+    for num in nums[1:] + [None]:
+        if num is not None and num == last + 1:
+            last = num
+            continue
+        item = str(first) if first == last else "%d-%d" % (first, last)
+        if lists[-1] and length + 1 + len(item) > limit:
+            lists.append([])
+            length = -1
+        lists[-1].append(item)
+        length += 1 + len(item)
+        first = last = num
+    return [",".join(items) for items in lists]
+
+
+def _command_values(tokens):
+    """Return the ids and numbers a tokenized command names, whatever their
+    keyword, such as 7 and 100 in "port set port 7 pvid 100"
+    """
+    values = set()
+    for token in tokens[2:]:
+        if token[:1].isdigit():
+            values.update(expand_id_list(token))
+    return values
+
+
+def _collapse_key(tokens, pos):
+    """Return the tokens of a command but the id list at pos"""
+    start = pos + 1
+    end = pos + 2
+    return tuple(tokens[:start]), tuple(tokens[end:])
+
+
+def collapse_commands(commands):
+    """Merge the commands that differ only by an id into id list forms
+
+    "vlan create vlan 100" to "vlan create vlan 599" become "vlan create vlan
+    100-599", and "port set port N mtu 9216" for ports 1 to 48 become a single
+    "port set port 1-48 mtu 9216".  Only the COLLAPSIBLE_COMMANDS are merged,
+    into the first command of their group, and a command only moves ahead of
+    the commands in between when none of them names any of its ids or
+    numbers; commands naming no id at all are never crossed.  Interleaved
+    sequences such as "vlan create vlan N" followed by "vlan add vlan N port
+    7" therefore collapse to two commands, in the same order.  Id lists
+    longer than MAX_ID_LIST_LENGTH are split over several commands.
+
+    :param commands: normalized commands, as returned by diff_config
+    :rtype: list
+    """
+    groups = []
+    open_groups = {}
+    last_use = {}
+    barrier = 0
+    for line in commands:
+        tokens = split_command(line)
+        values = _command_values(tokens)
+        keywords = COLLAPSIBLE_COMMANDS.get(tuple(tokens[:2]), ())
+        positions = [
+            idx
+            for idx in range(2, len(tokens) - 1)
+            if tokens[idx] in keywords
+            and all(
+                ident.isdigit() for ident in expand_id_list(tokens[idx + 1])
+            )
+        ]
+        if "name" in tokens:
+            positions = []
+
+        joined = None
+        for pos in positions:
+            key = _collapse_key(tokens, pos)
+            group = open_groups.get(key)
+            if (
+                group is None
+                or group["index"] < barrier
+                or any(
+                    last_use.get(value, -1) > group["index"]
+                    for value in values
+                )
+            ):
+                continue
+            if group["pos"] is None:
+                for other in group["keys"]:
+                    if other != key:
+                        open_groups.pop(other, None)
+                group["pos"] = pos
+                group["ids"] = expand_id_list(group["tokens"][pos + 1])
+            group["ids"].extend(expand_id_list(tokens[pos + 1]))
+            joined = group
+            break
+
+        if joined is None:
+            joined = {
+                "index": len(groups),
+                "tokens": tokens,
+                "pos": None,
+                "ids": [],
+                "keys": [],
+            }
+            for pos in positions:
+                key = _collapse_key(tokens, pos)
+                joined["keys"].append(key)
+                open_groups[key] = joined
+            groups.append(joined)
+            if not values:
+                barrier = joined["index"]
+        for value in values:
+            last_use[value] = max(last_use.get(value, -1), joined["index"])
+
+    collapsed = []
+    for group in groups:
+        tokens = list(group["tokens"])
+        if group["pos"] is None:
+            collapsed.append(" ".join(tokens))
+            continue
+        for id_list in format_id_lists(group["ids"]):
+            tokens[group["pos"] + 1] = id_list
+            collapsed.append(" ".join(tokens))
+    return collapsed
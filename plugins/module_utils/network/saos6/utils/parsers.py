@@ -0,0 +1,462 @@
+#
+# -*- coding: utf-8 -*-
+# Copyright 2020 Ciena Corp
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+Native parsers for SAOS 6 show command output
+
+These parsers produce the same records, with the same field names, as the
+TextFSM templates used by the legacy facts classes.  They make a single pass
+over the output using precompiled regexes and a label to field lookup table,
+so they do not need the textfsm library.
+
+The output is read a line at a time by iter_lines, from the text, from the
+record of a spooled output or from any iterable of lines, and is never split
+into a list of lines.  A spooled output is read a chunk at a time, so only the
+parsed records grow with its size.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import re
+
+from ansible.module_utils.six import string_types
+from ansible_collections.ciena.saos6.plugins.module_utils.network.saos6.utils.spool import (
+    is_spooled,
+    iter_spooled,
+)
+
+_PORT_INFO_RE = re.compile(r"PORT (\S+) INFO")
+
+PORT_DETAIL_FIELDS = (
+    "port",
+    "macAddress",
+    "LinkStateAdmin",
+    "LinkStateOper",
+    "pvid",
+    "mode",
+    "speed",
+    "duplex",
+    "flow_ctrl",
+    "auto_neg",
+    "untagged_data_vid",
+    "fixed_rcos",
+    "fixed_rcolor",
+    "acceptable_frame_type",
+    "egress_untag_vlan",
+    "max_frame_size",
+    "untagged_data_vs",
+    "untagged_ctrl_vs",
+    "resolved_cos_policy",
+    "ingress_to_egress_qmap",
+    "resolved_cos_map",
+    "frame_cos_map",
+)
+
+# "port show port <id>" row label -> field(s) filled from the value column(s)
+_PORT_DETAIL_LABELS = {
+    "MAC Address": ("macAddress",),
+    "Link State": ("LinkStateAdmin", "LinkStateOper"),
+    "Mode": ("mode",),
+    "Speed": ("speed",),
+    "Duplex": ("duplex",),
+    "Flow Control": ("flow_ctrl",),
+    "Auto Negotiation": ("auto_neg",),
+    "PVID": ("pvid",),
+    "Untag Ingress Data Vid": ("untagged_data_vid",),
+    "Fixed Resolved CoS": ("fixed_rcos",),
+    "Fixed Resolved Color": ("fixed_rcolor",),
+    "Acceptable Frame Type": ("acceptable_frame_type",),
+    "Egress Untag VLAN": ("egress_untag_vlan",),
+    "Max Frame Size": ("max_frame_size",),
+    "Untagged Data VS": ("untagged_data_vs",),
+    "Untagged Ctrl VS": ("untagged_ctrl_vs",),
+    "Resolved CoS Policy": ("resolved_cos_policy",),
+    "Ingress to Egress QMap": ("ingress_to_egress_qmap",),
+    "Ingress FCOS->RCOS Map": ("resolved_cos_map",),
+    "Egress RCOS->FCOS Map": ("frame_cos_map",),
+}
+_PORT_DETAIL_LAST_LABEL = "Egress RCOS->FCOS Map"
+
+INTERFACE_SUMMARY_FIELDS = (
+    "port",
+    "type",
+    "LinkStateAdmin",
+    "LinkStateOper",
+    "speed",
+    "duplex",
+    "flow_ctrl",
+    "auto_neg",
+    "mode",
+    "description",
+)
+
+# "port show status" column header, joined over its rows -> field
+_PORT_STATUS_COLUMNS = {
+    "port name": "port",
+    "port": "port",
+    "port type": "type",
+    "type": "type",
+    "link admin state": "LinkStateAdmin",
+    "admin state": "LinkStateAdmin",
+    "link oper state": "LinkStateOper",
+    "oper state": "LinkStateOper",
+    "link speed/duplex": "speed/duplex",
+    "speed/duplex": "speed/duplex",
+    "link flow ctrl": "flow_ctrl",
+    "flow ctrl": "flow_ctrl",
+    "flow": "flow_ctrl",
+    "auto neg": "auto_neg",
+    "mode": "mode",
+    "port desc": "description",
+    "description": "description",
+}
+_DUPLEX_NAMES = {"FD": "Full", "HD": "Half"}
+_TABLE_SEPARATOR_RE = re.compile(r"^\+[-+]+\+?\s*$")
+_HEADER_SLASH_RE = re.compile(r"\s*/\s*")
+
+# header of the first column of a two column table listing key/value pairs
+KEY_VALUE_HEADERS = frozenset(["parameter", "attribute", "field", "key"])
+_KEY_RE = re.compile(r"[^a-z0-9]+")
+
+NEIGHBOR_FIELDS = (
+    "localPort",
+    "remotePort",
+    "chassisId",
+    "mgmtAddr",
+    "systemName",
+    "systemDesc",
+)
+
+_LLDP_HEADER_RE = re.compile(r"^\|Port +\|Port")
+_LLDP_SEPARATOR_RE = re.compile(r"^\+-+")
+_LLDP_ROW_RES = (
+    re.compile(
+        r"^\|(?P<localPort>\S+) +\|(?P<remotePort>\S+).*Chassis Id: (?P<chassisId>\S+)"
+    ),
+    re.compile(r"^\| +\| +\| +Mgmt Addr: (?P<mgmtAddr>\S+)"),
+    re.compile(r"^\| +\| +\| +System Name: (?P<systemName>\S+)"),
+    re.compile(r"^\| +\| +\| +System Desc: (?P<systemDesc>.+)  +\|"),
+)
+
+
+def _split_pieces(pieces):
+    """Yield the lines of text given in pieces that may end mid line"""
+    rest = ""
+    for piece in pieces:
+        start = 0
+        end = piece.find("\n")
+        while end != -1:
+            line = piece[start:end]
+            if rest:
+                line, rest = rest + line, ""
+            yield line.rstrip("\r")
+            start = end + 1
+            end = piece.find("\n", start)
+        rest += piece[start:]
+    if rest:
+        yield rest.rstrip("\r")
+
+
+def iter_lines(data):
+    """Yield the lines of an output one at a time, without their line ends
+
+    :param data: the output text, the record of a spooled output, or an
+        iterable of lines
+    """
+    if is_spooled(data):
+        return _split_pieces(iter_spooled(data))
+    if isinstance(data, string_types):
+        return _split_pieces((data,))
+    return (line.rstrip("\r\n") for line in data)
+
+
+def _first_token(cell):
+    token = cell.split(None, 1)
+    return token[0] if token else ""
+
+
+def _new_record(fields):
+    return dict((field, "") for field in fields)
+
+
+def _is_empty(record):
+    return not any(record.values())
+
+
+def parse_port_detail(data):
+    """Parse one or more "port show port <id>" blocks
+
+    :param data: the command output, as accepted by iter_lines
+    :rtype: list
+    :return: one dict per port, keyed by PORT_DETAIL_FIELDS
+    """
+    results = []
+    record = _new_record(PORT_DETAIL_FIELDS)
+    for line in iter_lines(data):
+        # | Label | value | [value |]
+        cells = line.split("|")
+        if len(cells) > 3 and not cells[0]:
+            label = cells[1].strip()
+            fields = _PORT_DETAIL_LABELS.get(label)
+            if fields is None:
+                continue
+            for field, cell in zip(fields, cells[2:]):
+                record[field] = _first_token(cell)
+            if label == _PORT_DETAIL_LAST_LABEL:
+                results.append(record)
+                record = _new_record(PORT_DETAIL_FIELDS)
+            continue
+        match = _PORT_INFO_RE.search(line)
+        if match:
+            record["port"] = match.group(1)
+    if not _is_empty(record):
+        results.append(record)
+    return results
+
+
+def parse_lldp_neighbors(data):
+    """Parse the neighbor table of "lldp show neighbors"
+
+    :param data: the command output, as accepted by iter_lines
+    :rtype: list
+    :return: one dict per neighbor, keyed by NEIGHBOR_FIELDS
+    """
+    results = []
+    lines = iter_lines(data)
+
+    # skip to the first separator below the table header
+    for line in lines:
+        if _LLDP_HEADER_RE.match(line):
+            break
+    for line in lines:
+        if _LLDP_SEPARATOR_RE.match(line):
+            break
+
+    record = _new_record(NEIGHBOR_FIELDS)
+    for line in lines:
+        if _LLDP_SEPARATOR_RE.match(line):
+            if not _is_empty(record):
+                results.append(record)
+            record = _new_record(NEIGHBOR_FIELDS)
+            continue
+        for regex in _LLDP_ROW_RES:
+            match = regex.match(line)
+            if match:
+                record.update(match.groupdict())
+                break
+    if not _is_empty(record):
+        results.append(record)
+    return results
+
+
+def _table_cells(line):
+    return [cell.strip() for cell in line.split("|")[1:-1]]
+
+
+def _column_header(rows, count):
+    """Join the multi row header of a box table into one name per column"""
+    names = []
+    for idx in range(count):
+        words = [row[idx] for row in rows if idx < len(row) and row[idx]]
+        name = _HEADER_SLASH_RE.sub("/", " ".join(words).lower())
+        names.append(" ".join(name.split()))
+    return names
+
+
+def parse_port_status(data):
+    """Parse the port table of "port show status"
+
+    The column header may span several rows; columns are identified by their
+    joined header, so the order and width of the columns do not matter.
+
+    :param data: the command output, as accepted by iter_lines
+    :rtype: list
+    :return: one dict per port, keyed by INTERFACE_SUMMARY_FIELDS
+    """
+    header_rows = []
+    columns = None
+    results = []
+    for line in iter_lines(data):
+        if _TABLE_SEPARATOR_RE.match(line):
+            # the separator below the header has a joint per column boundary
+            count = line.strip().count("+") - 1
+            if columns is None and header_rows:
+                if all(len(row) == count for row in header_rows):
+                    names = _column_header(header_rows, count)
+                    columns = [_PORT_STATUS_COLUMNS.get(n) for n in names]
+                header_rows = []
+            continue
+        if not line.startswith("|"):
+            continue
+        cells = _table_cells(line)
+        if columns is None:
+            header_rows.append(cells)
+            continue
+        if len(cells) != len(columns) or not cells[0]:
+            continue
+        record = _new_record(INTERFACE_SUMMARY_FIELDS)
+        for field, cell in zip(columns, cells):
+            if field == "speed/duplex":
+                speed, _, duplex = cell.partition("/")
+                record["speed"] = speed
+                record["duplex"] = _DUPLEX_NAMES.get(duplex, duplex)
+            elif field is not None:
+                record[field] = cell
+        results.append(record)
+    return results
+
+
+def _column_key(name, idx):
+    key = _KEY_RE.sub("_", name.lower()).strip("_")
+    return key or "column_%d" % (idx + 1)
+
+
+def _split_tables(data):
+    """Group the rows of every box table in data into segments, the runs
+    of rows between two separator lines
+    """
+    tables = []
+    segments = None
+    for line in iter_lines(data):
+        line = line.rstrip()
+        if _TABLE_SEPARATOR_RE.match(line):
+            if segments is None:
+                segments = []
+                tables.append(segments)
+            segments.append([])
+        elif line.startswith("|") and segments is not None:
+            segments[-1].append(_table_cells(line))
+        else:
+            segments = None
+    return [[seg for seg in table if seg] for table in tables]
+
+
+def _key_value_table(rows):
+    values = {}
+    for cells in rows:
+        if not cells[0]:
+            continue
+        value = cells[1:] if len(cells) > 2 else cells[1]
+        values[cells[0]] = value
+    return values
+
+
+def _columnar_table(columns, segments):
+    rows = []
+    for segment in segments:
+        record = None
+        for cells in segment:
+            # a row without a first cell continues the row above it
+            if record is not None and not cells[0]:
+                for key, cell in zip(columns, cells):
+                    if cell:
+                        record[key] = ("%s\n%s" % (record[key], cell)).strip()
+                continue
+            cells = cells + [""] * (len(columns) - len(cells))
+            record = dict(zip(columns, cells))
+            rows.append(record)
+    return rows
+
+
+def parse_tables(data):
+    """Parse every SAOS box table of a show command output
+
+    Rows with a single cell before the column rows are the title.  A table
+    with a column header above its first separated rows becomes a list of
+    rows keyed by the header, joined over its rows and converted to
+    lower_case keys; rows without a first cell continue the row above.  A
+    table without a header, or whose header is Parameter/Value, becomes a
+    dict of the first cell of each row to the other cell, or the list of
+    other cells when there are several.  So does a table made only of
+    single cell "Key : value" rows.
+
+    :param data: the command output, as accepted by iter_lines
+    :rtype: list
+    :return: one dict per table, with title and either rows or values
+    """
+    results = []
+    for segments in _split_tables(data):
+        title = []
+        while segments and all(len(row) <= 1 for row in segments[0]):
+            title.extend(row[0] for row in segments.pop(0) if row and row[0])
+        if not segments:
+            # a single column of "Key : value" lines
+            pairs = [line.partition(":") for line in title]
+            values = dict(
+                (key.strip(), value.strip().rstrip(","))
+                for key, sep, value in pairs
+                if sep
+            )
+            if values:
+                heading = [key for key, sep, value in pairs if not sep]
+                results.append(
+                    {"title": " ".join(heading) or None, "values": values}
+                )
+            continue
+        table = {"title": " ".join(title) or None}
+        header = segments[0]
+        names = _column_header(header, len(header[-1]))
+        if len(segments) == 1 or names[0] in KEY_VALUE_HEADERS:
+            rows = segments[0] if len(segments) == 1 else segments[1]
+            for segment in segments[2:]:
+                rows = rows + segment
+            table["values"] = _key_value_table(
+                [row for row in rows if len(row) > 1]
+            )
+        else:
+            columns = [_column_key(n, i) for i, n in enumerate(names)]
+            table["rows"] = _columnar_table(columns, segments[1:])
+        results.append(table)
+    return results
+
+
+def parse_port_statistics(data):
+    """Parse the counter tables of "port show statistics"
+
+    Counters are returned column wise, one list of integers per counter
+    indexed like the port names, so that thousands of ports do not become
+    thousands of dicts.  Counters split over several tables, such as the
+    receive and transmit tables, are merged by port.  Columns holding no
+    integer are skipped and a counter missing for a port is None.
+
+    :param data: the command output, as accepted by iter_lines
+    :rtype: tuple
+    :return: the list of port names and a dict of counter -> list of values
+    """
+    ports = []
+    positions = {}
+    counters = {}
+    for segments in _split_tables(data):
+        while segments and all(len(row) <= 1 for row in segments[0]):
+            segments.pop(0)
+        if len(segments) < 2:
+            continue
+        header = segments[0]
+        names = _column_header(header, len(header[-1]))
+        if not names[0].startswith("port"):
+            continue
+        keys = [_column_key(n, i) for i, n in enumerate(names)]
+        for segment in segments[1:]:
+            for cells in segment:
+                if len(cells) != len(keys) or not cells[0]:
+                    continue
+                pos = positions.get(cells[0])
+                if pos is None:
+                    pos = positions[cells[0]] = len(ports)
+                    ports.append(cells[0])
+                    for values in counters.values():
+                        values.append(None)
+                for key, cell in zip(keys[1:], cells[1:]):
+                    cell = cell.replace(",", "")
+                    if not cell.isdigit():
+                        continue
+                    values = counters.get(key)
+                    if values is None:
+                        values = counters[key] = [None] * len(ports)
+                    values[pos] = int(cell)
+    return ports, counters
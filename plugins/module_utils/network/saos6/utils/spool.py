@@ -0,0 +1,121 @@
+#
+# -*- coding: utf-8 -*-
+# Copyright 2020 Ciena Corp
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+Controller side spool of large command output
+
+A response larger than the spool threshold is written to gzip compressed
+chunk files instead of being returned, and replaced by a small record of
+its path, size and hash.  The cliconf plugin spools in the persistent
+connection process, so a spooled response never crosses to the module, nor
+into task results and fact caches.  It spools a response once network_cli
+has received all of it, so the connection process still holds the whole
+response in memory meanwhile.  Chunks hold chunk_size characters each
+and are named <path>.<number>.gz, so they can be read back one at a time.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import gzip
+import hashlib
+import os
+import re
+import time
+import uuid
+
+from ansible.module_utils._text import to_bytes, to_text
+
+DEFAULT_SPOOL_PATH = "~/.ansible/spool/saos6"
+DEFAULT_THRESHOLD = 1024 * 1024
+DEFAULT_CHUNK_SIZE = 4 * 1024 * 1024
+
+_UNSAFE_NAME_RE = re.compile(r"[^\w.-]+")
+
+spool_spec = {
+    "path": dict(type="path", default=DEFAULT_SPOOL_PATH),
+    "threshold": dict(type="int", default=DEFAULT_THRESHOLD),
+    "chunk_size": dict(type="int", default=DEFAULT_CHUNK_SIZE),
+    "prefix": dict(type="str"),
+}
+
+
+def spool_options(options):
+    """Return the spool options with their defaults filled in, or None when
+    spooling is not enabled
+    """
+    if not options:
+        return None
+    return {
+        "path": os.path.expanduser(options.get("path") or DEFAULT_SPOOL_PATH),
+        "threshold": int(options.get("threshold") or DEFAULT_THRESHOLD),
+        "chunk_size": max(
+            int(options.get("chunk_size") or DEFAULT_CHUNK_SIZE), 1
+        ),
+        "prefix": options.get("prefix") or "saos6",
+    }
+
+
+def should_spool(text, options):
+    return options is not None and len(text) >= options["threshold"]
+
+
+def spool_text(text, options, label=None):
+    """Write text to the chunk files of a new spool entry
+
+    :param text: the output to spool
+    :param options: spool options as returned by spool_options
+    :param label: the command the output belongs to, part of the file name
+    :rtype: dict
+    :return: the path, chunk files, size in bytes and sha256 of the output
+    """
+    if not os.path.isdir(options["path"]):
+        os.makedirs(options["path"])
+    name = "-".join(
+        part
+        for part in (
+            options["prefix"],
+            label,
+            time.strftime("%Y%m%dT%H%M%S"),
+            uuid.uuid4().hex[:8],
+        )
+        if part
+    )
+    path = os.path.join(
+        options["path"], _UNSAFE_NAME_RE.sub("_", name).strip("_")
+    )
+
+    digest = hashlib.sha256()
+    size = 0
+    chunks = []
+    for start in range(0, max(len(text), 1), options["chunk_size"]):
+        end = start + options["chunk_size"]
+        data = to_bytes(text[start:end], errors="surrogate_then_replace")
+        digest.update(data)
+        size += len(data)
+        chunk = "%s.%04d.gz" % (path, len(chunks))
+        with gzip.open(chunk, "wb") as fh:
+            fh.write(data)
+        chunks.append(chunk)
+    return {
+        "spooled": True,
+        "path": path,
+        "chunks": chunks,
+        "size": size,
+        "sha256": digest.hexdigest(),
+    }
+
+
+def is_spooled(value):
+    return isinstance(value, dict) and value.get("spooled") is True
+
+
+def iter_spooled(record):
+    """Yield the text of a spooled output chunk by chunk"""
+    for chunk in record["chunks"]:
+        with gzip.open(chunk, "rb") as fh:
+            yield to_text(fh.read(), errors="surrogate_then_replace")
@@ -10,25 +10,78 @@ from __future__ import absolute_import, division, print_function
 
 __metaclass__ = type
 
-from ansible.errors import AnsibleError
 from ansible.module_utils.six import string_types
+from ansible.module_utils.common._collections_compat import Mapping
 import io
+import threading
 
-try:
-    import textfsm
+# Compiled TextFSM templates, keyed by template id or template text.  A
+# compiled FSM is reused by resetting it to its Start state before each parse
+# instead of re-reading the template and recompiling every rule regex.
+_TEXTFSM_CACHE = {}
+_TEXTFSM_CACHE_LOCK = threading.Lock()
+_TEXTFSM_CACHE_STATS = {"hits": 0, "misses": 0}
 
-    HAS_TEXTFSM = True
-except ImportError:
-    HAS_TEXTFSM = False
 
+def get_textfsm_cache_stats():
+    """Return the hit/miss counters of the compiled template cache"""
+    stats = dict(_TEXTFSM_CACHE_STATS)
+    stats["size"] = len(_TEXTFSM_CACHE)
+    return stats
+
+
+def clear_textfsm_cache():
+    """Drop every compiled template and reset the counters"""
+    with _TEXTFSM_CACHE_LOCK:
+        _TEXTFSM_CACHE.clear()
+        _TEXTFSM_CACHE_STATS["hits"] = 0
+        _TEXTFSM_CACHE_STATS["misses"] = 0
+
+
+def to_list(val):
+    """Return val as a list, None being the empty list"""
+    if isinstance(val, (list, tuple, set)):
+        return list(val)
+    if val is not None:
+        return [val]
+    return list()
+
+
+def is_show_command(command):
+    """Return True if command only displays state, such as "port show status"
+    or "software show"
+
+    :param command: a command string or a dict with a command key
+    """
+    if isinstance(command, Mapping):
+        command = command.get("command")
+    tokens = (command or "").split(None, 2)
+    return bool(tokens) and (
+        tokens[0] == "show"
+        or (len(tokens) > 1 and tokens[1] in ("show", "sh"))
+    )
+
+
+def _import_textfsm():
+    try:
+        import textfsm
+    except ImportError:
+        return None
+    return textfsm
+
+
+def parse_cli_textfsm(value, template, template_id=None):
+    # textfsm and the controller side errors are only imported by the
+    # subsets parsing with a template, which costs the others ~30 ms
+    from ansible.errors import AnsibleError
 
-def parse_cli_textfsm(value, template):
     if isinstance(value, AnsibleError):
         raise AnsibleError(
             "Connection error. Refer to connection logs. This is probably a bug in the saos6 collection%s"
             % (type(value))
         )
-    if not HAS_TEXTFSM:
+    textfsm = _import_textfsm()
+    if textfsm is None:
         raise AnsibleError(
             "parse_cli_textfsm filter requires TextFSM library to be installed"
         )
@@ -43,11 +96,21 @@ def parse_cli_textfsm(value, template):
     else:
         temp = template.decode("utf-8")
 
-    re_table = textfsm.TextFSM(io.StringIO(temp))
-    fsm_results = re_table.ParseText(value)
+    key = template_id or temp
+    with _TEXTFSM_CACHE_LOCK:
+        re_table = _TEXTFSM_CACHE.get(key)
+        if re_table is None:
+            _TEXTFSM_CACHE_STATS["misses"] += 1
+            re_table = textfsm.TextFSM(io.StringIO(temp))
+            _TEXTFSM_CACHE[key] = re_table
+        else:
+            _TEXTFSM_CACHE_STATS["hits"] += 1
+            re_table.Reset()
+        fsm_results = re_table.ParseText(value)
+        header = re_table.header
 
     results = list()
     for item in fsm_results:
-        results.append(dict(zip(re_table.header, item)))
+        results.append(dict(zip(header, item)))
 
     return results
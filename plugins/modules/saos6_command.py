@@ -17,6 +17,13 @@ description:
 version_added: 1.0.0
 notes:
 - Tested against SAOS 6-20
+- Set C(ansible_saos6_pipelining=true) to send consecutive show commands back to
+  back over high latency links instead of waiting for the prompt after each one.
+- Set C(ansible_saos6_response_cache=true) to answer show commands repeated by
+  later tasks from the persistent connection for C(ansible_saos6_response_cache_ttl)
+  seconds, 30 by default.  The commands cached are listed in
+  C(ansible_saos6_response_cache_commands), and any other than show command or
+  configuration change flushes the cache.
 options:
   commands:
     description:
@@ -27,6 +34,8 @@ options:
       answering a prompt, it is possible to pass a dict containing I(command), I(answer)
       and I(prompt). Common answers are 'y' or "\\r" (carriage return, must be double
       quotes). See examples.
+    - A dict may also set I(output) to C(json) to return the tables of the command
+      output as structured data instead of text, or to C(text), the default.
     required: true
   wait_for:
     description:
@@ -48,8 +57,8 @@ options:
   retries:
     description:
     - Specifies the number of retries a command should by tried before it is considered
-      failed. The command is run on the target device every retry and evaluated against
-      the I(wait_for) conditions.
+      failed. The commands referenced by the I(wait_for) conditions that are not yet
+      satisfied are run on the target device every retry and evaluated against them.
     default: 10
   interval:
     description:
@@ -57,6 +66,75 @@ options:
       the command does not pass the specified conditions, the interval indicates how
       long to wait before trying the command again.
     default: 1
+  backoff:
+    description:
+    - Policy for the wait between retries. With C(fixed) the module waits
+      I(interval) seconds between retries, with C(exponential) the wait starts at
+      I(interval) and doubles after each retry, up to I(max_interval).
+    default: fixed
+    choices:
+    - fixed
+    - exponential
+  max_interval:
+    description:
+    - The longest wait in seconds between retries when I(backoff=exponential).
+    default: 30
+  timeout:
+    description:
+    - Overall number of seconds to wait for the I(wait_for) conditions. No retry
+      is started if it would end after this deadline.
+  profile:
+    description:
+    - Returns the wall time and response size of every command run on the
+      device in C(profile).  Commands polled by I(wait_for) count every run after
+      the first as a retry.
+    type: bool
+    default: false
+  spool:
+    description:
+    - Writes every response of at least I(threshold) characters to gzip compressed
+      chunk files on the controller once it has been read from the device, and
+      returns the path, chunk files, size and sha256 of the response instead of
+      its text.  The persistent connection still holds the whole response while
+      it is read and written, so spooling keeps large responses out of the module
+      and task results but does not bound the memory of the connection.
+      Responses requested with I(output=json) are never spooled, and I(wait_for)
+      conditionals see the record of a spooled response, not its text.
+    type: dict
+    suboptions:
+      path:
+        description:
+        - The directory of the spool files.
+        type: path
+        default: ~/.ansible/spool/saos6
+      threshold:
+        description:
+        - The size in characters from which a response is spooled.
+        type: int
+        default: 1048576
+      chunk_size:
+        description:
+        - The number of characters of a response in each chunk file.
+        type: int
+        default: 4194304
+      prefix:
+        description:
+        - The prefix of the spool file names, by default the inventory hostname.
+        type: str
+  stdout_lines:
+    description:
+    - Also return the responses split into lines in C(stdout_lines).  Disable to
+      return every response only once, C(stdout_lines) is then empty.
+    type: bool
+    default: true
+  cache:
+    description:
+    - Answer the commands from the response cache of the connection when it is
+      enabled with the C(ansible_saos6_response_cache) variable and holds a fresh
+      response.  Disable to always run the commands on the device.  Commands
+      polled by I(wait_for) are only answered from the cache on the first run.
+    type: bool
+    default: true
 """
 EXAMPLES = """
 - name: run software show on remote devices
@@ -83,6 +161,44 @@ EXAMPLES = """
     - result[0] contains Installed
     - result[1] contains Port
 
+- name: wait up to five minutes for port 7 to come up, polling only that command
+  ciena.saos6.saos6_command:
+    commands:
+    - software show
+    - port show port 7
+    wait_for:
+    - result[1] contains Up
+    retries: 20
+    backoff: exponential
+    timeout: 300
+
+- name: return the port status table as a list of rows
+  ciena.saos6.saos6_command:
+    commands:
+    - command: port show status
+      output: json
+    - software show
+    wait_for:
+    - result[0][0].rows[6].link_oper_state == Up
+
+- name: save a large table to the controller instead of returning it
+  ciena.saos6.saos6_command:
+    commands:
+    - port show statistics
+    spool:
+      threshold: 65536
+    stdout_lines: false
+  register: result
+
+- name: read the table back
+  shell: "zcat {{ result.stdout[0].chunks | join(' ') }}"
+  when: result.stdout[0].spooled | default(false)
+
+- name: read the port status again even if the connection has it cached
+  ciena.saos6.saos6_command:
+    commands: port show status
+    cache: false
+
 - name: run commands that require answering a prompt
   ciena.saos6.saos6_command:
     commands:
@@ -95,21 +211,75 @@ EXAMPLES = """
 """
 RETURN = """
 stdout:
-  description: The set of responses from the commands
+  description:
+  - The set of responses from the commands.  The response of a command with
+    I(output=json) is the list of its tables, each with its title and either
+    the rows of a columnar table or the values of a key/value table.
+    The response of a spooled command is the record of its spool files, with
+    spooled, path, chunks, size and sha256.
   returned: always apart from low level errors (such as action plugin)
   type: list
-  sample: ['...', '...']
+  sample: ['...', [{'title': 'Port Status', 'rows': [{'port': '1', '...': '...'}]}]]
 stdout_lines:
   description: The value of stdout split into a list
-  returned: always apart from low level errors (such as action plugin)
+  returned: always apart from low level errors (such as action plugin), empty
+    when stdout_lines is false
   type: list
   sample: [['...', '...'], ['...'], ['...']]
+poll_counts:
+  description: The number of times each command was run
+  returned: always apart from low level errors (such as action plugin)
+  type: list
+  sample: [1, 4]
+elapsed:
+  description: The number of seconds spent running and polling the commands
+  returned: always apart from low level errors (such as action plugin)
+  type: float
+  sample: 3.52
+profile:
+  description:
+  - The commands run on the device, in the order they were first run, with the
+    number of runs, the retries, the seconds spent and the bytes received for
+    each, the totals of the run, and the hits, misses, parses and
+    invalidations of the running config cache with the number of configs it
+    holds.
+  returned: when profile is enabled
+  type: dict
+  sample:
+    commands:
+    - command: port show status
+      runs: 3
+      retries: 2
+      elapsed: 0.1539
+      bytes: 18690
+    total:
+      commands: 3
+      elapsed: 0.1539
+      bytes: 18690
+    config_cache:
+      hits: 0
+      misses: 0
+      parses: 0
+      invalidations: 0
+      size: 0
+response_cache:
+  description: The hits, misses and flushes of the response cache of the
+    connection since it was opened, with its size and hit rate
+  returned: when the response cache is enabled
+  type: dict
+  sample:
+    hits: 12
+    misses: 4
+    flushes: 1
+    size: 3
+    hit_rate: 0.75
 failed_conditions:
   description: The list of conditionals that have failed
   returned: failed
   type: list
   sample: ['...', '...']
 """
+import re
 import time
 from ansible.module_utils._text import to_text
 from ansible.module_utils.basic import AnsibleModule
@@ -121,9 +291,20 @@ from ansible_collections.ansible.netcommon.plugins.module_utils.network.common.u
     to_lines,
 )
 from ansible_collections.ciena.saos6.plugins.module_utils.network.saos6.saos6 import (
+    enable_profile,
+    get_profile,
+    get_response_cache_stats,
     run_commands,
     saos6_argument_spec,
 )
+from ansible_collections.ciena.saos6.plugins.module_utils.network.saos6.utils.parsers import (
+    parse_tables,
+)
+from ansible_collections.ciena.saos6.plugins.module_utils.network.saos6.utils.spool import (
+    spool_spec,
+)
+
+OUTPUT_FORMATS = ("text", "json")
 
 
 def parse_commands(module, warnings):
@@ -139,6 +320,45 @@ def parse_commands(module, warnings):
     return commands
 
 
+def pop_output_formats(module, commands):
+    """Remove the output key of every command, which the device does not
+    understand, and return the formats to return the responses in
+    """
+    formats = []
+    for item in commands:
+        output = item.pop("output", None) or "text"
+        if output not in OUTPUT_FORMATS:
+            module.fail_json(
+                msg="unsupported output %s for command %s, expected one of %s"
+                % (output, item["command"], ", ".join(OUTPUT_FORMATS))
+            )
+        formats.append(output)
+    return formats
+
+
+def get_delay(module, attempt):
+    """Return the seconds to wait before the next poll"""
+    interval = module.params["interval"]
+    if module.params["backoff"] == "exponential":
+        interval = min(
+            interval * 2 ** (attempt - 1), module.params["max_interval"]
+        )
+    return max(interval, 0)
+
+
+def get_pending_commands(conditionals, count):
+    """Return the indexes of the commands the unsatisfied conditionals refer
+    to, or of every command if a conditional does not name a single result
+    """
+    pending = set()
+    for item in conditionals:
+        match = re.match(r"^result\[(\d+)\]", item.key)
+        if not match or int(match.group(1)) >= count:
+            return list(range(count))
+        pending.add(int(match.group(1)))
+    return sorted(pending)
+
+
 def main():
     """main entry point for module execution
     """
@@ -148,6 +368,13 @@ def main():
         match=dict(default="all", choices=["all", "any"]),
         retries=dict(default=10, type="int"),
         interval=dict(default=1, type="int"),
+        backoff=dict(default="fixed", choices=["fixed", "exponential"]),
+        max_interval=dict(default=30, type="int"),
+        timeout=dict(type="int"),
+        profile=dict(default=False, type="bool"),
+        spool=dict(type="dict", options=spool_spec),
+        stdout_lines=dict(default=True, type="bool"),
+        cache=dict(default=True, type="bool"),
     )
     argument_spec.update(saos6_argument_spec)
     module = AnsibleModule(
@@ -155,34 +382,88 @@ def main():
     )
     warnings = list()
     result = {"changed": False, "warnings": warnings}
+    if module.params["profile"]:
+        enable_profile(module)
     commands = parse_commands(module, warnings)
+    formats = pop_output_formats(module, commands)
     wait_for = module.params["wait_for"] or list()
     try:
         conditionals = [Conditional(c) for c in wait_for]
     except AttributeError as exc:
         module.fail_json(msg=to_text(exc))
     retries = module.params["retries"]
-    interval = module.params["interval"]
     match = module.params["match"]
-    while retries > 0:
-        responses = run_commands(module, commands)
+    deadline = None
+    if module.params["timeout"]:
+        deadline = time.time() + module.params["timeout"]
+
+    start = time.time()
+    poll_counts = [0] * len(commands)
+    pending = list(range(len(commands)))
+    responses = [None] * len(commands)
+    attempt = 0
+    while True:
+        spool = module.params["spool"]
+        if spool:
+            # responses returned as json are parsed here, never spooled
+            spool = dict(
+                spool,
+                exclude=[
+                    pos
+                    for pos, idx in enumerate(pending)
+                    if formats[idx] == "json"
+                ],
+            )
+        output = run_commands(
+            module,
+            [commands[idx] for idx in pending],
+            spool=spool,
+            cache=module.params["cache"] and attempt == 0,
+        )
+        for idx, out in zip(pending, output):
+            if formats[idx] == "json":
+                out = parse_tables(out)
+            responses[idx] = out
+            poll_counts[idx] += 1
         for item in list(conditionals):
             if item(responses):
                 if match == "any":
                     conditionals = list()
                     break
                 conditionals.remove(item)
-        if not conditionals:
+        attempt += 1
+        if not conditionals or attempt >= retries:
+            break
+        delay = get_delay(module, attempt)
+        if deadline is not None and time.time() + delay > deadline:
             break
-        time.sleep(interval)
-        retries -= 1
+        time.sleep(delay)
+        pending = get_pending_commands(conditionals, len(commands))
+    elapsed = round(time.time() - start, 3)
+    if module.params["profile"]:
+        result["profile"] = get_profile(module)
+    response_cache = get_response_cache_stats(module)
+    if response_cache is not None:
+        result["response_cache"] = response_cache
     if conditionals:
         failed_conditions = [item.raw for item in conditionals]
         msg = "One or more conditional statements have not been satisfied"
-        module.fail_json(msg=msg, failed_conditions=failed_conditions)
+        result.update(
+            {
+                "msg": msg,
+                "failed_conditions": failed_conditions,
+                "poll_counts": poll_counts,
+                "elapsed": elapsed,
+            }
+        )
+        module.fail_json(**result)
     result.update(
-        {"stdout": responses, "stdout_lines": list(to_lines(responses))}
+        {"stdout": responses, "poll_counts": poll_counts, "elapsed": elapsed}
     )
+    # ansible adds stdout_lines to a result that has stdout but none
+    result["stdout_lines"] = []
+    if module.params["stdout_lines"]:
+        result["stdout_lines"] = list(to_lines(responses))
     module.exit_json(**result)
 
 
@@ -0,0 +1,264 @@
+#!/usr/bin/python
+#
+# Copyright: (c) 2020 Ciena Corp
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+DOCUMENTATION = """
+module: saos6_config
+author: Jeff Groom
+short_description: Manage the configuration of devices running Ciena SAOS 6
+description:
+- Compares a set of configuration commands with the running configuration of a
+  SAOS 6 node and sends only the commands that are not already present.  The
+  running configuration is read once per task and the comparison is a single
+  pass over both configurations, so re-applying a complete configuration that
+  has not drifted sends no commands.
+version_added: 1.1.0
+notes:
+- Tested against SAOS 6-20
+- Commands are compared with the running configuration as displayed by
+  C(configuration show brief).  Commands that SAOS 6 displays differently than
+  they were entered are always sent.
+- Supports check mode and diff mode.
+- Backups are stored in a content addressed store.  Each distinct normalized
+  configuration is kept once, gzip compressed, and a new version of a host is
+  stored as its line changes against the previous version when they are small.
+  A backup whose content matches the last version of the host writes nothing.
+options:
+  lines:
+    description:
+    - The ordered set of configuration commands to apply.  Commands using vlan or
+      port lists, such as C(vlan create vlan 100-199), match the running
+      configuration however the ids are grouped there.
+    type: list
+    aliases:
+    - commands
+  src:
+    description:
+    - A file containing the configuration commands to apply, one per line.  The
+      file is templated by the action plugin before it is compared.  Mutually
+      exclusive with I(lines).
+    type: path
+  running_config:
+    description:
+    - The running configuration to compare against, instead of reading it from
+      the device.
+    type: str
+    aliases:
+    - config
+  collapse:
+    description:
+    - Merge the commands to send that differ only by a vlan or port id into
+      id list forms, so that creating vlans 100 to 599 sends
+      C(vlan create vlan 100-599).  Commands are only moved ahead of commands
+      that name none of their ids, so dependent commands keep their order.
+    type: bool
+    default: true
+  save:
+    description:
+    - Run C(configuration save) after commands were sent to the device.
+    type: bool
+    default: false
+  backup:
+    description:
+    - Store the running configuration in the backup store on the controller
+      before any change is made.  Comments other than the section headers, such
+      as the creation time, are not part of the backup.  When neither I(lines)
+      nor I(src) is given, only the backup is taken.
+    type: bool
+    default: false
+  backup_options:
+    description:
+    - Options of the backup store, used when I(backup) is true.
+    type: dict
+    suboptions:
+      dir_path:
+        description:
+        - Directory of the backup store.  Defaults to the C(backup) directory
+          next to the playbook, or in the role root directory when run from a
+          role.
+        type: path
+      host:
+        description:
+        - Name the versions are listed under.  Defaults to the inventory hostname.
+        type: str
+      filename:
+        description:
+        - File in I(dir_path) the latest version is written to as plain text,
+          replacing it when the configuration changed.  Defaults to
+          C(<host>_config).
+        type: str
+"""
+EXAMPLES = """
+- name: create vlans and attach them to a port
+  ciena.saos6.saos6_config:
+    lines:
+    - vlan create vlan 100-110
+    - vlan add vlan 100-110 port 7
+    save: true
+
+- name: provision vlans 100 to 599 on port 7, sent as two commands
+  ciena.saos6.saos6_config:
+    lines: >-
+      {{ query('sequence', 'start=100 end=599 format="vlan create vlan %d"')
+      + query('sequence', 'start=100 end=599 format="vlan add vlan %d port 7"') }}
+
+- name: apply a golden configuration
+  ciena.saos6.saos6_config:
+    src: golden.cfg
+
+- name: back up the running configuration, writing only when it changed
+  ciena.saos6.saos6_config:
+    backup: true
+    backup_options:
+      dir_path: /srv/backups/saos6
+"""
+RETURN = """
+commands:
+  description: The set of commands sent to the device
+  returned: always
+  type: list
+  sample: ['vlan create vlan 100-110', 'vlan add vlan 100-110 port 7']
+updates:
+  description: The set of commands sent to the device
+  returned: always
+  type: list
+  sample: ['vlan create vlan 100-110', 'vlan add vlan 100-110 port 7']
+backup_path:
+  description: The plain text file holding the backed up version,
+    I(backup_options.filename) in the store directory
+  returned: when backup is true
+  type: str
+  sample: /playbooks/backup/switch1_config
+backup_object:
+  description: The compressed object of the version in the store, which holds
+    either the whole configuration or its changes against an earlier version
+  returned: when backup is true
+  type: str
+  sample: /playbooks/backup/objects/5d/5d41402abc4b2a76b9719d911017c592ae0c1f7d6c1e2a2b1a4e3f6a7b8c9d0e.gz
+backup_sha256:
+  description: The sha256 of the normalized configuration, its key in the store
+  returned: when backup is true
+  type: str
+  sample: 5d41402abc4b2a76b9719d911017c592ae0c1f7d6c1e2a2b1a4e3f6a7b8c9d0e
+date:
+  description: The date the backed up version was first stored
+  returned: when backup is true
+  type: str
+  sample: "2020-10-12"
+time:
+  description: The time the backed up version was first stored
+  returned: when backup is true
+  type: str
+  sample: "22:28:34"
+"""
+import os
+import time
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.ciena.saos6.plugins.module_utils.network.saos6.saos6 import (
+    get_config,
+    load_config,
+    run_commands,
+    saos6_argument_spec,
+)
+from ansible_collections.ciena.saos6.plugins.module_utils.network.saos6.utils.backup import (
+    BackupStore,
+)
+from ansible_collections.ciena.saos6.plugins.module_utils.network.saos6.utils.config import (
+    collapse_commands,
+    diff_config,
+)
+
+
+def backup_config(module, result):
+    """Store the running config in the backup store and report its version
+    """
+    options = module.params["backup_options"] or {}
+    path = options.get("dir_path") or "backup"
+    host = options.get("host") or "saos6"
+    running = get_config(module)
+    try:
+        store = BackupStore(path)
+        version = store.save(host, running)
+        # the store object may be a compressed delta, so the version is
+        # always also written out as plain text
+        filename = options.get("filename") or "%s_config" % host
+        backup_path = os.path.join(store.path, filename)
+        if version["stored"] or not os.path.exists(backup_path):
+            with open(backup_path, "w") as fh:
+                fh.write(store.read(version["sha256"]))
+    except (IOError, OSError) as exc:
+        module.fail_json(msg="unable to store the backup: %s" % exc)
+
+    result["backup_path"] = backup_path
+    result["backup_object"] = store.path_of(version["sha256"])
+    result["backup_sha256"] = version["sha256"]
+    result["date"], result["time"] = time.strftime(
+        "%Y-%m-%d@%H:%M:%S", time.localtime(version["time"])
+    ).split("@")
+    if version["stored"]:
+        result["changed"] = True
+
+
+def main():
+    """main entry point for module execution
+    """
+    argument_spec = dict(
+        lines=dict(type="list", aliases=["commands"]),
+        src=dict(type="path"),
+        running_config=dict(aliases=["config"]),
+        collapse=dict(type="bool", default=True),
+        save=dict(type="bool", default=False),
+        backup=dict(type="bool", default=False),
+        backup_options=dict(
+            type="dict",
+            options=dict(
+                dir_path=dict(type="path"),
+                host=dict(type="str"),
+                filename=dict(type="str"),
+            ),
+        ),
+    )
+    argument_spec.update(saos6_argument_spec)
+    module = AnsibleModule(
+        argument_spec=argument_spec,
+        mutually_exclusive=[("lines", "src")],
+        supports_check_mode=True,
+    )
+    warnings = list()
+    result = {"changed": False, "warnings": warnings}
+
+    candidate = module.params["lines"] or module.params["src"]
+    if candidate is None and not module.params["backup"]:
+        module.fail_json(
+            msg="one of the following is required: lines, src, backup"
+        )
+    if module.params["backup"]:
+        backup_config(module, result)
+
+    updates = []
+    if candidate is not None:
+        running = module.params["running_config"] or get_config(module)
+        updates = diff_config(candidate, running)
+        if module.params["collapse"]:
+            updates = collapse_commands(updates)
+
+    result["commands"] = updates
+    result["updates"] = updates
+    if updates:
+        if not module.check_mode:
+            load_config(module, updates)
+            if module.params["save"]:
+                run_commands(module, ["configuration save"])
+        result["changed"] = True
+        if module._diff:
+            result["diff"] = {"prepared": "\n".join(updates)}
+
+    module.exit_json(**result)
+
+
+if __name__ == "__main__":
+    main()
@@ -28,19 +28,163 @@ options:
   gather_subset:
     description:
     - When supplied, this argument will restrict the facts collected to a given subset.  Possible
-      values for this argument include all, default, config, and neighbors. Can specify
-      a list of values to include a larger subset. Values can also be used with an
-      initial C(M(!)) to specify that a specific subset should not be collected.
+      values for this argument include all, default, config, config_parsed, interfaces,
+      interfaces_summary and neighbors. Can specify a list of values to include a larger
+      subset. Values can also be used with an initial C(M(!)) to specify that a specific
+      subset should not be collected. C(config_parsed) and C(interfaces_summary) are
+      only collected when named explicitly or with C(all).
     required: false
     default: '!config'
   gather_network_resources:
     description:
     - When supplied, this argument will restrict the facts collected to a given subset.
-      Possible values for this argument include all and the resources like interfaces.
+      Possible values for this argument include all and the resources like vlans.
       Can specify a list of values to include a larger subset. Values can also be
       used with an initial C(M(!)) to specify that a specific subset should not be
-      collected. Valid subsets are 'all', 'interfaces', 'neighbors'
+      collected. Valid subsets are 'all', 'ports', 'virtual_switches', 'vlans'.
+      All resources are built from one read and parse of the running config,
+      which is shared with the C(config) and C(config_parsed) subsets.
     required: false
+  cache:
+    description:
+    - Enables the controller side facts cache. Subsets gathered less than I(ttl)
+      seconds ago are returned from the cache instead of being collected from the
+      device again. The default subset is always collected, and cached entries are
+      discarded when the serial number or software version of the device changes.
+      The subsets served from the cache are listed in C(ansible_net_cached_subsets).
+    required: false
+    type: dict
+    suboptions:
+      path:
+        description:
+        - Directory on the controller holding the cache.
+        type: path
+        default: ~/.ansible/cache/saos6
+      host:
+        description:
+        - Name the cache entry is stored under. Defaults to the inventory hostname.
+        type: str
+      ttl:
+        description:
+        - Number of seconds a cached subset stays valid.
+        type: int
+        default: 600
+      subset_ttl:
+        description:
+        - Per subset overrides of I(ttl), for example C({interfaces: 60}).
+        type: dict
+      incremental:
+        description:
+        - Refresh an expired interfaces subset from its cached facts, as with
+          I(previous_interfaces).
+        type: bool
+        default: false
+  previous_interfaces:
+    description:
+    - The C(ansible_net_interfaces) of an earlier run.  The interfaces subset then
+      reads C(port show status) and runs C(port show port) only for the new ports
+      and the ports whose admin or oper link state changed; the other ports are
+      returned from this list.  Changes that leave the link state alone, such as a
+      new PVID, are not seen until the port is read again.  Both facts formats
+      are accepted.
+    required: false
+    type: raw
+  session_pool:
+    description:
+    - Opens extra CLI sessions to the device and spreads the subsets, and the
+      per port commands of the interfaces subset, over them.  The results are
+      the same as with a single session.  Only supported with the network_cli
+      connection.
+    required: false
+    type: dict
+    suboptions:
+      size:
+        description:
+        - Total number of sessions, including the one of the connection.  Every
+          extra session is a separate SSH login and counts against the CLI
+          session limit of the device.
+        type: int
+        default: 1
+      sockets:
+        description:
+        - Socket paths of the extra sessions.  Set by the action plugin.
+        type: list
+  profile:
+    description:
+    - Returns the wall time and response size of every command run on the
+      device, and the totals of every subset, in C(profile).
+    required: false
+    type: bool
+    default: false
+  spool:
+    description:
+    - Writes a running config of at least I(threshold) characters to gzip
+      compressed chunk files on the controller and returns the path, chunk files,
+      size and sha256 of the config in C(ansible_net_config_spooled) instead of
+      the config in C(ansible_net_config), keeping it out of the facts and the
+      fact caches.  The config is written once it has been read in full by the
+      persistent connection, which holds all of it until then.
+    required: false
+    type: dict
+    suboptions:
+      path:
+        description:
+        - The directory of the spool files.
+        type: path
+        default: ~/.ansible/spool/saos6
+      threshold:
+        description:
+        - The size in characters from which the config is spooled.
+        type: int
+        default: 1048576
+      chunk_size:
+        description:
+        - The number of characters of the config in each chunk file.
+        type: int
+        default: 4194304
+      prefix:
+        description:
+        - The prefix of the spool file names, by default the inventory hostname.
+        type: str
+  facts_format:
+    description:
+    - The form of the facts holding one entry per port or neighbor,
+      C(ansible_net_interfaces), C(ansible_net_interfaces_summary) and
+      C(ansible_net_neighbors).  C(rows) returns a list of dicts.  C(columnar)
+      returns the field names once in C(columns), the number of entries in
+      C(length) and one list of values per field in C(data); a field with few
+      distinct values is a dict of its C(values) and the index of the value of
+      every entry in C(codes).  The C(ciena.saos6.expand_rows) filter turns a
+      columnar fact back into rows.
+    required: false
+    type: str
+    choices:
+    - rows
+    - columnar
+    default: rows
+  parsers:
+    description:
+    - Selects the engine used to parse the show command output of a subset.
+      C(native) uses the precompiled parsers shipped with the collection and
+      does not need the textfsm library; C(textfsm) uses the TextFSM templates.
+      Both return the same fields.
+    required: false
+    type: dict
+    suboptions:
+      interfaces:
+        description:
+        - Parser engine for the interfaces subset.
+        default: native
+        choices:
+        - native
+        - textfsm
+      neighbors:
+        description:
+        - Parser engine for the neighbors subset.
+        default: native
+        choices:
+        - native
+        - textfsm
 """
 
 EXAMPLES = """
@@ -49,6 +193,14 @@ EXAMPLES = """
     gather_subset: all
     gather_network_resources: all
 
+- name: collect the vlans, ports and virtual switches with one config read
+  ciena.saos6.saos6_facts:
+    gather_subset: min
+    gather_network_resources:
+    - vlans
+    - ports
+    - virtual_switches
+
 - name: collect config and default facts
   ciena.saos6.saos6_facts:
     gather_subset: config
@@ -56,13 +208,126 @@ EXAMPLES = """
 - name: collect everything exception the config
   ciena.saos6.saos6_facts:
     gather_subset: '!config'
+
+- name: collect the running config as a parsed, indexed tree
+  ciena.saos6.saos6_facts:
+    gather_subset: config_parsed
+
+- name: reuse facts gathered in the last 10 minutes, interfaces in the last minute
+  ciena.saos6.saos6_facts:
+    gather_subset: all
+    cache:
+      ttl: 600
+      subset_ttl:
+        interfaces: 60
+
+- name: gather everything over four CLI sessions
+  ciena.saos6.saos6_facts:
+    gather_subset: all
+    session_pool:
+      size: 4
+
+- name: collect the link state, speed and duplex of every port with one command
+  ciena.saos6.saos6_facts:
+    gather_subset: interfaces_summary
+
+- name: poll interfaces, reading only the ports whose link state changed
+  ciena.saos6.saos6_facts:
+    gather_subset: interfaces
+    previous_interfaces: "{{ ansible_net_interfaces | default(omit) }}"
+
+- name: find the slow commands of the interfaces subset
+  ciena.saos6.saos6_facts:
+    gather_subset: interfaces
+    profile: true
+
+- name: keep a large running config out of the facts
+  ciena.saos6.saos6_facts:
+    gather_subset: config
+    spool:
+      threshold: 262144
+
+- name: parse interfaces with the TextFSM templates
+  ciena.saos6.saos6_facts:
+    gather_subset: interfaces
+    parsers:
+      interfaces: textfsm
+
+- name: keep the interfaces of thousands of ports compact
+  ciena.saos6.saos6_facts:
+    gather_subset: interfaces
+    facts_format: columnar
+
+- name: list the ports that are down
+  debug:
+    msg: "{{ ansible_net_interfaces | ciena.saos6.expand_rows(['port', 'LinkStateOper'])
+      | selectattr('LinkStateOper', 'eq', 'Down') | map(attribute='port') | list }}"
 """
 
 RETURN = """
 ansible_net_config:
   description: The running-config from the device
-  returned: when config is configured
+  returned: when config is configured and not spooled
   type: str
+ansible_net_config_spooled:
+  description: The spool files of the running-config from the device
+  returned: when config is configured and spooled
+  type: dict
+  sample:
+    spooled: true
+    path: /home/user/.ansible/spool/saos6/sw1-config-20201015T120000-1f2e3d4c
+    chunks:
+    - /home/user/.ansible/spool/saos6/sw1-config-20201015T120000-1f2e3d4c.0000.gz
+    size: 2731520
+    sha256: 9f86d081884c7d659a2feaa0c55ad015a3bf4f1b2b0b822cd15d6c15b0f00a08
+ansible_net_cached_subsets:
+  description: The subsets returned from the controller side facts cache
+  returned: when cache is configured
+  type: list
+ansible_net_config_parsed:
+  description:
+  - The running-config parsed into its command lines, the line numbers under each
+    section header, an index from each vlan, port, virtual-switch and sub-port to
+    the lines that reference it, and the virtual switches each port is attached to.
+  returned: when config_parsed is configured
+  type: dict
+profile:
+  description:
+  - The commands run on the device, in the order they were first run, with the
+    number of runs, the retries, the seconds spent and the bytes received for
+    each, the totals of the run, the commands, seconds, bytes and wall time
+    of each subset, the hits, misses, parses and invalidations of the running
+    config cache with the number of configs it holds, and the hits, misses
+    and size of the compiled TextFSM template cache.
+  returned: when profile is enabled
+  type: dict
+  sample:
+    commands:
+    - command: port show status
+      runs: 1
+      retries: 0
+      elapsed: 0.0513
+      bytes: 6230
+    total:
+      commands: 1
+      elapsed: 0.0513
+      bytes: 6230
+    subsets:
+      interfaces:
+        commands: 1
+        elapsed: 0.0513
+        bytes: 6230
+        wall_time: 0.0602
+    config_cache:
+      hits: 0
+      misses: 0
+      parses: 0
+      invalidations: 0
+      size: 0
+    textfsm_cache:
+      hits: 0
+      misses: 1
+      size: 1
 ansible_net_model:
   description: The device model string
   returned: always
@@ -75,8 +340,21 @@ ansible_net_version:
   description: The version of the software running
   returned: always
   type: str
+ansible_net_interfaces_refreshed:
+  description: The ports read again by an incremental refresh of the interfaces
+  returned: when interfaces are refreshed from previous_interfaces or the cache
+  type: list
+ansible_net_interfaces_summary:
+  description:
+  - The port, type, admin and oper link state, speed, duplex, flow control, auto
+    negotiation, mode and description of every port, from C(port show status).
+    The fields shared with C(ansible_net_interfaces) have the same names.
+    A dict of columns with the columnar facts format.
+  returned: when interfaces_summary is configured
+  type: list
 ansible_net_neighbors:
-  description: The set of LLDP neighbors
+  description: The set of LLDP neighbors, a dict of columns with the columnar
+    facts format
   returned: when interface is configured
   type: list
 ansible_net_gather_subset:
@@ -91,6 +369,30 @@ ansible_net_python_version:
   description: The Python version Ansible controller is using
   returned: always
   type: str
+ansible_network_resources:
+  description:
+  - The network resources parsed from the running config.  C(vlans) lists the
+    vlan_id, name and member ports of every vlan, C(ports) the settings, vlans
+    and virtual switches of every configured port and C(virtual_switches) the
+    type, settings and members of every virtual switch.
+  returned: always
+  type: dict
+  sample:
+    vlans:
+    - vlan_id: 200
+      name: mgmt
+      ports: ['1', '7']
+    ports:
+    - name: '7'
+      description: uplink A
+      vlans: [200]
+      virtual_switches: [vs1]
+    virtual_switches:
+    - name: vs1
+      type: ethernet
+      members:
+      - port: '7'
+        vlan: 200
 ansible_net_gather_network_resources:
   description: The list of fact resource subsets collected from the device
   returned: always
@@ -105,6 +407,7 @@ from ansible_collections.ciena.saos6.plugins.module_utils.network.saos6.facts.fa
     Facts,
 )
 from ansible_collections.ciena.saos6.plugins.module_utils.network.saos6.saos6 import (
+    enable_profile,
     saos6_argument_spec,
 )
 
@@ -128,11 +431,21 @@ def main():
             "default value for `gather_subset` will be changed to `min` from `!config` v2.11 onwards"
         )
 
-    result = Facts(module).get_facts()
+    if module.params["profile"]:
+        enable_profile(module)
+
+    facts = Facts(module)
+    result = facts.get_facts()
 
     ansible_facts, additional_warnings = result
     warnings.extend(additional_warnings)
 
+    if module.params["profile"]:
+        module.exit_json(
+            ansible_facts=ansible_facts,
+            warnings=warnings,
+            profile=facts.get_profile(),
+        )
     module.exit_json(ansible_facts=ansible_facts, warnings=warnings)
 
 
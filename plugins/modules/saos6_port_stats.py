@@ -0,0 +1,255 @@
+#!/usr/bin/python
+#
+# Copyright: (c) 2020 Ciena Corp
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+DOCUMENTATION = """
+module: saos6_port_stats
+author: Jeff Groom
+short_description: Collect port counters from devices running Ciena SAOS 6
+description:
+- Reads the counters of every port of a SAOS 6 node with a single
+  C(port show statistics) command and returns them column wise, one list of
+  integers per counter indexed like the list of port names.
+- Given the result of a previous run, also returns the change of every counter
+  since that run and its rate per second.
+version_added: 1.1.0
+notes:
+- Tested against SAOS 6-20
+- The statistics of every port are read even when I(ports) selects a few of
+  them, it is still one command.
+- A counter lower than in the previous sample is taken to have wrapped at
+  I(counter_bits) bits, unless the wrapped change would exceed half the counter
+  range, in which case the counter is taken to have been cleared and its change
+  is its current value.
+- Supports check mode.
+options:
+  ports:
+    description:
+    - The ports to return the counters of, by default every port.
+    type: list
+    elements: str
+  counters:
+    description:
+    - The counters to return, such as C(rx_bytes) or C(tx_pkts), by default
+      every counter the device displays.  Counter names are the column names of
+      the statistics table in lower case, with underscores between words.
+    type: list
+    elements: str
+  previous:
+    description:
+    - The registered result of a previous run of this module on the same device,
+      to compute I(deltas) and I(rates) from.  Ports and counters are matched by
+      name, so the previous run may have selected other ports.
+    type: dict
+  counter_bits:
+    description:
+    - The width of the device counters, used to compute the change of a counter
+      that wrapped since the previous sample.
+    type: int
+    choices: [32, 64]
+    default: 64
+"""
+EXAMPLES = """
+- name: sample the counters of every port twice, a minute apart
+  ciena.saos6.saos6_port_stats:
+  register: before
+
+- pause:
+    minutes: 1
+
+- name: compute the traffic rates of the uplinks
+  ciena.saos6.saos6_port_stats:
+    ports: ['1', '2']
+    counters: [rx_bytes, tx_bytes]
+    previous: "{{ before }}"
+  register: after
+
+- debug:
+    msg: "port {{ item.0 }} receives {{ item.1 * 8 }} bit/s"
+  loop: "{{ after.ports | zip(after.rates.rx_bytes) | list }}"
+"""
+RETURN = """
+ports:
+  description: The port names, in the order of the counter lists
+  returned: always
+  type: list
+  sample: ['1', '2']
+counters:
+  description: For every counter, its value on each port, or null where the
+    device did not display it
+  returned: always
+  type: dict
+  sample: {'rx_bytes': [1530120, 98011], 'tx_bytes': [1200467, 75010]}
+timestamp:
+  description: The time the counters were read, in seconds since the epoch
+  returned: always
+  type: float
+  sample: 1602918000.125
+interval:
+  description: The number of seconds since the previous sample
+  returned: when previous is given
+  type: float
+  sample: 60.02
+deltas:
+  description: For every counter also in the previous sample, its change on
+    each port, or null where either sample lacks the port
+  returned: when previous is given
+  type: dict
+  sample: {'rx_bytes': [75000, 1200], 'tx_bytes': [60000, 1100]}
+rates:
+  description: The deltas divided by the interval
+  returned: when previous is given and the interval is positive
+  type: dict
+  sample: {'rx_bytes': [1249.583, 19.993], 'tx_bytes': [999.667, 18.327]}
+"""
+import time
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.ciena.saos6.plugins.module_utils.network.saos6.saos6 import (
+    run_commands,
+    saos6_argument_spec,
+)
+from ansible_collections.ciena.saos6.plugins.module_utils.network.saos6.utils.parsers import (
+    parse_port_statistics,
+)
+
+STATISTICS_COMMAND = "port show statistics"
+
+
+def select(ports, counters, wanted_ports, wanted_counters, warnings):
+    """Return the ports and counters restricted to the wanted ones"""
+    if wanted_counters:
+        missing = [key for key in wanted_counters if key not in counters]
+        if missing:
+            warnings.append("unknown counters %s" % ", ".join(missing))
+        counters = dict(
+            (key, counters[key]) for key in wanted_counters if key in counters
+        )
+    if wanted_ports:
+        positions = dict((port, idx) for idx, port in enumerate(ports))
+        missing = [port for port in wanted_ports if port not in positions]
+        if missing:
+            warnings.append("unknown ports %s" % ", ".join(missing))
+        keep = [positions[port] for port in wanted_ports if port in positions]
+        ports = [ports[idx] for idx in keep]
+        counters = dict(
+            (key, [values[idx] for idx in keep])
+            for key, values in counters.items()
+        )
+    return ports, counters
+
+
+def counter_delta(current, previous, modulus):
+    """Return the change of a counter between two samples"""
+    if current is None or previous is None:
+        return None
+    delta = current - previous
+    if delta < 0:
+        delta += modulus
+        if delta > modulus // 2:
+            # cleared rather than wrapped
+            delta = current
+    return delta
+
+
+def compute_deltas(ports, counters, previous, bits):
+    """Return the change of every counter since the previous sample"""
+    positions = dict(
+        (port, idx) for idx, port in enumerate(previous.get("ports") or [])
+    )
+    indexes = [positions.get(port) for port in ports]
+    modulus = 2 ** bits
+    deltas = {}
+    for key, values in counters.items():
+        before = (previous.get("counters") or {}).get(key)
+        if before is None:
+            continue
+        deltas[key] = [
+            counter_delta(
+                value,
+                before[idx] if idx is not None and idx < len(before) else None,
+                modulus,
+            )
+            for value, idx in zip(values, indexes)
+        ]
+    return deltas
+
+
+def compute_rates(deltas, interval):
+    """Return the per second rate of every delta, or None when interval is
+    not positive
+    """
+    if interval <= 0:
+        return None
+    return dict(
+        (
+            key,
+            [
+                None if delta is None else round(delta / interval, 3)
+                for delta in values
+            ],
+        )
+        for key, values in deltas.items()
+    )
+
+
+def main():
+    """main entry point for module execution
+    """
+    argument_spec = dict(
+        ports=dict(type="list", elements="str"),
+        counters=dict(type="list", elements="str"),
+        previous=dict(type="dict"),
+        counter_bits=dict(type="int", default=64, choices=[32, 64]),
+    )
+    argument_spec.update(saos6_argument_spec)
+    module = AnsibleModule(
+        argument_spec=argument_spec, supports_check_mode=True
+    )
+    warnings = list()
+    result = {"changed": False, "warnings": warnings}
+
+    previous = module.params["previous"]
+    if previous is not None and "timestamp" not in previous:
+        module.fail_json(
+            msg="previous is not a result of saos6_port_stats, it has no "
+            "timestamp"
+        )
+
+    start = time.time()
+    output = run_commands(module, [STATISTICS_COMMAND])[0]
+    timestamp = round((start + time.time()) / 2, 3)
+    ports, counters = parse_port_statistics(output)
+    ports, counters = select(
+        ports,
+        counters,
+        module.params["ports"],
+        module.params["counters"],
+        warnings,
+    )
+    result.update(
+        {"ports": ports, "counters": counters, "timestamp": timestamp}
+    )
+
+    if previous is not None:
+        interval = round(timestamp - float(previous["timestamp"]), 3)
+        deltas = compute_deltas(
+            ports, counters, previous, module.params["counter_bits"]
+        )
+        result.update({"interval": interval, "deltas": deltas})
+        rates = compute_rates(deltas, interval)
+        if rates is not None:
+            result["rates"] = rates
+        else:
+            warnings.append(
+                "previous was not sampled before this run, no rates computed"
+            )
+
+    module.exit_json(**result)
+
+
+if __name__ == "__main__":
+    main()
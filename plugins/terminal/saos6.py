@@ -28,23 +28,118 @@ from ansible.utils.display import Display
 
 display = Display()
 
+# receive buffer tail searched for the prompt
+PROMPT_WINDOW = 512
+# bytes searched again before the end of the previous search of a buffer,
+# so an error message split over two reads is still found
+ERROR_OVERLAP = 64
+
+
+class TailMatcher(object):
+    """ One compiled alternation of several patterns that only searches the
+    end of the buffer it is given
+
+    network_cli searches every terminal regex against the receive buffer after
+    each read, and with libssh that buffer is the whole response so far.  The
+    prompt is always at the end of the buffer, so searching a bounded tail
+    keeps the cost of each read constant however large the response grows.
+    """
+
+    def __init__(self, patterns, window, flags=0):
+        self.patterns = list(patterns)
+        self.pattern = b"|".join(b"(?:%s)" % p for p in self.patterns)
+        self.window = window
+        self._regex = re.compile(self.pattern, flags)
+
+    def search(self, data, pos=0):
+        return self._regex.search(data, max(pos, len(data) - self.window))
+
+    def __getattr__(self, name):
+        return getattr(self._regex, name)
+
+
+class ScanMatcher(object):
+    """ One compiled alternation of several patterns that searches a growing
+    buffer only from where its previous search stopped
+
+    With libssh, network_cli searches the error patterns against the whole
+    response so far after each read.  An error message can be followed by
+    any amount of output, so rather than a fixed tail, the part appended
+    since the previous search is searched, from overlap bytes before it.
+    Any other buffer, such as the response to the next command or a
+    paramiko read window, is searched whole.
+    """
+
+    def __init__(self, patterns, overlap, connection=None, flags=0):
+        self.patterns = list(patterns)
+        self.pattern = b"|".join(b"(?:%s)" % p for p in self.patterns)
+        self.overlap = overlap
+        self._regex = re.compile(self.pattern, flags)
+        self._connection = connection
+        self._reads = None
+        self._scanned = 0
+        self._tail = b""
+
+    def _grown(self, data):
+        """Return True if data is the buffer searched last with more data
+        appended to it
+        """
+        end = self._scanned
+        start = end - len(self._tail)
+        grown = end < len(data) and data[start:end] == self._tail
+        connection = self._connection
+        if connection is not None:
+            # network_cli counts the reads of each command from 1, and only
+            # grows the buffer it searches with libssh
+            reads = getattr(connection, "_window_count", None)
+            grown = (
+                grown
+                and getattr(connection, "ssh_type", None) == "libssh"
+                and None not in (reads, self._reads)
+                and reads > self._reads
+            )
+            self._reads = reads
+        return grown
+
+    def search(self, data, pos=0):
+        start = 0
+        if self._grown(data):
+            start = max(self._scanned - self.overlap, 0)
+        self._scanned = len(data)
+        tail_start = max(len(data) - self.overlap, 0)
+        self._tail = bytes(data[tail_start:])
+        return self._regex.search(data, max(pos, start))
+
+    def __getattr__(self, name):
+        return getattr(self._regex, name)
+
 
 class TerminalModule(TerminalBase):
 
-    terminal_stdout_re = [
-        re.compile(br"[\w\+\-\.:\/\[\]]+(?:\([^\)]+\)){0,3}[*]?> "),
-        re.compile(br"\@[\w\-\.]+:\S+?[>#\$] ?$"),
-        re.compile(br" Enter Password\: "),
-        re.compile(br"Verify Password\: "),
+    terminal_prompt_patterns = [
+        br"[\w\+\-\.:\/\[\]]+(?:\([^\)]+\)){0,3}[*]?> ",
+        br"\@[\w\-\.]+:\S+?[>#\$] ?$",
+        br" Enter Password\: ",
+        br"Verify Password\: ",
     ]
 
-    terminal_stderr_re = [
-        re.compile(br"SHELL PARSER FAILURE"),
-        re.compile(br"ERROR\:"),
-    ]
+    terminal_error_patterns = [br"SHELL PARSER FAILURE", br"ERROR\:"]
+
+    terminal_stdout_re = [TailMatcher(terminal_prompt_patterns, PROMPT_WINDOW)]
+
+    terminal_stderr_re = [ScanMatcher(terminal_error_patterns, ERROR_OVERLAP)]
 
     terminal_initial_prompt_newline = False
 
+    def __init__(self, connection):
+        super(TerminalModule, self).__init__(connection)
+        # the scan offset belongs to the receive buffer of this connection
+        self.terminal_stderr_re = [
+            ScanMatcher(
+                self.terminal_error_patterns, ERROR_OVERLAP, connection
+            )
+        ]
+
     def on_open_shell(self):
         try:
             commands = [
@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+# Copyright 2020 Ciena Corp
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import socket
+
+import pytest
+
+from ansible.errors import AnsibleConnectionFailure
+from ansible_collections.ciena.saos6.plugins.cliconf.saos6 import Cliconf
+from ansible_collections.ciena.saos6.plugins.terminal.saos6 import (
+    TerminalModule,
+)
+
+PROMPT = b"5160*> "
+
+OUTPUTS = {
+    b"software show": b"Running Package: saos-06-18-00-0221",
+    b"port show port 1": b"| Port  | 1 |",
+}
+
+
+class Shell(object):
+    """ A SAOS shell echoing the commands sent to it and answering each one
+    followed by a prompt, returned by recv in chunks of chunk bytes
+
+    The commands in dropped are discarded as a CLI flushing its typeahead
+    would, without echo nor output.
+    """
+
+    def __init__(self, outputs, chunk=7, echo=True, dropped=()):
+        self.outputs = outputs
+        self.chunk = chunk
+        self.echo = echo
+        self.dropped = dropped
+        self.sent = []
+        self._pending = b""
+        self.closed = False
+
+    def sendall(self, data):
+        for command in data.split(b"\r")[:-1]:
+            self.sent.append(command)
+            if command in self.dropped:
+                continue
+            if self.echo:
+                self._pending += command + b"\r\n"
+            self._pending += self.outputs[command] + b"\r\n" + PROMPT
+
+    def recv(self, size):
+        if self.closed:
+            return b""
+        if not self._pending:
+            # the channel timeout expired without any output
+            raise socket.timeout()
+        chunk = self.chunk
+        data, self._pending = self._pending[:chunk], self._pending[chunk:]
+        return data
+
+
+class Connection(object):
+    """ Stands in for network_cli, opening its shell on _connect """
+
+    def __init__(self, shell):
+        self.connected = False
+        self.connects = 0
+        self._ssh_shell = None
+        self._new_shell = shell
+        self._terminal = TerminalModule(self)
+
+    def _connect(self):
+        self.connects += 1
+        self.connected = True
+        self._ssh_shell = self._new_shell
+
+    def close(self):
+        self.connected = False
+        self._ssh_shell = None
+
+    def get_option(self, option):
+        return {"persistent_command_timeout": 5}[option]
+
+    def _strip(self, data):
+        return data
+
+
+def test_send_pipelined_unconnected():
+    shell = Shell(OUTPUTS)
+    connection = Connection(shell)
+    cliconf = Cliconf(connection)
+    responses = cliconf._send_pipelined(["software show", "port show port 1"])
+    assert connection.connects == 1
+    assert responses == [
+        OUTPUTS[b"software show"],
+        OUTPUTS[b"port show port 1"],
+    ]
+
+
+def test_send_pipelined_after_close():
+    connection = Connection(Shell(OUTPUTS))
+    cliconf = Cliconf(connection)
+    cliconf._send_pipelined(["software show", "port show port 1"])
+    connection.close()
+    responses = cliconf._send_pipelined(["port show port 1", "software show"])
+    assert connection.connects == 2
+    assert responses == [
+        OUTPUTS[b"port show port 1"],
+        OUTPUTS[b"software show"],
+    ]
+
+
+@pytest.mark.parametrize("chunk", [1, 7, 4096])
+def test_send_pipelined_prompt_in_output(chunk):
+    outputs = dict(OUTPUTS)
+    # a line starting like a prompt, not followed by the next echo
+    outputs[b"software show"] = (
+        b"Last commands:\r\n"
+        + PROMPT
+        + b"configuration save\r\n"
+        + PROMPT
+        + b"\r\nRunning Package: saos-06-18-00-0221"
+    )
+    # prompt text in the middle of a line
+    outputs[b"port show port 1"] = b"| Prompt | %s|" % PROMPT
+    connection = Connection(Shell(outputs, chunk=chunk))
+    responses = Cliconf(connection)._send_pipelined(
+        ["software show", "port show port 1", "port show port 1"]
+    )
+    assert responses == [
+        outputs[b"software show"].replace(b"\r\n", b"\n"),
+        outputs[b"port show port 1"],
+        outputs[b"port show port 1"],
+    ]
+
+
+@pytest.mark.parametrize("chunk", [1, 7, 4096])
+def test_send_pipelined_missing_echo(chunk):
+    shell = Shell(OUTPUTS, chunk=chunk, dropped=[b"port show port 1"])
+    cliconf = Cliconf(Connection(shell))
+    with pytest.raises(AnsibleConnectionFailure) as exc:
+        cliconf._send_pipelined(["software show", "port show port 1"])
+    assert "echo of: port show port 1" in str(exc.value)
+
+
+def test_send_pipelined_without_echo():
+    # output not preceded by its echo is never split at a guess
+    shell = Shell(OUTPUTS, echo=False)
+    cliconf = Cliconf(Connection(shell))
+    with pytest.raises(AnsibleConnectionFailure) as exc:
+        cliconf._send_pipelined(["software show", "port show port 1"])
+    assert "echo of: port show port 1" in str(exc.value)
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+# Copyright 2020 Ciena Corp
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import os
+
+import pytest
+
+from ansible_collections.ciena.saos6.plugins.module_utils.network.saos6.facts.legacy.base import (
+    Interfaces,
+    Neighbors,
+)
+from ansible_collections.ciena.saos6.plugins.module_utils.network.saos6.utils.parsers import (
+    parse_lldp_neighbors,
+    parse_port_detail,
+    parse_port_statistics,
+    parse_port_status,
+    parse_tables,
+)
+from ansible_collections.ciena.saos6.plugins.module_utils.network.saos6.utils.utils import (
+    parse_cli_textfsm,
+)
+
+pytest.importorskip("textfsm")
+
+FIXTURE_PATH = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURE_PATH, name)) as fh:
+        return fh.read()
+
+
+def test_port_detail_matches_template():
+    data = load_fixture("saos6_port_show_port")
+    parsed = parse_port_detail(data)
+    assert parsed == parse_cli_textfsm(data, Interfaces.TEMPLATE)
+    assert [port["port"] for port in parsed] == ["1", "10"]
+    assert parsed[1]["LinkStateAdmin"] == "Disabled"
+    assert parsed[1]["LinkStateOper"] == "Down"
+    assert parsed[0]["untagged_data_vs"] == ""
+    assert parsed[1]["untagged_data_vs"] == "vs-customer-a"
+
+
+def test_lldp_neighbors_match_template():
+    data = load_fixture("saos6_lldp_show_neighbors")
+    parsed = parse_lldp_neighbors(data)
+    assert parsed == parse_cli_textfsm(data, Neighbors.TEMPLATE)
+    assert [n["localPort"] for n in parsed] == ["1", "2", "10"]
+    assert parsed[1]["mgmtAddr"] == ""
+    assert parsed[1]["remotePort"] == "ge-0/0/4"
+
+
+def test_port_status_matches_template():
+    data = load_fixture("saos6_port_show_status")
+    expected = parse_cli_textfsm(
+        data, load_fixture("saos6_port_show_status.textfsm")
+    )
+    for record in expected:
+        record["duplex"] = {"FD": "Full", "HD": "Half"}[record["duplex"]]
+    parsed = parse_port_status(data)
+    assert parsed == expected
+    assert [port["port"] for port in parsed] == ["1", "2", "3", "9", "10"]
+    assert parsed[0]["description"] == "uplink core"
+    assert parsed[2]["speed"] == "100"
+    assert parsed[2]["duplex"] == "Half"
+
+
+def test_columnar_table_matches_template():
+    data = load_fixture("saos6_virtual_switch_show")
+    expected = parse_cli_textfsm(
+        data, load_fixture("saos6_virtual_switch_show.textfsm")
+    )
+    (table,) = parse_tables(data)
+    assert table["title"] == "VIRTUAL SWITCH TABLE"
+    rows = table["rows"]
+    # the template only reads the first line of a continued row
+    assert rows[0]["description"] == "customer a\neast region"
+    rows[0]["description"] = "customer a"
+    assert rows == expected
+    assert len(rows) == 3
+
+
+@pytest.mark.parametrize(
+    "fixture, title",
+    [
+        ("saos6_chassis_show_device_id", "Chassis Device ID"),
+        ("saos6_software_show", None),
+    ],
+)
+def test_key_value_table_matches_template(fixture, title):
+    data = load_fixture(fixture)
+    expected = parse_cli_textfsm(data, load_fixture(fixture + ".textfsm"))
+    (table,) = parse_tables(data)
+    assert table["title"] == title
+    assert table["values"] == dict(
+        (record["key"], record["value"]) for record in expected
+    )
+    assert len(table["values"]) == len(expected) > 1
+
+
+def test_port_statistics_match_template():
+    data = load_fixture("saos6_port_show_statistics")
+    records = parse_cli_textfsm(
+        data, load_fixture("saos6_port_show_statistics.textfsm")
+    )
+    counter_names = {
+        "RX": ("rx_bytes", "rx_pkts", "rx_crc_errors"),
+        "TX": ("tx_bytes", "tx_pkts", "tx_drops"),
+    }
+    ports = []
+    for record in records:
+        if record["port"] not in ports:
+            ports.append(record["port"])
+    expected = dict(
+        (name, [None] * len(ports))
+        for names in counter_names.values()
+        for name in names
+    )
+    for record in records:
+        pos = ports.index(record["port"])
+        names = counter_names[record["direction"]]
+        values = (record["bytes"], record["pkts"], record["third"])
+        for name, value in zip(names, values):
+            expected[name][pos] = int(value.replace(",", ""))
+
+    assert parse_port_statistics(data) == (ports, expected)
+    assert ports == ["1", "2", "10", "11"]
+    assert expected["rx_bytes"][0] == 1234567890
+    assert expected["tx_bytes"][1] is None
+    assert expected["rx_pkts"][3] is None
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+# Copyright 2020 Ciena Corp
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import pytest
+
+from ansible_collections.ciena.saos6.plugins.module_utils.network.saos6.saos6 import (
+    get_config,
+    get_config_cache_stats,
+    get_parsed_config,
+    get_profile,
+    enable_profile,
+    invalidate_config_cache,
+    load_config,
+)
+
+CONFIG = "vlan create vlan 100\nport set port 1 mtu 9216\n"
+
+
+class Connection(object):
+    """ Stands in for the cliconf connection, counting the config reads """
+
+    def __init__(self):
+        self.reads = 0
+        self.edits = []
+
+    def get_config(self, flags=None, format=None):
+        self.reads += 1
+        return CONFIG
+
+    def edit_config(self, candidate=None, commit=False, comment=None):
+        self.edits.append(candidate)
+        return {"diff": None}
+
+
+class Module(object):
+    def __init__(self, socket_path):
+        self._socket_path = socket_path
+        self._saos6_connection = Connection()
+
+
+@pytest.fixture
+def stats():
+    """Return a function giving the counters changed since the test began"""
+    invalidate_config_cache()
+    start = get_config_cache_stats()
+
+    def delta():
+        current = get_config_cache_stats()
+        return dict(
+            (key, current[key] - start[key]) for key in start if key != "size"
+        )
+
+    yield delta
+    invalidate_config_cache()
+
+
+def test_config_cache_hit_and_miss(stats):
+    module = Module("/tmp/one")
+    assert get_config(module) == CONFIG.strip()
+    assert get_config(module) == CONFIG.strip()
+    get_parsed_config(module)
+    get_parsed_config(module)
+    assert module._saos6_connection.reads == 1
+    assert stats() == {"hits": 3, "misses": 1, "parses": 1, "invalidations": 0}
+    assert get_config_cache_stats()["size"] == 1
+
+
+def test_config_cache_keyed_per_connection(stats):
+    one, two = Module("/tmp/one"), Module("/tmp/two")
+    get_config(one)
+    get_config(two)
+    get_config(one, flags=["more"])
+    assert stats()["misses"] == 3
+    assert get_config_cache_stats()["size"] == 3
+
+
+def test_load_config_invalidates(stats):
+    module, other = Module("/tmp/one"), Module("/tmp/two")
+    get_config(module)
+    get_config(other)
+    load_config(module, ["vlan create vlan 200"])
+    assert module._saos6_connection.edits == [["vlan create vlan 200"]]
+    get_config(module)
+    get_config(other)
+    assert module._saos6_connection.reads == 2
+    assert other._saos6_connection.reads == 1
+    assert stats() == {"hits": 1, "misses": 3, "parses": 0, "invalidations": 1}
+
+
+def test_invalidate_every_connection(stats):
+    module = Module("/tmp/one")
+    get_config(module)
+    invalidate_config_cache()
+    assert get_config_cache_stats()["size"] == 0
+    get_config(module)
+    assert module._saos6_connection.reads == 2
+    assert stats()["invalidations"] == 1
+
+
+def test_profile_reports_config_cache(stats):
+    module = Module("/tmp/one")
+    enable_profile(module)
+    get_config(module)
+    get_config(module)
+    profile = get_profile(module)
+    assert profile["commands"][0]["command"] == "get_config"
+    assert profile["config_cache"] == get_config_cache_stats()
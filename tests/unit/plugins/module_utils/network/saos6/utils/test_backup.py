@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+# Copyright 2020 Ciena Corp
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import os
+
+import pytest
+
+from ansible_collections.ciena.saos6.plugins.module_utils.network.saos6.utils.backup import (
+    MAX_DELTA_CHAIN,
+    BackupStore,
+    apply_delta,
+    line_delta,
+)
+
+BASE = ["line %d" % i for i in range(10)]
+
+
+def config(count, changed=()):
+    lines = ["vlan create vlan %d" % i for i in range(1, count + 1)]
+    for idx in changed:
+        lines[idx] = "port set port %d mtu 9216" % idx
+    return "\n".join(lines) + "\n"
+
+
+def stored_objects(store):
+    found = []
+    for root, _, files in os.walk(os.path.join(store.path, "objects")):
+        found.extend(os.path.join(root, name) for name in files)
+    return found
+
+
+@pytest.mark.parametrize(
+    "new",
+    [
+        BASE,
+        ["first"] + BASE,
+        BASE + ["last"],
+        BASE[:5] + ["middle", "lines"] + BASE[5:],
+        BASE[1:],
+        BASE[:-1],
+        BASE[:3] + BASE[6:],
+        BASE[:4] + ["replaced"] + BASE[5:],
+        ["a"] + BASE[2:7] + ["b", "c"] + BASE[8:],
+        [],
+    ],
+)
+def test_line_delta_round_trip(new):
+    delta = line_delta(BASE, new)
+    assert apply_delta(BASE, delta) == new
+    assert line_delta([], new) == ([[0, 0, new]] if new else [])
+
+
+def test_line_delta_only_changes():
+    assert line_delta(BASE, BASE) == []
+    assert line_delta(BASE, BASE[:4] + ["x"] + BASE[5:]) == [[4, 5, ["x"]]]
+
+
+def test_backup_store_delta_chain(tmp_path):
+    store = BackupStore(str(tmp_path))
+    saved = []
+    for idx in range(MAX_DELTA_CHAIN + 4):
+        data = config(200, changed=range(idx))
+        version = store.save("switch1", data)
+        assert version["stored"]
+        saved.append((version["sha256"], data))
+
+    for digest, data in saved:
+        assert store.read(digest) == data
+        assert store._depth(digest) <= MAX_DELTA_CHAIN
+
+    full = [
+        digest for digest, _ in saved if os.path.exists(store._object(digest))
+    ]
+    assert full == [saved[0][0], saved[MAX_DELTA_CHAIN + 1][0]]
+    assert [v["sha256"] for v in store.versions("switch1")] == [
+        digest for digest, _ in saved
+    ]
+
+
+def test_backup_store_large_delta_stored_in_full(tmp_path):
+    store = BackupStore(str(tmp_path))
+    store.save("switch1", config(200))
+    other = "\n".join("port set port %d mtu 1500" % i for i in range(200))
+    digest = store.save("switch1", other)["sha256"]
+    assert os.path.exists(store._object(digest))
+    assert not os.path.exists(store._object(digest, delta=True))
+    assert store.read_lines(digest) == other.splitlines()
+
+
+def test_backup_store_unchanged_config(tmp_path):
+    store = BackupStore(str(tmp_path))
+    first = store.save("switch1", config(20))
+    second = store.save("switch1", "! comment\n" + config(20))
+    assert first["stored"]
+    assert not second["stored"]
+    assert second["sha256"] == first["sha256"]
+    assert len(store.versions("switch1")) == 1
+
+
+def test_backup_store_dedup_across_hosts(tmp_path):
+    store = BackupStore(str(tmp_path))
+    one = store.save("switch1", config(50))
+    two = store.save("switch2", config(50))
+    assert one["sha256"] == two["sha256"]
+    assert two["stored"]
+    assert len(stored_objects(store)) == 1
+    assert store.versions("switch2")[0]["sha256"] == one["sha256"]
+    assert store.read(two["sha256"]) == config(50)
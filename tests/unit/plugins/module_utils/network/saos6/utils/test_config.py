@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+# Copyright 2020 Ciena Corp
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import pytest
+
+from ansible_collections.ciena.saos6.plugins.module_utils.network.saos6.utils.config import (
+    MAX_ID_LIST_LENGTH,
+    collapse_commands,
+    diff_config,
+    expand_id_list,
+    format_id_lists,
+)
+
+
+@pytest.mark.parametrize(
+    "commands, expected",
+    [
+        # all creates, then all adds
+        (
+            ["vlan create vlan %d" % i for i in range(100, 104)]
+            + ["vlan add vlan %d port 7" % i for i in range(100, 104)],
+            ["vlan create vlan 100-103", "vlan add vlan 100-103 port 7"],
+        ),
+        # interleaved create and add of each vlan keep their order
+        (
+            [
+                "vlan create vlan 100",
+                "vlan add vlan 100 port 7",
+                "vlan create vlan 101",
+                "vlan add vlan 101 port 7",
+            ],
+            ["vlan create vlan 100-101", "vlan add vlan 100-101 port 7"],
+        ),
+        # a vlan is never created after it is added to a port
+        (
+            [
+                "vlan add vlan 5 port 1",
+                "vlan create vlan 5",
+                "vlan add vlan 6 port 1",
+            ],
+            ["vlan add vlan 5-6 port 1", "vlan create vlan 5"],
+        ),
+        # a create does not move ahead of a delete of the same vlan
+        (
+            [
+                "vlan create vlan 10",
+                "vlan delete vlan 11",
+                "vlan create vlan 11",
+            ],
+            [
+                "vlan create vlan 10",
+                "vlan delete vlan 11",
+                "vlan create vlan 11",
+            ],
+        ),
+    ],
+)
+def test_collapse_commands_ordering(commands, expected):
+    assert collapse_commands(commands) == expected
+
+
+def test_collapse_commands_not_crossing_commands_without_ids():
+    commands = [
+        "vlan create vlan 10",
+        "configuration save",
+        "vlan create vlan 11",
+    ]
+    assert collapse_commands(commands) == commands
+
+
+@pytest.mark.parametrize(
+    "commands",
+    [
+        ['vlan create vlan 10 name "a"', 'vlan create vlan 11 name "b"'],
+        ["vlan create vlan 10", "vlan create vlan 11 name x"],
+    ],
+)
+def test_collapse_commands_named_objects(commands):
+    assert collapse_commands(commands) == commands
+
+
+def test_collapse_commands_other_options():
+    commands = ["port set port %d mtu 9216" % i for i in range(1, 5)]
+    commands.append("port set port 5 mtu 1500")
+    assert collapse_commands(commands) == [
+        "port set port 1-4 mtu 9216",
+        "port set port 5 mtu 1500",
+    ]
+
+
+def test_collapse_commands_splits_long_lists():
+    vlans = list(range(1, 400, 2))
+    collapsed = collapse_commands(["vlan create vlan %d" % i for i in vlans])
+    assert len(collapsed) > 1
+    ids = []
+    for command in collapsed:
+        id_list = command.split()[-1]
+        assert command == "vlan create vlan %s" % id_list
+        assert len(id_list) <= MAX_ID_LIST_LENGTH
+        ids.extend(int(ident) for ident in expand_id_list(id_list))
+    assert ids == vlans
+
+
+def test_format_id_lists():
+    assert format_id_lists(["3", "1", "2", "5", "7", "8"]) == ["1-3,5,7-8"]
+    assert format_id_lists([1, 3, 5, 7], limit=3) == ["1,3", "5,7"]
+    assert format_id_lists(range(1, 4095)) == ["1-4094"]
+
+
+@pytest.mark.parametrize(
+    "candidate, running, expected",
+    [
+        (
+            "vlan create vlan 1-3",
+            "vlan create vlan 1\nvlan create vlan 2\nvlan create vlan 3",
+            [],
+        ),
+        (
+            "vlan create vlan 3\nvlan create vlan 4",
+            "vlan create vlan 1-3",
+            ["vlan create vlan 4"],
+        ),
+        (
+            "vlan create vlan 1-3\nvlan create vlan 5",
+            "vlan create vlan 1-2",
+            ["vlan create vlan 1-3", "vlan create vlan 5"],
+        ),
+        (
+            "vlan create vlan 1-2\n! comment\nvlan create vlan 1",
+            "vlan create vlan 1\nvlan create vlan 2",
+            [],
+        ),
+        (
+            ["vlan  create vlan 7", "vlan create vlan 7"],
+            "",
+            ["vlan create vlan 7"],
+        ),
+    ],
+)
+def test_diff_config_id_ranges(candidate, running, expected):
+    assert diff_config(candidate, running) == expected
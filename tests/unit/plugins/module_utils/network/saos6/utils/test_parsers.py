@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+# Copyright 2020 Ciena Corp
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import pytest
+
+from ansible_collections.ciena.saos6.plugins.module_utils.network.saos6.utils.config import (
+    parse_config,
+)
+from ansible_collections.ciena.saos6.plugins.module_utils.network.saos6.utils.parsers import (
+    iter_lines,
+    parse_port_status,
+)
+from ansible_collections.ciena.saos6.plugins.module_utils.network.saos6.utils.spool import (
+    spool_options,
+    spool_text,
+)
+
+STATUS = """
++----------------------------------------------------------------------------+
+|      |        | Link  |  Link    |Link Spd |Link Flow|     |              |
+| Port | Port   | Admin |  Oper    |Duplex   |Ctrl     |Auto |              |
+| Name | Type   | State |  State   |         |         |Neg  |Mode          |
++------+--------+-------+----------+---------+---------+-----+--------------+
+%s+------+--------+-------+----------+---------+---------+-----+--------------+
+"""
+STATUS_ROW = "| %-4d | 10/100/G| Enabled | Up     |1000/FD  |Off      |On   |Normal        |\n"
+
+
+@pytest.mark.parametrize(
+    "text", ["", "a", "a\n", "a\r\nb\r\n", "a\n\nb", "\n\n", "one\ntwo\nthree"]
+)
+def test_iter_lines_matches_splitlines(text):
+    assert list(iter_lines(text)) == text.splitlines()
+    assert list(iter_lines(text.splitlines(True))) == text.splitlines()
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64, 4096])
+def test_iter_lines_spooled(tmp_path, chunk_size):
+    text = STATUS % "".join(STATUS_ROW % port for port in range(1, 40))
+    record = spool_text(
+        text, spool_options({"path": str(tmp_path), "chunk_size": chunk_size})
+    )
+    assert list(iter_lines(record)) == text.splitlines()
+    assert parse_port_status(record) == parse_port_status(text)
+    assert len(parse_port_status(record)) == 39
+
+
+def test_parse_config_spooled(tmp_path):
+    text = "! VLAN CONFIG:\n%s" % "".join(
+        "vlan create vlan %d\n" % vlan for vlan in range(1, 300)
+    )
+    record = spool_text(
+        text, spool_options({"path": str(tmp_path), "chunk_size": 100})
+    )
+    assert parse_config(record).to_dict() == parse_config(text).to_dict()
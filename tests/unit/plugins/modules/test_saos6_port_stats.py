@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+# Copyright 2020 Ciena Corp
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import pytest
+
+from ansible_collections.ciena.saos6.plugins.modules.saos6_port_stats import (
+    compute_deltas,
+    compute_rates,
+    counter_delta,
+)
+
+
+@pytest.mark.parametrize(
+    "current, previous, bits, expected",
+    [
+        (150, 100, 64, 50),
+        (100, 100, 64, 0),
+        # wrapped
+        (5, 2 ** 32 - 10, 32, 15),
+        (5, 2 ** 64 - 10, 64, 15),
+        # cleared
+        (10, 1000, 32, 10),
+        (10, 1000000, 64, 10),
+        (0, 2 ** 40, 64, 0),
+        # no sample
+        (None, 100, 64, None),
+        (100, None, 64, None),
+    ],
+)
+def test_counter_delta(current, previous, bits, expected):
+    assert counter_delta(current, previous, 2 ** bits) == expected
+
+
+def test_compute_deltas():
+    previous = {
+        "ports": ["1", "2"],
+        "counters": {"RxBytes": [100, 2 ** 32 - 1], "TxBytes": [7, 7]},
+    }
+    counters = {"RxBytes": [300, 4, 9], "RxPkts": [1, 2, 3]}
+    assert compute_deltas(["1", "2", "3"], counters, previous, 32) == {
+        "RxBytes": [200, 5, None]
+    }
+
+
+def test_compute_rates():
+    deltas = {"RxBytes": [200, 5, None]}
+    assert compute_rates(deltas, 4) == {"RxBytes": [50.0, 1.25, None]}
+    assert compute_rates(deltas, 0.3) == {"RxBytes": [666.667, 16.667, None]}
+
+
+@pytest.mark.parametrize("interval", [0, 0.0, -1.5])
+def test_compute_rates_without_interval(interval):
+    assert compute_rates({"RxBytes": [200]}, interval) is None
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+# Copyright 2020 Ciena Corp
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from ansible_collections.ciena.saos6.plugins.terminal.saos6 import (
+    TerminalModule,
+)
+
+ERROR = b'SHELL PARSER FAILURE: "port show prot" - invalid input\r\n'
+OUTPUT = b"| 1        | Up    | 10G/FD  |\r\n" * 2000
+PROMPT = b"5160*> "
+
+
+class Connection(object):
+    def __init__(self, ssh_type):
+        self.ssh_type = ssh_type
+        self._window_count = 0
+
+
+def receive_libssh(terminal, connection, data, chunk=4096):
+    """Search the whole response so far after each read, as network_cli
+    does with libssh, and return whether an error was found
+    """
+    connection._window_count = 0
+    errored = False
+    resp = b""
+    for start in range(0, len(data), chunk):
+        end = start + chunk
+        resp += data[start:end]
+        connection._window_count += 1
+        for regex in terminal.terminal_stderr_re:
+            if regex.search(resp):
+                errored = True
+    return errored
+
+
+def receive_paramiko(terminal, connection, data, chunk=256):
+    """Search the last 256 bytes received after each read, as network_cli
+    does with paramiko, and return whether an error was found
+    """
+    connection._window_count = 0
+    errored = False
+    for start in range(0, len(data), chunk):
+        end = start + chunk
+        window = max(end - 256, 0)
+        connection._window_count += 1
+        for regex in terminal.terminal_stderr_re:
+            if regex.search(data[window:end]):
+                errored = True
+    return errored
+
+
+def test_error_followed_by_long_output():
+    connection = Connection("libssh")
+    terminal = TerminalModule(connection)
+    data = b"port show prot\r\n" + ERROR + OUTPUT + PROMPT
+    assert len(data) - data.index(ERROR) > 8192
+    assert receive_libssh(terminal, connection, data)
+    assert receive_libssh(terminal, connection, data, chunk=len(data) - 1)
+    assert receive_libssh(terminal, connection, OUTPUT + ERROR + PROMPT)
+    assert not receive_libssh(terminal, connection, OUTPUT + PROMPT)
+
+
+def test_error_split_over_reads():
+    connection = Connection("libssh")
+    terminal = TerminalModule(connection)
+    data = OUTPUT[:4090] + ERROR + OUTPUT + PROMPT
+    assert receive_libssh(terminal, connection, data)
+
+
+def test_grown_buffer_searched_from_last_offset():
+    connection = Connection("libssh")
+    terminal = TerminalModule(connection)
+    (regex,) = terminal.terminal_stderr_re
+    connection._window_count = 1
+    assert regex.search(ERROR + OUTPUT)
+    connection._window_count = 2
+    assert not regex.search(ERROR + OUTPUT + OUTPUT)
+    connection._window_count = 3
+    assert regex.search(ERROR + OUTPUT + OUTPUT + ERROR)
+
+
+def test_repeated_response():
+    connection = Connection("libssh")
+    terminal = TerminalModule(connection)
+    data = ERROR + OUTPUT[:100] + PROMPT
+    assert receive_libssh(terminal, connection, data)
+    assert receive_libssh(terminal, connection, data)
+
+
+def test_paramiko_windows():
+    connection = Connection("paramiko")
+    terminal = TerminalModule(connection)
+    assert receive_paramiko(terminal, connection, OUTPUT + ERROR + PROMPT)
+    assert not receive_paramiko(terminal, connection, OUTPUT + PROMPT)
+
+
+def test_separate_responses():
+    terminal = TerminalModule(Connection("libssh"))
+    (regex,) = terminal.terminal_stderr_re
+    assert regex.search(ERROR + OUTPUT)
+    assert not regex.search(OUTPUT[:8000] + PROMPT)
+    assert regex.search(ERROR + OUTPUT)
@@ -0,0 +1,247 @@
+# Copyright 2020 Ciena Corp
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+"""
+Shared helpers for the benchmark scripts: making the collection importable
+and generating synthetic SAOS 6 show command output.
+"""
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import os
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+
+def collections_root():
+    """Return the directory holding the ansible_collections directory this
+    checkout lives in, or None when it is not in such a layout
+    """
+    parts = ROOT.split(os.sep)
+    if parts[-3:-2] != ["ansible_collections"]:
+        return None
+    return os.sep.join(parts[:-3]) or os.sep
+
+
+def setup_collection_path():
+    """Make ansible_collections.ciena.saos6 importable from this checkout
+
+    The checkout has to live in an .../ansible_collections/ciena/saos6
+    directory, or the collection has to be installed.
+    """
+    try:
+        import ansible_collections.ciena.saos6  # noqa: F401
+
+        return
+    except ImportError:
+        pass
+    root = collections_root()
+    if root is None:
+        sys.exit(
+            "%s is not in an ansible_collections/ciena/saos6 directory and "
+            "ciena.saos6 is not installed" % ROOT
+        )
+    sys.path.insert(0, root)
+
+
+def timed(func, *args, **kwargs):
+    """Run func once and return (result, elapsed seconds)"""
+    start = time.time()
+    result = func(*args, **kwargs)
+    return result, time.time() - start
+
+
+def port_ids(count):
+    return [str(port) for port in range(1, count + 1)]
+
+
+def link_oper(port):
+    """Oper state of a synthetic port, every third port is down"""
+    return "Up" if int(port) % 3 else "Down"
+
+
+def port_show_status(count):
+    lines = [
+        "+----------------------------------------------------------------------------+",
+        "|         |      | Link | Link  |    Link    | Link |Auto|      |           |",
+        "|Port     |Port  |Admin |Oper   |   Speed/   | Flow |Neg |Mode  |   Port    |",
+        "|Name     |Type  |State |State  |   Duplex   | Ctrl |    |      |   Desc    |",
+        "+---------+------+------+-------+------------+------+----+------+-----------+",
+    ]
+    for port in port_ids(count):
+        oper = link_oper(port)
+        lines.append(
+            "|%-9s|10/100/G|Ena   |%-7s|  1000/FD   | Off  |On  |Normal|           |"
+            % (port, oper)
+        )
+    lines.append(lines[0])
+    return "\n".join(lines)
+
+
+def port_show_port(port):
+    rows = [
+        ("MAC Address", "00:02:a1:30:0b:%02x" % (int(port) % 256)),
+        ("Link State", "Enabled    | %s" % link_oper(port)),
+        ("Mode", "1000/FD"),
+        ("Speed", "1000"),
+        ("Duplex", "Full"),
+        ("Flow Control", "Off"),
+        ("Auto Negotiation", "On"),
+        ("PVID", "1"),
+        ("Untag Ingress Data Vid", "1"),
+        ("Fixed Resolved CoS", "0"),
+        ("Fixed Resolved Color", "green"),
+        ("Acceptable Frame Type", "all"),
+        ("Egress Untag VLAN", "1"),
+        ("Max Frame Size", "9216"),
+        ("Untagged Data VS", ""),
+        ("Untagged Ctrl VS", ""),
+        ("Resolved CoS Policy", "dot1d-tag1-cos"),
+        ("Ingress to Egress QMap", "Default-RCOS"),
+        ("Ingress FCOS->RCOS Map", "DefaultFCOS-RCOS"),
+        ("Egress RCOS->FCOS Map", "DefaultRCOS-FCOS"),
+    ]
+    border = "+--------------------------------+----------------------------------------------+"
+    lines = [
+        border,
+        "|%s|" % ("PORT %s INFO" % port).center(79),
+        border,
+        "| %-30s | %-44s |" % ("Parameter", "Value"),
+        border,
+    ]
+    for label, value in rows:
+        lines.append("| %-30s | %-44s |" % (label, value))
+    lines.append(border)
+    return "\n".join(lines)
+
+
+PORT_STATISTICS_COUNTERS = (
+    ("Rx Bytes", 1500),
+    ("Rx Pkts", 1),
+    ("Rx CRC Errors", 0),
+    ("Tx Bytes", 1200),
+    ("Tx Pkts", 1),
+)
+
+
+def port_show_statistics(count, elapsed=None):
+    """Counters of every port after elapsed seconds of traffic, by default
+    the time since the epoch so that successive samples increase
+    """
+    if elapsed is None:
+        elapsed = time.time()
+    border = "+--------+" + "+".join(["-" * 20] * 5) + "+"
+    lines = [
+        "+%s+" % ("-" * (len(border) - 2)),
+        "|%s|" % "PORT STATISTICS".center(len(border) - 2),
+        border,
+        "|%-8s|" % "Port"
+        + "|".join(" %-19s" % name for name, _ in PORT_STATISTICS_COUNTERS)
+        + "|",
+        border,
+    ]
+    for port in port_ids(count):
+        # a down port stopped counting at half the elapsed time
+        ticks = int(elapsed * (1 if link_oper(port) == "Up" else 0.5))
+        lines.append(
+            "|%-8s|" % port
+            + "|".join(
+                " %19d" % (ticks * rate * int(port))
+                for _, rate in PORT_STATISTICS_COUNTERS
+            )
+            + "|"
+        )
+    lines.append(border)
+    return "\n".join(lines)
+
+
+def lldp_show_neighbors(count):
+    border = "+----------+---------------------------------------------------------------+"
+    lines = [
+        border,
+        "|                    LLDP Remote Table                                        |",
+        border,
+        "|Local     |Remote                                                         |",
+        "|Port      |Port     |Info                                                 |",
+        border,
+    ]
+    for port in port_ids(count):
+        lines.extend(
+            [
+                "|%-10s|%-9s|Chassis Id: 00:02:a1:31:%02x:00                    |"
+                % (port, port, int(port) % 256),
+                "|          |         |Mgmt Addr: 10.0.%d.%d                        |"
+                % (int(port) // 256, int(port) % 256),
+                "|          |         |System Name: switch-%s                      |"
+                % port,
+                "|          |         |System Desc: SAOS 6-20 Ciena 5160  |",
+                border,
+            ]
+        )
+    return "\n".join(lines)
+
+
+def chassis_show_device_id():
+    return "\n".join(
+        [
+            "+------------------------------------------------------+",
+            "|                  Chassis Device ID                   |",
+            "+----------------------+-------------------------------+",
+            "| Serial Number        | M8765432                      |",
+            "| Model Part Number    | 170-5160-900                  |",
+            "+----------------------+-------------------------------+",
+        ]
+    )
+
+
+def software_show():
+    return "\n".join(
+        [
+            "+------------------------------------------------------+",
+            "| Installed Package   : saos-06-20-00-0100              |",
+            "| Running Package     : saos-06-20-00-0100,             |",
+            "+------------------------------------------------------+",
+        ]
+    )
+
+
+def chassis_show_capabilities():
+    return "\n".join(
+        [
+            "+---------------------------+---------------------------+",
+            "| Platform Name             | 5160                      |",
+            "+---------------------------+---------------------------+",
+        ]
+    )
+
+
+def lldp_show_configuration():
+    return "\n".join(
+        [
+            "+---------------------------+---------------------------+",
+            "| Admin Status              | Enable                    |",
+            "+---------------------------+---------------------------+",
+        ]
+    )
+
+
+def configuration_show_brief(count):
+    lines = ["! VLAN CONFIG:"]
+    lines.extend("vlan create vlan %d" % (100 + port) for port in range(count))
+    lines.append("! PORT CONFIG:")
+    for port in port_ids(count):
+        lines.append(
+            'port set port %s description "port %s" max-frame-size 9216'
+            % (port, port)
+        )
+    lines.append("! VIRTUAL-SWITCH CONFIG:")
+    for port in port_ids(count):
+        lines.append("virtual-switch ethernet create vs vs%s" % port)
+        lines.append(
+            "virtual-switch ethernet add vs vs%s port %s vlan %d"
+            % (port, port, 99 + int(port))
+        )
+    return "\n".join(lines)
@@ -0,0 +1,204 @@
+#!/usr/bin/env python
+# Copyright 2020 Ciena Corp
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+"""
+End to end latency benchmark against the SAOS 6 simulator
+
+Runs saos6_facts and saos6_command with ansible-playbook over network_cli,
+so through the saos6 cliconf and terminal plugins, against a simulated
+device for every combination of port count and network round trip time,
+and reports the wall time, the commands the device received and the bytes
+it sent.  --latency adds device time to every command.
+
+Commands and bytes do not depend on the machine running the benchmark, so
+they can be compared exactly with a baseline; wall times are compared with
+a tolerance.
+
+    python tools/benchmark/e2e.py --ports 48 --ports 512 --rtt 0 --rtt 0.05
+    python tools/benchmark/e2e.py --output after.json --baseline before.json
+
+Needs ansible-playbook, ansible.netcommon and paramiko.
+"""
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+
+from common import collections_root
+from simulator import Responder, Simulator
+
+SCENARIOS = {
+    "facts": {"ciena.saos6.saos6_facts": {"gather_subset": ["all"]}},
+    "command": {
+        "ciena.saos6.saos6_command": {
+            "commands": [
+                "port show status",
+                "lldp show neighbors",
+                "software show",
+            ]
+        }
+    },
+}
+
+INVENTORY = """[simulator]
+saos6 ansible_host=127.0.0.1 ansible_port={port}
+
+[simulator:vars]
+ansible_connection=ansible.netcommon.network_cli
+ansible_network_os=ciena.saos6.saos6
+ansible_network_cli_ssh_type=paramiko
+ansible_user=bench
+ansible_password=bench
+"""
+
+
+def playbook(scenario):
+    return json.dumps(
+        [
+            {
+                "hosts": "simulator",
+                "gather_facts": False,
+                "tasks": [SCENARIOS[scenario]],
+            }
+        ]
+    )
+
+
+def run_scenario(simulator, scenario, workdir):
+    with open(os.path.join(workdir, "inventory"), "w") as fh:
+        fh.write(INVENTORY.format(port=simulator.port))
+    with open(os.path.join(workdir, "playbook.json"), "w") as fh:
+        fh.write(playbook(scenario))
+
+    env = os.environ.copy()
+    env.update(
+        {
+            "ANSIBLE_HOST_KEY_CHECKING": "False",
+            "ANSIBLE_PERSISTENT_CONTROL_PATH_DIR": os.path.join(workdir, "pc"),
+            "ANSIBLE_RETRY_FILES_ENABLED": "False",
+        }
+    )
+    root = collections_root()
+    if root is not None:
+        env["ANSIBLE_COLLECTIONS_PATH"] = root
+
+    simulator.stats.reset()
+    start = time.time()
+    process = subprocess.Popen(
+        ["ansible-playbook", "-i", "inventory", "playbook.json"],
+        cwd=workdir,
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+    )
+    output = process.communicate()[0]
+    elapsed = time.time() - start
+    if process.returncode:
+        raise SystemExit(output.decode("utf-8", "replace"))
+
+    stats = simulator.stats.to_dict()
+    stats["wall_time"] = round(elapsed, 3)
+    return stats
+
+
+def compare(results, baseline, tolerance):
+    """Return the regressions of results against baseline"""
+    failures = []
+    for key, result in sorted(results.items()):
+        before = baseline.get(key)
+        if before is None:
+            continue
+        for counter in ("commands", "bytes_sent"):
+            if result[counter] > before[counter]:
+                failures.append(
+                    "%s: %s went from %d to %d"
+                    % (key, counter, before[counter], result[counter])
+                )
+        if result["wall_time"] > before["wall_time"] * (1 + tolerance):
+            failures.append(
+                "%s: wall time went from %.3f s to %.3f s"
+                % (key, before["wall_time"], result["wall_time"])
+            )
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument("--ports", type=int, action="append")
+    parser.add_argument(
+        "--rtt", type=float, action="append", help="network round trip seconds"
+    )
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.0,
+        help="seconds of device time per command",
+    )
+    parser.add_argument(
+        "--scenario", action="append", choices=sorted(SCENARIOS)
+    )
+    parser.add_argument("--output", metavar="JSON")
+    parser.add_argument("--baseline", metavar="JSON")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="allowed relative wall time increase over the baseline",
+    )
+    args = parser.parse_args()
+
+    results = {}
+    print(
+        "%-8s %6s %7s %9s %9s %12s"
+        % ("scenario", "ports", "rtt", "wall s", "commands", "bytes")
+    )
+    for ports in args.ports or [48]:
+        for rtt in args.rtt or [0.0, 0.05]:
+            simulator = Simulator(
+                Responder(ports), rtt=rtt, latency=args.latency
+            ).start()
+            workdir = tempfile.mkdtemp(prefix="saos6-bench-")
+            try:
+                for scenario in args.scenario or sorted(SCENARIOS):
+                    stats = run_scenario(simulator, scenario, workdir)
+                    key = "%s/ports=%d/rtt=%g" % (scenario, ports, rtt)
+                    if args.latency:
+                        key += "/latency=%g" % args.latency
+                    results[key] = stats
+                    print(
+                        "%-8s %6d %7.3f %9.3f %9d %12d"
+                        % (
+                            scenario,
+                            ports,
+                            rtt,
+                            stats["wall_time"],
+                            stats["commands"],
+                            stats["bytes_sent"],
+                        )
+                    )
+            finally:
+                simulator.stop()
+                shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.output:
+        with open(args.output, "w") as fh:
+            json.dump(results, fh, indent=2, sort_keys=True)
+    if args.baseline:
+        with open(args.baseline) as fh:
+            failures = compare(results, json.load(fh), args.tolerance)
+        if failures:
+            raise SystemExit("\n".join(failures))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+# Copyright 2020 Ciena Corp
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+"""
+Compare the native and TextFSM parser engines on synthetic multi-port output
+
+    python tools/benchmark/parsers.py --ports 48 --ports 512 --rounds 5
+"""
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import argparse
+
+from common import (
+    lldp_show_neighbors,
+    port_ids,
+    port_show_port,
+    setup_collection_path,
+    timed,
+)
+
+
+def run(ports, rounds):
+    from ansible_collections.ciena.saos6.plugins.module_utils.network.saos6.facts.legacy.base import (
+        Interfaces,
+        Neighbors,
+    )
+    from ansible_collections.ciena.saos6.plugins.module_utils.network.saos6.utils.parsers import (
+        parse_lldp_neighbors,
+        parse_port_detail,
+    )
+    from ansible_collections.ciena.saos6.plugins.module_utils.network.saos6.utils.utils import (
+        parse_cli_textfsm,
+    )
+
+    port_outputs = [port_show_port(port) for port in port_ids(ports)]
+    lldp_output = lldp_show_neighbors(ports)
+    size = sum(len(out) for out in port_outputs) + len(lldp_output)
+
+    def textfsm_engine():
+        interfaces = [
+            parse_cli_textfsm(out, Interfaces.TEMPLATE, "Interfaces")[0]
+            for out in port_outputs
+        ]
+        neighbors = parse_cli_textfsm(
+            lldp_output, Neighbors.TEMPLATE, "Neighbors"
+        )
+        return interfaces, neighbors
+
+    def native_engine():
+        interfaces = [parse_port_detail(out)[0] for out in port_outputs]
+        return interfaces, parse_lldp_neighbors(lldp_output)
+
+    results = {}
+    for name, engine in (
+        ("textfsm", textfsm_engine),
+        ("native", native_engine),
+    ):
+        best = None
+        for _ in range(rounds):
+            parsed, elapsed = timed(engine)
+            best = elapsed if best is None else min(best, elapsed)
+        results[name] = parsed
+        print(
+            "%-8s ports=%-5d %8.2f ms %8.2f MB/s"
+            % (name, ports, best * 1000, size / best / 1e6)
+        )
+    if results["native"] != results["textfsm"]:
+        raise SystemExit("native and textfsm results differ")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--ports", type=int, action="append")
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    setup_collection_path()
+    for ports in args.ports or [48, 512]:
+        run(ports, args.rounds)
+
+
+if __name__ == "__main__":
+    main()
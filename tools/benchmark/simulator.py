@@ -0,0 +1,406 @@
+#!/usr/bin/env python
+# Copyright 2020 Ciena Corp
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+"""
+SSH speaking SAOS 6 CLI simulator
+
+Serves an interactive SAOS 6 shell over SSH on localhost: commands are echoed
+as typed, answered from recorded output or generated synthetic output for a
+configurable number of ports, and followed by a "5160*> " prompt matching the
+saos6 terminal plugin.  The data sent each way is delayed by half the round
+trip time of the emulated network, however much of it is in flight, and
+every command can take some device time to be answered.  Any user name and
+password are accepted.
+
+Recorded outputs are a JSON object mapping each command to its output, they
+take precedence over the synthetic ones.
+
+    python tools/benchmark/simulator.py --port 2222 --ports 48 --rtt 0.05
+    python tools/benchmark/simulator.py --responses recorded.json \\
+        --latency 0.01 --command-latency "port show port=0.2"
+
+Needs paramiko.
+"""
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import argparse
+import json
+import re
+import socket
+import threading
+import time
+
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+try:
+    import paramiko
+
+    HAS_PARAMIKO = True
+except ImportError:
+    HAS_PARAMIKO = False
+
+from common import (
+    chassis_show_capabilities,
+    chassis_show_device_id,
+    configuration_show_brief,
+    lldp_show_configuration,
+    lldp_show_neighbors,
+    port_show_port,
+    port_show_statistics,
+    port_show_status,
+    software_show,
+)
+
+PROMPT = "5160*> "
+
+# commands accepted silently, as a configured device does
+SILENT_COMMANDS = re.compile(
+    r"^(system shell session set|configuration save|\S+ (add|create|"
+    r"delete|disable|enable|remove|set|unset)\b)"
+)
+
+
+class Responder(object):
+    """ Maps a command to its output
+
+    :param ports: number of ports of the synthetic output
+    :param recorded: dict of command -> recorded output
+    """
+
+    def __init__(self, ports=48, recorded=None):
+        self.ports = ports
+        self.recorded = dict(
+            (" ".join(cmd.split()), out)
+            for cmd, out in (recorded or {}).items()
+        )
+        self.synthetic = {
+            "chassis show device-id": chassis_show_device_id,
+            "chassis show capabilities": chassis_show_capabilities,
+            "software show": software_show,
+            "lldp show configuration": lldp_show_configuration,
+            "lldp show neighbors": lambda: lldp_show_neighbors(ports),
+            "port show status": lambda: port_show_status(ports),
+            "port show statistics": lambda: port_show_statistics(ports),
+            "conf sh brief": lambda: configuration_show_brief(ports),
+            "conf show brief": lambda: configuration_show_brief(ports),
+            "configuration show brief": lambda: configuration_show_brief(
+                ports
+            ),
+        }
+
+    def respond(self, command):
+        command = " ".join(command.split())
+        if command in self.recorded:
+            return self.recorded[command]
+        if command in self.synthetic:
+            return self.synthetic[command]()
+        match = re.match(r"^port show port (\S+)$", command)
+        if match and match.group(1).isdigit():
+            return port_show_port(match.group(1))
+        if SILENT_COMMANDS.match(command):
+            return ""
+        return 'SHELL PARSER FAILURE: "%s" - invalid input' % command
+
+
+class Stats(object):
+    """ Counters of the commands served and bytes sent """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.sessions = 0
+            self.commands = 0
+            self.bytes_sent = 0
+            self.per_command = {}
+
+    def open_session(self):
+        with self._lock:
+            self.sessions += 1
+
+    def record(self, command=None, sent=0):
+        with self._lock:
+            self.bytes_sent += sent
+            if command is not None:
+                self.commands += 1
+                self.per_command[command] = (
+                    self.per_command.get(command, 0) + 1
+                )
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                "sessions": self.sessions,
+                "commands": self.commands,
+                "bytes_sent": self.bytes_sent,
+                "per_command": dict(self.per_command),
+            }
+
+
+if HAS_PARAMIKO:
+
+    class _ServerInterface(paramiko.ServerInterface):
+        def __init__(self):
+            self.shell = threading.Event()
+
+        def get_allowed_auths(self, username):
+            return "password,publickey"
+
+        def check_auth_password(self, username, password):
+            return paramiko.AUTH_SUCCESSFUL
+
+        def check_auth_publickey(self, username, key):
+            return paramiko.AUTH_SUCCESSFUL
+
+        def check_channel_request(self, kind, chanid):
+            if kind == "session":
+                return paramiko.OPEN_SUCCEEDED
+            return paramiko.OPEN_FAILED_ADMINISTRATIVELY_PROHIBITED
+
+        def check_channel_pty_request(self, *args):
+            return True
+
+        def check_channel_shell_request(self, channel):
+            self.shell.set()
+            return True
+
+
+def _sleep_until(due):
+    remaining = due - time.time()
+    if remaining > 0:
+        time.sleep(remaining)
+
+
+class DelayedChannel(object):
+    """ Wraps a channel to deliver the data sent each way half a round trip
+    time after it was sent, as a network link does
+
+    Data keeps flowing while earlier data is in flight, so commands sent
+    back to back share the round trip time while commands sent one after
+    the other each wait for it.
+    """
+
+    def __init__(self, channel, rtt):
+        self.channel = channel
+        self.delay = rtt / 2.0
+        self._incoming = queue.Queue()
+        self._outgoing = queue.Queue()
+        self._threads = [
+            threading.Thread(target=self._read),
+            threading.Thread(target=self._write),
+        ]
+        for thread in self._threads:
+            thread.daemon = True
+            thread.start()
+
+    def _read(self):
+        data = None
+        while data != b"":
+            try:
+                data = self.channel.recv(4096)
+            except (EOFError, OSError, socket.error):
+                data = b""
+            self._incoming.put((time.time() + self.delay, data))
+
+    def _write(self):
+        while True:
+            due, data = self._outgoing.get()
+            if data is None:
+                return
+            _sleep_until(due)
+            try:
+                self.channel.sendall(data)
+            except (EOFError, OSError, socket.error):
+                return
+
+    def recv(self, size):
+        due, data = self._incoming.get()
+        _sleep_until(due)
+        return data
+
+    def sendall(self, data):
+        self._outgoing.put((time.time() + self.delay, data))
+
+    def close(self):
+        """Wait for the data in flight to be sent"""
+        self._outgoing.put((None, None))
+        self._threads[1].join()
+
+
+class Simulator(object):
+    """ A SAOS 6 CLI served over SSH on localhost
+
+    :param responder: the Responder answering the commands
+    :param rtt: round trip time of the emulated network, in seconds
+    :param latency: seconds of device time every command takes
+    :param command_latency: dict of command prefix -> seconds, replacing
+        latency for the commands starting with the prefix
+    :param port: TCP port to listen on, 0 picks a free one
+    """
+
+    def __init__(
+        self, responder, rtt=0.0, latency=0.0, command_latency=None, port=0
+    ):
+        if not HAS_PARAMIKO:
+            raise RuntimeError("the simulator requires paramiko")
+        self.responder = responder
+        self.rtt = rtt
+        self.latency = latency
+        self.command_latency = command_latency or {}
+        self.stats = Stats()
+        self._host_key = paramiko.RSAKey.generate(2048)
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._sock.bind(("127.0.0.1", port))
+        self.port = self._sock.getsockname()[1]
+        self._running = False
+
+    def start(self):
+        self._sock.listen(16)
+        self._running = True
+        thread = threading.Thread(target=self._accept)
+        thread.daemon = True
+        thread.start()
+        return self
+
+    def stop(self):
+        self._running = False
+        self._sock.close()
+
+    def delay(self, command):
+        for prefix, seconds in self.command_latency.items():
+            if command.startswith(prefix):
+                return seconds
+        return self.latency
+
+    def _accept(self):
+        while self._running:
+            try:
+                client, _ = self._sock.accept()
+            except (OSError, socket.error):
+                return
+            thread = threading.Thread(target=self._serve, args=(client,))
+            thread.daemon = True
+            thread.start()
+
+    def _serve(self, client):
+        transport = paramiko.Transport(client)
+        transport.add_server_key(self._host_key)
+        server = _ServerInterface()
+        try:
+            transport.start_server(server=server)
+            channel = transport.accept(30)
+            if channel is None or not server.shell.wait(30):
+                return
+            self.stats.open_session()
+            if self.rtt:
+                channel = DelayedChannel(channel, self.rtt)
+            try:
+                self._shell(channel)
+            finally:
+                if self.rtt:
+                    channel.close()
+        except (EOFError, OSError, socket.error, paramiko.SSHException):
+            pass
+        finally:
+            transport.close()
+
+    def _send(self, channel, text):
+        data = text.replace("\r\n", "\n").replace("\n", "\r\n").encode()
+        channel.sendall(data)
+        return len(data)
+
+    def _shell(self, channel):
+        self.stats.record(sent=self._send(channel, "\n" + PROMPT))
+        line = b""
+        while True:
+            data = channel.recv(4096)
+            if not data:
+                return
+            for char in bytearray(data):
+                char = bytes(bytearray([char]))
+                if char not in (b"\r", b"\n"):
+                    line += char
+                    channel.sendall(char)
+                    continue
+                command = line.decode("utf-8", "replace").strip()
+                line = b""
+                if not command:
+                    self._send(channel, "\n" + PROMPT)
+                    continue
+                if command in ("exit", "logout"):
+                    return
+                time.sleep(self.delay(command))
+                output = self.responder.respond(command)
+                if output:
+                    output = "\n%s\n" % output.rstrip("\n")
+                sent = self._send(channel, output + "\n" + PROMPT)
+                self.stats.record(command, sent)
+
+
+def load_recorded(path):
+    if not path:
+        return None
+    with open(path) as fh:
+        return json.load(fh)
+
+
+def parse_command_latency(values):
+    latency = {}
+    for value in values or []:
+        prefix, _, seconds = value.rpartition("=")
+        latency[prefix] = float(seconds)
+    return latency
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument("--port", type=int, default=2222)
+    parser.add_argument("--ports", type=int, default=48)
+    parser.add_argument(
+        "--rtt", type=float, default=0.0, help="network round trip seconds"
+    )
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.0,
+        help="seconds of device time per command",
+    )
+    parser.add_argument(
+        "--command-latency",
+        action="append",
+        metavar="PREFIX=SECONDS",
+        help="seconds of device time of the commands starting with PREFIX",
+    )
+    parser.add_argument("--responses", metavar="JSON")
+    args = parser.parse_args()
+
+    responder = Responder(args.ports, load_recorded(args.responses))
+    simulator = Simulator(
+        responder,
+        rtt=args.rtt,
+        latency=args.latency,
+        command_latency=parse_command_latency(args.command_latency),
+        port=args.port,
+    ).start()
+    print("SAOS 6 simulator listening on 127.0.0.1:%d" % simulator.port)
+    try:
+        while True:
+            time.sleep(60)
+    except KeyboardInterrupt:
+        print(json.dumps(simulator.stats.to_dict(), indent=2))
+        simulator.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+#!/usr/bin/env python
+# Copyright 2020 Ciena Corp
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+"""
+Measure the startup time and payload size of the saos6 modules
+
+Startup is the time a fresh interpreter takes to import a module, on top of
+ansible.module_utils.basic which every module imports, the fastest of a
+number of runs, along with the heavy libraries the import pulled in.  Payload is the set of module_utils files
+ansible bundles with the module: like ansible's module_common, every import
+statement of the module and of the module_utils it reaches is followed,
+including imports inside functions.  Its size is reported raw and zip
+deflated, as in the AnsiballZ payload.
+
+Payload sizes and files do not depend on the machine running the
+benchmark, so they can be compared exactly with a baseline; startup times
+are compared with a tolerance.
+
+    python tools/benchmark/startup.py --runs 20
+    python tools/benchmark/startup.py --output after.json --baseline before.json
+"""
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import argparse
+import ast
+import importlib.util
+import io
+import json
+import os
+import subprocess
+import sys
+import zipfile
+
+from common import ROOT, collections_root, setup_collection_path
+
+PACKAGE = "ansible_collections.ciena.saos6.plugins.modules"
+
+# libraries no module should import before it needs them
+HEAVY_MODULES = ("textfsm", "jinja2", "yaml", "ansible.errors")
+
+STARTUP_SCRIPT = """
+import sys, time
+import ansible.module_utils.basic
+start = time.time()
+import %s
+print(time.time() - start)
+print(",".join(m for m in %r if m in sys.modules))
+"""
+
+
+def module_names():
+    path = os.path.join(ROOT, "plugins", "modules")
+    return sorted(
+        name[:-3]
+        for name in os.listdir(path)
+        if name.endswith(".py") and not name.startswith("_")
+    )
+
+
+def is_module_util(name):
+    return name.startswith("ansible.module_utils") or (
+        name.startswith("ansible_collections.")
+        and ".plugins.module_utils" in name
+    )
+
+
+def module_file(name):
+    try:
+        spec = importlib.util.find_spec(name)
+    except (ImportError, AttributeError, ValueError):
+        return None
+    if spec is None or not spec.origin or not spec.origin.endswith(".py"):
+        return None
+    return spec.origin
+
+
+def imported_names(path):
+    """Yield every module an import statement of the file may name"""
+    with open(path, "rb") as fh:
+        tree = ast.parse(fh.read(), path)
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                yield alias.name
+        elif isinstance(node, ast.ImportFrom) and node.module:
+            yield node.module
+            for alias in node.names:
+                yield "%s.%s" % (node.module, alias.name)
+
+
+def payload_files(name):
+    """Return the files of the module and of every module_util it needs"""
+    files = {name: module_file(name)}
+    pending = [name]
+    while pending:
+        for imported in imported_names(files[pending.pop()]):
+            parts = imported.split(".")
+            for idx in range(1, len(parts) + 1):
+                candidate = ".".join(parts[:idx])
+                if candidate in files or not is_module_util(candidate):
+                    continue
+                path = module_file(candidate)
+                if path is None:
+                    continue
+                files[candidate] = path
+                pending.append(candidate)
+    return dict((key, path) for key, path in files.items() if path)
+
+
+def payload(name):
+    files = payload_files(name)
+    buf = io.BytesIO()
+    raw = 0
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as zf:
+        for key, path in sorted(files.items()):
+            with open(path, "rb") as fh:
+                data = fh.read()
+            raw += len(data)
+            zf.writestr(key.replace(".", "/") + ".py", data)
+    return {
+        "files": len(files),
+        "raw_bytes": raw,
+        "zip_bytes": len(buf.getvalue()),
+        "module_utils": sorted(k for k in files if k != name),
+    }
+
+
+def startup(name, runs):
+    env = os.environ.copy()
+    root = collections_root()
+    if root is not None:
+        env["PYTHONPATH"] = os.pathsep.join(
+            filter(None, [root, env.get("PYTHONPATH")])
+        )
+    times = []
+    heavy = ""
+    for _ in range(runs):
+        output = subprocess.check_output(
+            [sys.executable, "-c", STARTUP_SCRIPT % (name, HEAVY_MODULES)],
+            env=env,
+        )
+        lines = output.decode().splitlines() + [""]
+        times.append(float(lines[0]))
+        heavy = lines[1]
+    return {
+        "startup": round(min(times), 4),
+        "heavy_imports": [m for m in heavy.split(",") if m],
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Return the regressions of results against baseline"""
+    failures = []
+    for key, result in sorted(results.items()):
+        before = baseline.get(key)
+        if before is None:
+            continue
+        for counter in ("files", "zip_bytes"):
+            if result[counter] > before[counter]:
+                failures.append(
+                    "%s: %s went from %d to %d"
+                    % (key, counter, before[counter], result[counter])
+                )
+        if result["startup"] > before["startup"] * (1 + tolerance):
+            failures.append(
+                "%s: startup went from %.4f s to %.4f s"
+                % (key, before["startup"], result["startup"])
+            )
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument("--module", action="append", choices=module_names())
+    parser.add_argument(
+        "--runs", type=int, default=10, help="interpreters started per module"
+    )
+    parser.add_argument("--output", metavar="JSON")
+    parser.add_argument("--baseline", metavar="JSON")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="allowed relative startup time increase over the baseline",
+    )
+    parser.add_argument(
+        "--verbose", action="store_true", help="list the payload files"
+    )
+    args = parser.parse_args()
+    setup_collection_path()
+
+    results = {}
+    print(
+        "%-18s %10s %6s %10s %10s  %s"
+        % ("module", "startup s", "files", "raw bytes", "zip bytes", "heavy")
+    )
+    for module in args.module or module_names():
+        name = "%s.%s" % (PACKAGE, module)
+        result = payload(name)
+        result.update(startup(name, args.runs))
+        results[module] = result
+        print(
+            "%-18s %10.4f %6d %10d %10d  %s"
+            % (
+                module,
+                result["startup"],
+                result["files"],
+                result["raw_bytes"],
+                result["zip_bytes"],
+                ",".join(result["heavy_imports"]) or "-",
+            )
+        )
+        if args.verbose:
+            for util in result["module_utils"]:
+                print("    %s" % util)
+
+    if args.output:
+        with open(args.output, "w") as fh:
+            json.dump(results, fh, indent=2, sort_keys=True)
+    if args.baseline:
+        with open(args.baseline) as fh:
+            failures = compare(results, json.load(fh), args.tolerance)
+        if failures:
+            raise SystemExit("\n".join(failures))
+
+
+if __name__ == "__main__":
+    main()
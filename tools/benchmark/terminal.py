@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+# Copyright 2020 Ciena Corp
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+"""
+Measure prompt and error detection on multi-MB responses
+
+Replays a large synthetic response in fixed size reads the way network_cli
+does with libssh, searching every terminal regex against the whole buffer
+after each read, and compares the per-pattern regexes with the matchers of
+the saos6 terminal plugin.
+
+    python tools/benchmark/terminal.py --size-mb 1 --size-mb 2 --chunk 4096
+"""
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import argparse
+import re
+
+from common import port_show_port, setup_collection_path, timed
+
+
+def response(size):
+    block = port_show_port(1).encode("utf-8") + b"\r\n"
+    data = block * (size // len(block) + 1)
+    return data[:size] + b"\r\n5160*> "
+
+
+def replay(data, chunk, stdout_re, stderr_re):
+    buf = b""
+    for start in range(0, len(data), chunk):
+        end = start + chunk
+        buf += data[start:end]
+        for regex in stderr_re:
+            if regex.search(buf):
+                raise SystemExit("unexpected error match")
+        for regex in stdout_re:
+            if regex.search(buf):
+                return buf
+    raise SystemExit("prompt not found")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size-mb", type=float, action="append")
+    parser.add_argument("--chunk", type=int, default=4096)
+    args = parser.parse_args()
+    setup_collection_path()
+
+    from ansible_collections.ciena.saos6.plugins.terminal.saos6 import (
+        TerminalModule,
+    )
+
+    per_pattern = (
+        [re.compile(p) for p in TerminalModule.terminal_prompt_patterns],
+        [re.compile(p) for p in TerminalModule.terminal_error_patterns],
+    )
+    tail = (
+        TerminalModule.terminal_stdout_re,
+        TerminalModule.terminal_stderr_re,
+    )
+
+    for size_mb in args.size_mb or [0.25, 0.5, 1]:
+        data = response(int(size_mb * 1024 * 1024))
+        for name, (stdout_re, stderr_re) in (
+            ("regexes", per_pattern),
+            ("tail", tail),
+        ):
+            _, elapsed = timed(replay, data, args.chunk, stdout_re, stderr_re)
+            print("%-8s %6.2f MB %9.3f s" % (name, size_mb, elapsed))
+
+
+if __name__ == "__main__":
+    main()